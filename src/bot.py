@@ -21,10 +21,16 @@ from .log_manager import LogManager
 from .server_manager_interface import ServerManager
 from .user_manager import UserManager
 from .message_manager import MessageManager
-from .voice_monitor import VoiceMonitor
+from .voice_monitor import VoiceMonitor, ChannelBinding
 from .command_parser import CommandParser, CommandResult, CommandIntent
 from .security_manager import SecurityManager
 from .minecraft_manager import MinecraftManager
+from .server_manager.proxmox_client import ProxmoxHTTPClient
+from .server_manager.polling_scheduler import PollingScheduler
+from .server_manager.fleet import ServerFleet, InstanceState
+from .health_server import HealthServer
+from .loop_monitor import LoopMonitor
+from .health_sampler import HealthSampler
 
 class BotState(Enum):
     """États du bot"""
@@ -66,21 +72,56 @@ class CubeGuardianBot(commands.Bot):
             help_command=None
         )
         
+        # Client HTTP Proxmox partagé (pool keep-alive, fermé dans close())
+        self.proxmox_client = ProxmoxHTTPClient.from_config(
+            self.config_manager.get_server_config('proxmox'),
+            logging.getLogger('CubeGuardian.ProxmoxHTTPClient')
+        )
+        
         # Gestionnaires
-        self.server_manager = ServerManager(self.config_manager, self.log_manager)
+        self.server_manager = ServerManager(self.config_manager, self.log_manager, self.proxmox_client)
         self.user_manager = UserManager(self.config_manager, self.log_manager)
         self.message_manager = MessageManager(self.config_manager, self.log_manager)
-        self.command_parser = CommandParser()  # Analyseur de commandes NLP
+        self.command_parser = CommandParser.from_config(
+            self.config_manager.get_config('bot.command_parser', {})
+        )  # Analyseur de commandes NLP
         self.security_manager = SecurityManager(self.config_manager, self.log_manager)  # Nouveau : Sécurité avancée
         self.minecraft_manager = MinecraftManager(
             self.config_manager, self.server_manager, 
-            self.security_manager, self.log_manager
+            self.security_manager, self.log_manager,
+            proxmox_client=self.proxmox_client
         )  # Nouveau : Gestion Minecraft avec sécurité
         self.voice_monitor = VoiceMonitor(
             self, self.config_manager, self.user_manager, 
             self.message_manager, self.log_manager
         )
         
+        # Vérifications de disponibilité lancées en parallèle (partagées et mises en cache
+        # par le gestionnaire de serveurs, invalidées à chaque changement d'état du bot)
+        self.probe_engine = self.server_manager.probe_engine
+        self.probe_engine.register('lxc', self.minecraft_manager._check_lxc_status,
+                                   self.config_manager.get_config('bot.status_cache.ttl.lxc', 2))
+        
+        # Mesures de fond pendant que le serveur est en service (réponse immédiate aux arrivées)
+        self.health_sampler = HealthSampler.from_config(
+            self.config_manager.get_config('bot.health_sampler', {}),
+            self.probe_engine,
+            logging.getLogger('CubeGuardian.HealthSampler'),
+            is_active=lambda: self.state in (BotState.SERVER_OPERATIONAL, BotState.SHUTDOWN_TIMER)
+        )
+        
+        # Surveillance de la boucle asyncio (retard, callbacks bloquants)
+        self.loop_monitor = LoopMonitor.from_config(
+            self.config_manager.get_config('bot.loop_monitor', {}),
+            logging.getLogger('CubeGuardian.LoopMonitor')
+        )
+        
+        # Supervision HTTP (/health pour Docker, /metrics pour Prometheus)
+        self.health_server = HealthServer(
+            self, self.config_manager.get_config('bot.health_server', {}),
+            logging.getLogger('CubeGuardian.HealthServer')
+        )
+        
         # Configurer le nettoyage automatique des données de sécurité
         asyncio.create_task(self._security_cleanup_task())
         
@@ -116,6 +157,7 @@ class CubeGuardianBot(commands.Bot):
         self.voice_monitor.set_callbacks(
             on_user_join=self._on_authorized_user_join,
             on_user_leave=self._on_authorized_user_leave,
+            on_timer_expired=self._on_fleet_timer_expired,
             on_timer_cancelled=self._on_shutdown_timer_cancelled
         )
     
@@ -136,6 +178,11 @@ class CubeGuardianBot(commands.Bot):
                 self.logger.error("Token Discord manquant")
                 return
             
+            if self.config_manager.get_config('bot.loop_monitor.enabled', True):
+                self.loop_monitor.start()
+            await self.health_server.start()
+            if self.config_manager.get_config('bot.health_sampler.enabled', True):
+                self.health_sampler.start()
             await super().start(discord_token)
             
         except Exception as e:
@@ -149,12 +196,22 @@ class CubeGuardianBot(commands.Bot):
             
             # Arrêter la surveillance
             await self.voice_monitor.stop_monitoring()
+            await self.health_sampler.stop()
+            
+            # Arrêter le serveur de supervision et fermer les pools de connexions Proxmox (HTTP, SSH)
+            await self.health_server.stop()
+            self.loop_monitor.stop()
+            await self.proxmox_client.close()
+            await self.server_manager.close()
             
             # Fermer la connexion Discord
             await super().close()
             
         except Exception as e:
             self.logger.error(f"Erreur lors de l'arrêt du bot: {e}")
+        finally:
+            # Écrire les derniers logs en attente et arrêter le thread d'écriture
+            self.log_manager.close()
     
     async def on_ready(self) -> None:
         """Événement déclenché quand le bot est prêt"""
@@ -188,39 +245,21 @@ class CubeGuardianBot(commands.Bot):
     async def _setup_discord_channels(self) -> None:
         """Configure les salons Discord et l'utilisateur admin"""
         try:
-            # Trouver les salons
-            voice_channel_name = self.config_manager.get_config('discord.discord.channels.voice_channel')
-            text_channel_name = self.config_manager.get_config('discord.discord.channels.text_channel')
-            
-            voice_channel = None
-            text_channel = None
-            
-            for guild in self.guilds:
-                # Chercher le salon vocal
-                for channel in guild.voice_channels:
-                    if channel.name == voice_channel_name:
-                        voice_channel = channel
-                        break
-                
-                # Chercher le salon textuel
-                for channel in guild.text_channels:
-                    if channel.name == text_channel_name:
-                        text_channel = channel
-                        break
-                
-                if voice_channel and text_channel:
-                    break
+            # Trouver les salons de chaque liaison (la première est la liaison principale)
+            bindings = self.voice_monitor.resolve_bindings()
             
-            if not voice_channel:
-                self.logger.error(f"Salon vocal '{voice_channel_name}' non trouvé")
+            if not bindings:
+                self.logger.error("Aucun salon vocal configuré n'a été trouvé")
                 return
             
-            if not text_channel:
-                self.logger.error(f"Salon textuel '{text_channel_name}' non trouvé")
+            primary = bindings[0]
+            if not primary.text_channel:
+                self.logger.error(f"Salon textuel de la liaison principale ({primary.voice_channel.name}) non trouvé")
                 return
             
             # Configurer les salons
-            self.message_manager.set_channels(text_channel, voice_channel)
+            self.message_manager.set_channels(primary.text_channel, primary.voice_channel)
+            self.logger.info(f"{len(bindings)} liaison(s) vocale(s) configurée(s)")
             
             # Configurer l'utilisateur admin
             admin_id = int(self.config_manager.get_config('discord.discord.admin.user_id'))
@@ -254,6 +293,12 @@ class CubeGuardianBot(commands.Bot):
                 require_mention = True
                 self.logger.debug(f"Message salon public de {message.author.name}: MODE STRICT")
             
+            # Filtre rapide : ni mention ni mot proche d'une commande, pas d'analyse complète
+            if not self.command_parser.prefilter(message.content, bot_name="CubeGuardian",
+                                                 require_mention=require_mention,
+                                                 discord_message=message):
+                return
+            
             # Analyse de la commande avec protection appropriée
             result = self.command_parser.parse_command(
                 message.content,
@@ -405,14 +450,20 @@ class CubeGuardianBot(commands.Bot):
                 "HIGH"  # Utiliser directement la string
             )
     
-    async def _on_authorized_user_join(self, user: discord.Member) -> None:
+    async def _on_authorized_user_join(self, user: discord.Member, binding: Optional[ChannelBinding] = None) -> None:
         """
         Callback appelé quand un utilisateur autorisé rejoint
         
         Args:
             user: Utilisateur qui a rejoint
+            binding: Liaison du salon rejoint
         """
         try:
+            # Instances secondaires de la flotte : machine à états propre à l'instance
+            if binding is not None and binding.server != ServerFleet.DEFAULT_INSTANCE:
+                await self._start_fleet_instance(user, binding)
+                return
+            
             self.logger.info(f"Utilisateur autorisé rejoint: {user.display_name}")
             self.logger.info(f"État actuel du bot: {self.state}")
             
@@ -424,23 +475,34 @@ class CubeGuardianBot(commands.Bot):
                 # Le timer sera annulé automatiquement par le voice_monitor
                 self.logger.info("Timer d'arrêt annulé par l'arrivée d'un utilisateur autorisé")
             else:
-                self.logger.info(f"État du bot: {self.state} - Aucune action requise")
+                sample = self.health_sampler.latest()
+                if sample is not None:
+                    self.logger.info(f"État du bot: {self.state} - Aucune action requise (mesure il y a "
+                                     f"{sample.age:.0f}s: Minecraft {'UP' if sample.minecraft_up else 'DOWN'}, "
+                                     f"{sample.players_online} joueur(s))")
+                else:
+                    self.logger.info(f"État du bot: {self.state} - Aucune action requise")
             
         except Exception as e:
             self.logger.error(f"Erreur lors de la gestion de l'arrivée d'utilisateur: {e}")
     
-    async def _on_authorized_user_leave(self, user: discord.Member) -> None:
+    async def _on_authorized_user_leave(self, user: discord.Member, binding: Optional[ChannelBinding] = None) -> None:
         """
         Callback appelé quand un utilisateur autorisé quitte
         
         Args:
             user: Utilisateur qui a quitté
+            binding: Liaison du salon quitté
         """
         try:
             self.logger.info(f"Utilisateur autorisé quitte: {user.display_name}")
             
-            # Vérifier s'il reste des utilisateurs autorisés
-            users_count = await self.voice_monitor.check_authorized_users()
+            # Instances secondaires : arrêt géré par le timer du surveillant vocal
+            if binding is not None and binding.server != ServerFleet.DEFAULT_INSTANCE:
+                return
+            
+            # Vérifier s'il reste des utilisateurs autorisés (présence tenue à jour par événement)
+            users_count = self.voice_monitor.count_present(ServerFleet.DEFAULT_INSTANCE)
             
             if users_count == 0 and self.state == BotState.SERVER_OPERATIONAL:
                 self.logger.info("Aucun utilisateur autorisé restant - démarrage du timer d'arrêt de 10 minutes")
@@ -458,12 +520,16 @@ class CubeGuardianBot(commands.Bot):
             # Message d'arrêt dans 10 minutes
             await self.message_manager.send_shutdown_message(10)
             
-            # Timer de 10 minutes avec vérification d'interruption
-            for minute in range(10, 0, -1):
+            # Timer de 10 minutes avec vérification d'interruption ; le compte à rebours est
+            # repris depuis le début tant que des joueurs sont connectés sur Minecraft
+            max_postpone = self.config_manager.get_config('bot.shutdown_guard.max_postpone', 21600)
+            postponed_since = None
+            remaining = 10
+            while remaining > 0:
                 await asyncio.sleep(60)  # Attendre 1 minute
                 
                 # Vérifier si quelqu'un a rejoint (interruption du timer)
-                users_count = await self.voice_monitor.check_authorized_users()
+                users_count = self.voice_monitor.count_present(ServerFleet.DEFAULT_INSTANCE)
                 if users_count > 0:
                     self.logger.info("Timer d'arrêt annulé - utilisateur autorisé détecté")
                     self.state = BotState.SERVER_OPERATIONAL
@@ -471,9 +537,28 @@ class CubeGuardianBot(commands.Bot):
                     self.logger.info("Message d'annulation d'arrêt envoyé")
                     return
                 
+                # Joueurs connectés sans vocal : ne pas éteindre le nœud sous leurs pieds
+                players = await self._get_players_online()
+                if players:
+                    now = asyncio.get_event_loop().time()
+                    if postponed_since is None:
+                        postponed_since = now
+                        self.logger.info(f"Arrêt reporté - {players} joueur(s) connecté(s) sur Minecraft")
+                        await self.message_manager.send_shutdown_postponed_message(players)
+                    if now - postponed_since < max_postpone:
+                        remaining = 10
+                        continue
+                    self.logger.warning(f"Joueurs toujours connectés après {max_postpone}s de report - "
+                                        f"reprise du compte à rebours")
+                elif postponed_since is not None:
+                    postponed_since = None
+                    self.logger.info("Plus aucun joueur connecté - reprise du compte à rebours (10 minutes)")
+                
+                remaining -= 1
+                
                 # Message de compte à rebours
-                if minute > 1:
-                    self.logger.info(f"Arrêt dans {minute - 1} minute(s)")
+                if remaining > 0:
+                    self.logger.info(f"Arrêt dans {remaining} minute(s)")
                     # Pas de message Discord pour éviter le spam, juste un log
             
             # Timer expiré - procéder à l'arrêt
@@ -484,6 +569,27 @@ class CubeGuardianBot(commands.Bot):
             self.state = BotState.ERROR
             await self.message_manager.send_admin_alert("shutdown_timer_error", {"error": str(e)})
 
+    async def _get_players_online(self) -> Optional[int]:
+        """
+        Nombre de joueurs connectés sur Minecraft
+        
+        Returns:
+            Dernière mesure de fond si elle est récente, sinon résultat du Server List Ping
+            (en cache quelques secondes) ; None si le serveur ne répond pas ou si la
+            vérification est désactivée
+        """
+        if not self.config_manager.get_config('bot.shutdown_guard.check_players', True):
+            return None
+        
+        sample = self.health_sampler.latest()
+        if sample is not None:
+            return sample.players_online if sample.minecraft_up else None
+        
+        result = await self.probe_engine.probe('minecraft')
+        if not result.get('success'):
+            return None
+        return (result.get('details', {}) or {}).get('players_online') or 0
+    
     async def _execute_shutdown(self) -> None:
         """Exécute l'arrêt du serveur avec surveillance"""
         try:
@@ -505,7 +611,7 @@ class CubeGuardianBot(commands.Bot):
                 self.state = BotState.ERROR
                 return
             
-            # Surveiller l'arrêt pendant 10 minutes
+            # Surveiller l'arrêt (intervalles adaptatifs, 10 minutes max)
             await self._monitor_shutdown_progress()
             
         except Exception as e:
@@ -514,58 +620,150 @@ class CubeGuardianBot(commands.Bot):
             await self.message_manager.send_admin_alert("shutdown_execution_error", {"error": str(e)})
 
     async def _monitor_shutdown_progress(self) -> None:
-        """Surveille l'arrêt du serveur toutes les minutes"""
-        max_attempts = 10  # 10 minutes maximum
-        attempt = 0
+        """Surveille l'arrêt du serveur avec des intervalles adaptatifs"""
+        timeout = self.config_manager.get_config('bot.timers.shutdown_timeout', 600)
         start_time = asyncio.get_event_loop().time()
+        scheduler = self._create_polling_scheduler('shutdown', timeout, start_time)
         
-        while attempt < max_attempts and self.state == BotState.SHUTDOWN_IN_PROGRESS:
-            attempt += 1
-            self.logger.info(f"Tentative {attempt}/{max_attempts} - Vérification de l'arrêt")
-            
-            # Attendre 1 minute
-            await asyncio.sleep(60)
+        while self.state == BotState.SHUTDOWN_IN_PROGRESS and await scheduler.wait():
+            self.logger.info(f"Tentative {scheduler.attempts} ({scheduler.elapsed:.0f}s/{timeout}s) - Vérification de l'arrêt")
             
             # Vérifier si on est toujours en mode arrêt
             if self.state != BotState.SHUTDOWN_IN_PROGRESS:
                 return
             
             # Test Proxmox (doit être DOWN)
-            proxmox_result = await self.server_manager.check_proxmox_status()
+            proxmox_result = await self.probe_engine.probe('proxmox')
             if not proxmox_result['success']:
                 # Serveur arrêté !
                 elapsed_time = int(asyncio.get_event_loop().time() - start_time)
+                self.server_manager.record_lifecycle('shutdown', True, elapsed_time)
                 self.state = BotState.IDLE
                 self.logger.info(f"Serveur arrêté en {elapsed_time} secondes")
                 await self.message_manager.send_shutdown_success_message(elapsed_time)
                 return
             
-            self.logger.info(f"Tentative {attempt}: Serveur toujours en ligne, attente...")
+            self.logger.info(f"Tentative {scheduler.attempts}: Serveur toujours en ligne, attente...")
+        
+        if self.state != BotState.SHUTDOWN_IN_PROGRESS:
+            return
         
-        # Échec après 10 minutes
+        # Échec après le timeout
+        self.server_manager.record_lifecycle('shutdown', False, scheduler.elapsed)
+        timeout_minutes = timeout // 60
         self.state = BotState.ERROR
-        self.logger.error("Échec de l'arrêt après 10 minutes")
+        self.logger.error(f"Échec de l'arrêt après {timeout_minutes} minutes")
         await self.message_manager.send_shutdown_failed_message()
         await self.message_manager.send_admin_alert("shutdown_failed", {
-            "reason": "Timeout après 10 minutes",
-            "timeout_minutes": 10
+            "reason": f"Timeout après {timeout_minutes} minutes",
+            "timeout_minutes": timeout_minutes
         })
     
+    def _create_polling_scheduler(self, operation: str, timeout: float, start_time: float) -> PollingScheduler:
+        """
+        Crée le planificateur de vérifications d'une opération
+        
+        Args:
+            operation: Type d'opération (startup, shutdown)
+            timeout: Échéance stricte en secondes
+            start_time: Début de l'opération (loop.time())
+            
+        Returns:
+            Planificateur avec phase rapide autour du temps attendu
+        """
+        expected_ready = self.server_manager.readiness_estimator.expected(operation)
+        if expected_ready is not None:
+            self.logger.info(f"Durée attendue pour {operation}: {expected_ready:.0f}s (historique)")
+        
+        return PollingScheduler.from_config(
+            self.config_manager.get_config('bot.polling', {}),
+            timeout,
+            expected_ready=expected_ready,
+            start_time=start_time
+        )
     
-    async def _on_shutdown_timer_cancelled(self, user: discord.Member) -> None:
+    async def _on_shutdown_timer_cancelled(self, user: discord.Member, binding: Optional[ChannelBinding] = None) -> None:
         """
         Callback appelé quand le timer d'arrêt est annulé
         
         Args:
             user: Utilisateur qui a annulé l'arrêt
+            binding: Liaison du salon rejoint
         """
         try:
+            if binding is not None and binding.server != ServerFleet.DEFAULT_INSTANCE:
+                return
             self.logger.info(f"Timer d'arrêt annulé par {user.display_name}")
             self.state = BotState.SERVER_OPERATIONAL
             
         except Exception as e:
             self.logger.error(f"Erreur lors de l'annulation du timer: {e}")
     
+    async def _start_fleet_instance(self, user: discord.Member, binding: ChannelBinding) -> None:
+        """
+        Démarre l'instance de la flotte associée à une liaison
+        
+        Args:
+            user: Utilisateur qui a rejoint
+            binding: Liaison du salon rejoint
+        """
+        instance = self.server_manager.fleet.get(binding.server)
+        if instance is None:
+            self.logger.error(f"Instance '{binding.server}' absente de la flotte ({binding.voice_channel.name})")
+            return
+        
+        if instance.state in (InstanceState.RUNNING, InstanceState.STARTING):
+            self.logger.info(f"Instance {instance.name}: {instance.state.value} - Aucune action requise")
+            return
+        
+        await self.message_manager.send_fleet_message('starting', instance.name, binding.text_channel,
+                                                      user=user.display_name)
+        result = await instance.start()
+        if result['success']:
+            elapsed = (result.get('details') or {}).get('elapsed', 0)
+            await self.message_manager.send_fleet_message('ready', instance.name, binding.text_channel,
+                                                          time=int(elapsed))
+        else:
+            await self.message_manager.send_fleet_message('failed', instance.name, binding.text_channel,
+                                                          error=result.get('error', result['message']))
+    
+    async def _on_fleet_timer_expired(self, server: str) -> None:
+        """
+        Callback appelé quand le timer d'arrêt d'une instance secondaire expire
+        
+        L'instance est arrêtée ; son nœud l'est aussi s'il n'héberge plus d'instance active
+        ni l'instance principale (gérée par la machine à états du bot)
+        
+        Args:
+            server: Nom de l'instance
+        """
+        if server == ServerFleet.DEFAULT_INSTANCE:
+            return
+        
+        fleet = self.server_manager.fleet
+        instance = fleet.get(server)
+        if instance is None:
+            return
+        
+        try:
+            channels = [binding.text_channel for binding in self.voice_monitor.bindings.values()
+                        if binding.server == server]
+            result = await instance.stop()
+            event = 'stopped' if result['success'] else 'failed'
+            for channel in channels or [None]:
+                await self.message_manager.send_fleet_message(event, server, channel,
+                                                              error=result.get('error', result['message']))
+            
+            # Le nœud de l'instance principale reste sous le contrôle du bot (nœud proxmox à défaut)
+            default_instance = fleet.get(ServerFleet.DEFAULT_INSTANCE)
+            default_node = default_instance.node if default_instance else fleet.nodes.get('proxmox')
+            node = instance.node
+            if result['success'] and node is not default_node and await fleet.is_node_idle(node):
+                await node.shutdown()
+                
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'arrêt de l'instance {server}: {e}")
+    
     async def _request_server_startup(self, user: discord.Member) -> None:
         """
         Nouveau workflow de démarrage optimisé
@@ -576,12 +774,14 @@ class CubeGuardianBot(commands.Bot):
         try:
             self.logger.info(f"Démarrage du serveur demandé par {user.display_name}")
             
-            # 1. Vérifier immédiatement si Minecraft est déjà UP
+            # 1. Vérifier si Minecraft est déjà UP (vérification en cache : aucune mesure de
+            # fond n'est prise à l'état IDLE, la dernière peut dater d'avant l'arrêt)
             self.logger.info("Étape 1: Vérification de la connectivité Minecraft...")
-            minecraft_result = await self.server_manager.check_minecraft_status()
+            minecraft_result = await self.probe_engine.probe('minecraft')
             self.logger.info(f"Résultat test Minecraft: {minecraft_result}")
+            minecraft_up = minecraft_result['success']
             
-            if minecraft_result['success']:
+            if minecraft_up:
                 # Minecraft déjà opérationnel !
                 self.state = BotState.SERVER_OPERATIONAL
                 self.logger.info("Minecraft déjà opérationnel !")
@@ -593,9 +793,11 @@ class CubeGuardianBot(commands.Bot):
             self.state = BotState.STARTUP_REQUESTED
             await self.message_manager.send_startup_message(user)
             
-            # 3. Envoyer Wake-on-LAN
+            # 3. Envoyer Wake-on-LAN (début de la mesure du démarrage)
             self.logger.info("Étape 3: Envoi du Wake-on-LAN...")
+            start_time = asyncio.get_event_loop().time()
             wake_result = await self.server_manager.wake_server()
+            phases = {'wol_sent': asyncio.get_event_loop().time() - start_time}
             self.logger.info(f"Résultat Wake-on-LAN: {wake_result}")
             
             # Gérer le cas où wake_result est un booléen (interface) ou un dictionnaire (manager natif)
@@ -622,63 +824,90 @@ class CubeGuardianBot(commands.Bot):
                         "error": wake_result.get('error', 'Erreur inconnue')
                     })
             
-            # 4. Passer en mode surveillance avec timer
+            # 4. Passer en mode surveillance avec l'estimation issue de l'historique
             self.state = BotState.STARTUP_MONITORING
-            await self.message_manager.send_startup_progress_message()
+            eta = self.server_manager.get_startup_eta(asyncio.get_event_loop().time() - start_time)
+            await self.message_manager.send_startup_progress_message(eta)
             
-            # 5. Surveillance toutes les minutes pendant 10 minutes
-            start_time = asyncio.get_event_loop().time()
-            await self._monitor_startup_progress(start_time)
+            # 5. Surveillance adaptative jusqu'au timeout de démarrage
+            await self._monitor_startup_progress(start_time, phases)
                 
         except Exception as e:
             self.logger.error(f"Erreur lors du démarrage du serveur: {e}")
             self.state = BotState.ERROR
             await self.message_manager.send_admin_alert("startup_failed", {"error": str(e)})
 
-    async def _monitor_startup_progress(self, start_time: float) -> None:
-        """Surveille le démarrage du serveur toutes les minutes"""
-        max_attempts = 10  # 10 minutes maximum
-        attempt = 0
+    async def _monitor_startup_progress(self, start_time: float, phases: Optional[dict] = None) -> None:
+        """
+        Surveille le démarrage du serveur avec des intervalles adaptatifs
+        
+        Args:
+            start_time: Envoi du Wake-on-LAN (loop.time())
+            phases: Temps écoulé à la fin de chaque phase, complété pour l'historique
+        """
+        phases = phases if phases is not None else {}
+        timeout = self.config_manager.get_config('bot.timers.startup_timeout', 600)
+        scheduler = self._create_polling_scheduler('startup', timeout, start_time)
         
-        while attempt < max_attempts and self.state == BotState.STARTUP_MONITORING:
-            attempt += 1
-            self.logger.info(f"Tentative {attempt}/{max_attempts} - Vérification du démarrage")
+        while self.state == BotState.STARTUP_MONITORING and await scheduler.wait():
+            attempt = scheduler.attempts
+            self.logger.info(f"Tentative {attempt} ({scheduler.elapsed:.0f}s/{timeout}s) - Vérification du démarrage")
             
-            # Attendre 1 minute
-            await asyncio.sleep(60)
+            # Toutes les vérifications en parallèle : la durée d'un cycle est celle de la plus lente
+            snapshot = await self.probe_engine.snapshot('proxmox', 'proxmox_api', 'lxc', 'minecraft')
             
             # Vérifier si on est toujours en mode surveillance
             if self.state != BotState.STARTUP_MONITORING:
                 return
             
-            # Test Proxmox
-            proxmox_result = await self.server_manager.check_proxmox_status()
-            if not proxmox_result['success']:
-                self.logger.info(f"Tentative {attempt}: Proxmox pas encore UP")
-                continue
+            if snapshot.ok('proxmox') or snapshot.ok('proxmox_api'):
+                phases.setdefault('proxmox_up', scheduler.elapsed)
+            lxc_result = snapshot.get('lxc')
+            if lxc_result.get('success') and lxc_result.get('status') == 'running':
+                phases.setdefault('lxc_running', scheduler.elapsed)
             
-            self.logger.info(f"Tentative {attempt}: Proxmox UP, test Minecraft...")
+            self.logger.info(f"Tentative {attempt} ({snapshot.duration:.1f}s): "
+                             f"Proxmox {'UP' if snapshot.ok('proxmox') else 'DOWN'}, "
+                             f"API {'UP' if snapshot.ok('proxmox_api') else 'DOWN'}, "
+                             f"LXC {lxc_result.get('status', 'inconnu')}, "
+                             f"Minecraft {'UP' if snapshot.ok('minecraft') else 'DOWN'}")
             
-            # Test Minecraft
-            minecraft_result = await self.server_manager.check_minecraft_status()
-            if minecraft_result['success']:
+            if snapshot.ok('minecraft'):
                 # Succès !
+                phases['slp_ready'] = scheduler.elapsed
                 elapsed_time = int(asyncio.get_event_loop().time() - start_time)
+                self.server_manager.record_lifecycle('startup', True, elapsed_time, phases)
                 self.state = BotState.SERVER_OPERATIONAL
                 self.logger.info(f"Minecraft opérationnel en {elapsed_time} secondes !")
-                minecraft_config = self.server_manager.minecraft_config
                 await self.message_manager.send_startup_success_message(elapsed_time)
                 return
         
-        # Échec après 10 minutes
+        if self.state != BotState.STARTUP_MONITORING:
+            return
+        
+        # Échec après le timeout
+        self.server_manager.record_lifecycle('startup', False, scheduler.elapsed, phases)
+        timeout_minutes = timeout // 60
         self.state = BotState.ERROR
-        self.logger.error("Échec du démarrage après 10 minutes")
-        await self.message_manager.send_startup_failed_message(10)
+        self.logger.error(f"Échec du démarrage après {timeout_minutes} minutes")
+        await self.message_manager.send_startup_failed_message(timeout_minutes)
         await self.message_manager.send_admin_alert("startup_failed", {
-            "reason": "Timeout après 10 minutes",
-            "timeout_minutes": 10
+            "reason": f"Timeout après {timeout_minutes} minutes",
+            "timeout_minutes": timeout_minutes
         })
     
+    @property
+    def state(self) -> BotState:
+        """État courant du bot"""
+        return self._state
+    
+    @state.setter
+    def state(self, state: BotState) -> None:
+        """Change l'état du bot ; les résultats de vérification en cache deviennent obsolètes"""
+        if getattr(self, '_state', None) is not state and hasattr(self, 'server_manager'):
+            self.server_manager.invalidate_status()
+        self._state = state
+    
     def get_state(self) -> BotState:
         """
         Récupère l'état actuel du bot
@@ -749,6 +978,15 @@ class CubeGuardianBot(commands.Bot):
                 info['security_statistics'] = self.security_manager.get_security_statistics()
             if hasattr(self, 'minecraft_manager'):
                 info['minecraft_statistics'] = self.minecraft_manager.get_minecraft_statistics()
+            if hasattr(self, 'proxmox_client'):
+                info['proxmox_http_statistics'] = self.proxmox_client.get_statistics()
+            info['lifecycle_history'] = self.server_manager.lifecycle_history.get_statistics()
+            info['probe_statistics'] = self.server_manager.get_probe_statistics()
+            info['probe_engine'] = self.probe_engine.get_statistics()
+            info['health_sampler'] = self.health_sampler.get_statistics()
+            info['wake_on_lan_statistics'] = self.server_manager.native_server_manager.wake_on_lan.get_statistics()
+            info['loop_monitor'] = self.loop_monitor.get_statistics()
+            info['fleet'] = self.server_manager.fleet.get_statistics()
         except Exception as e:
             self.logger.warning(f"Erreur lors de la récupération des statistiques: {e}")
             
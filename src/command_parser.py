@@ -6,10 +6,16 @@ Reconnaissance des commandes de redémarrage Minecraft avec tolérance aux faute
 import re
 import unicodedata
 import logging
-from typing import Dict, List, Tuple, Optional
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    from .keyword_index import BKTree, DeletionFilter
+except ImportError:  # Module chargé hors du paquet src (scripts de test à la racine)
+    from keyword_index import BKTree, DeletionFilter
+
 
 class CommandIntent(Enum):
     """Types de commandes détectées"""
@@ -18,6 +24,15 @@ class CommandIntent(Enum):
     UNKNOWN = "unknown"
 
 
+class WordScore(NamedTuple):
+    """Contribution d'un mot normalisé aux scores d'intention"""
+    restart_score: float
+    server_score: float
+    restart_match: Optional[str]  # mot ou "mot~mot_cle" reconnu par l'analyse de redémarrage
+    help_score: float
+    help_match: Optional[str]  # mot ou "mot~mot_cle" reconnu par l'analyse d'aide
+
+
 @dataclass
 class CommandResult:
     """Résultat de l'analyse d'une commande"""
@@ -34,9 +49,37 @@ class CommandParser:
     Supporte les fautes d'orthographe et les anglicismes
     """
     
-    def __init__(self):
-        """Initialise le parser avec les mots-clés de reconnaissance"""
+    # Mentions textuelles acceptées en plus du nom du bot
+    DEFAULT_TEXT_TRIGGERS = ["bot", "@bot", "hey bot", "salut bot"]
+    
+    # Suites de lettres/chiffres : ce qui reste après suppression des caractères spéciaux
+    WORD_PATTERN = re.compile(r'\w+')
+    
+    def __init__(self, prefilter: bool = True, text_triggers: Optional[List[str]] = None,
+                 word_cache_size: int = 4096):
+        """
+        Initialise le parser avec les mots-clés de reconnaissance
+        
+        Args:
+            prefilter: Active le filtre rapide avant l'analyse complète (voir prefilter())
+            text_triggers: Mentions textuelles acceptées en plus du nom du bot
+            word_cache_size: Nombre de mots dont les scores sont conservés (LRU, 0 = aucun cache)
+        """
         self.logger = logging.getLogger('CubeGuardian.CommandParser')
+        self.prefilter_enabled = prefilter
+        self.text_triggers = [trigger.lower() for trigger in (
+            text_triggers if text_triggers is not None else self.DEFAULT_TEXT_TRIGGERS)]
+        
+        # Statistiques du filtre rapide
+        self.prefilter_checks = 0
+        self.prefilter_rejected_mention = 0
+        self.prefilter_rejected_keywords = 0
+        
+        # Cache LRU mot normalisé -> scores (la conversation répète sans cesse les mêmes mots)
+        self.word_cache_size = word_cache_size
+        self._word_cache: 'OrderedDict[str, WordScore]' = OrderedDict()
+        self.word_cache_hits = 0
+        self.word_cache_misses = 0
         
         # Mots-clés pour redémarrage - tolérance aux fautes d'orthographe
         self.restart_keywords = {
@@ -79,9 +122,58 @@ class CommandParser:
             'ç': 'c', 'ñ': 'n'
         }
         
+        # Index de recherche approchée (arbres BK) construits une fois pour toutes
+        self.compile_keywords()
+        
         self.logger.info("CommandParser initialisé avec %d mots-clés de redémarrage", 
                         len(self.restart_keywords))
     
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> 'CommandParser':
+        """
+        Construit l'analyseur depuis la section command_parser de bot.yaml
+        
+        Args:
+            config: Configuration de l'analyseur
+            
+        Returns:
+            Analyseur configuré
+        """
+        config = config or {}
+        return cls(prefilter=config.get('prefilter', True),
+                   text_triggers=config.get('text_triggers'),
+                   word_cache_size=config.get('word_cache_size', 4096))
+    
+    def compile_keywords(self) -> None:
+        """
+        Construit les index de recherche approchée des ensembles de mots-clés
+        
+        À rappeler après toute modification de restart_keywords, server_keywords, help_keywords
+        ou accent_map (vide aussi le cache des scores par mot)
+        """
+        self._accent_table = str.maketrans(self.accent_map)
+        self._word_cache = OrderedDict()
+        # Masques de Myers précalculés : les mots-clés sont toujours le motif de la distance bornée
+        self._pattern_masks = {
+            keyword: self._build_pattern_masks(keyword)
+            for keyword in self.restart_keywords | self.server_keywords | self.help_keywords
+        }
+        self.keyword_indexes = {
+            name: BKTree(self.calculate_levenshtein_distance, keywords,
+                         bounded_distance=self.bounded_levenshtein_distance)
+            for name, keywords in (('restart', self.restart_keywords), ('server', self.server_keywords),
+                                   ('help', self.help_keywords))
+        }
+        # Seuls les mots-clés de redémarrage et d'aide peuvent déclencher une action
+        self.keyword_filter = DeletionFilter(((self.restart_keywords, 2), (self.help_keywords, 1)))
+        # Sans mention, seule l'aide peut être déclenchée (le redémarrage exige une mention)
+        self.help_filter = DeletionFilter(((self.help_keywords, 1),))
+        self._indexed_sets = (
+            (self.restart_keywords, self.keyword_indexes['restart']),
+            (self.server_keywords, self.keyword_indexes['server']),
+            (self.help_keywords, self.keyword_indexes['help'])
+        )
+    
     def normalize_text(self, text: str) -> str:
         """
         Normalise le texte pour l'analyse
@@ -95,20 +187,11 @@ class CommandParser:
         if not text:
             return ""
         
-        # Convertir en minuscules
-        text = text.lower().strip()
-        
-        # Supprimer les accents manuellement pour plus de contrôle
-        for accent, replacement in self.accent_map.items():
-            text = text.replace(accent, replacement)
-        
-        # Supprimer les caractères spéciaux et garder seulement lettres, chiffres, espaces
-        text = re.sub(r'[^\w\s]', ' ', text)
+        # Minuscules et accents supprimés (table accent_map) en un passage chacun
+        text = text.lower().translate(self._accent_table)
         
-        # Normaliser les espaces multiples
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        # Caractères spéciaux et espaces multiples : un seul espace entre les mots
+        return ' '.join(self.WORD_PATTERN.findall(text))
     
     def calculate_levenshtein_distance(self, s1: str, s2: str) -> int:
         """
@@ -140,6 +223,132 @@ class CommandParser:
         
         return previous_row[-1]
     
+    def bounded_levenshtein_distance(self, s1: str, s2: str, max_distance: int) -> int:
+        """
+        Distance de Levenshtein bornée : seule compte la réponse « distance <= max_distance »
+        
+        - Différence de longueur supérieure à la borne : rejet sans calcul
+        - s2 mot-clé indexé : distance bit-parallèle de Myers (masques précalculés)
+        - Préfixe et suffixe communs retirés avant le calcul
+        - Seule la bande diagonale de largeur 2 * max_distance + 1 est calculée (Ukkonen)
+        - Abandon dès que le minimum d'une ligne dépasse la borne
+        
+        Args:
+            s1: Première chaîne
+            s2: Seconde chaîne
+            max_distance: Distance maximale utile
+            
+        Returns:
+            Distance exacte si elle est <= max_distance, sinon max_distance + 1
+        """
+        if s1 == s2:
+            return 0
+        
+        limit = max_distance + 1
+        if abs(len(s1) - len(s2)) > max_distance:
+            return limit
+        
+        # Mot-clé indexé : version bit-parallèle, masques déjà construits
+        masks = self._pattern_masks.get(s2)
+        if masks is not None:
+            distance = self._myers_distance(s2, masks, s1)
+            return distance if distance <= max_distance else limit
+        
+        if len(s1) < len(s2):
+            s1, s2 = s2, s1
+        if len(s1) - len(s2) > max_distance:
+            return limit
+        
+        # Préfixe et suffixe communs : sans effet sur la distance
+        start = 0
+        end1, end2 = len(s1), len(s2)
+        while start < end2 and s1[start] == s2[start]:
+            start += 1
+        while end2 > start and s1[end1 - 1] == s2[end2 - 1]:
+            end1 -= 1
+            end2 -= 1
+        s1, s2 = s1[start:end1], s2[start:end2]
+        
+        len1, len2 = len(s1), len(s2)
+        if len2 == 0:
+            return len1 if len1 <= max_distance else limit
+        
+        # Les cellules hors de la bande valent au moins limit
+        previous_row = [j if j <= max_distance else limit for j in range(len2 + 1)]
+        for i in range(1, len1 + 1):
+            c1 = s1[i - 1]
+            low = max(1, i - max_distance)
+            high = min(len2, i + max_distance)
+            current_row = [limit] * (len2 + 1)
+            current_row[0] = i if i <= max_distance else limit
+            row_min = current_row[low - 1]
+            for j in range(low, high + 1):
+                value = min(previous_row[j - 1] + (c1 != s2[j - 1]),
+                            previous_row[j] + 1,
+                            current_row[j - 1] + 1)
+                current_row[j] = value
+                if value < row_min:
+                    row_min = value
+            if row_min > max_distance:
+                return limit
+            previous_row = current_row
+        
+        distance = previous_row[len2]
+        return distance if distance <= max_distance else limit
+    
+    @staticmethod
+    def _build_pattern_masks(pattern: str) -> Dict[str, int]:
+        """Masques de positions de chaque caractère du motif (bit i : pattern[i])"""
+        masks: Dict[str, int] = {}
+        for i, char in enumerate(pattern):
+            masks[char] = masks.get(char, 0) | (1 << i)
+        return masks
+    
+    @staticmethod
+    def _myers_distance(pattern: str, masks: Dict[str, int], text: str) -> int:
+        """Distance de Levenshtein bit-parallèle (Myers 1999, formulation de Hyyrö)"""
+        length = len(pattern)
+        if length == 0:
+            return len(text)
+        
+        full = (1 << length) - 1
+        last = 1 << (length - 1)
+        positive, negative, score = full, 0, length
+        for char in text:
+            eq = masks.get(char, 0)
+            xv = eq | negative
+            xh = (((eq & positive) + positive) ^ positive) | eq
+            horizontal_positive = negative | (~(xh | positive) & full)
+            horizontal_negative = positive & xh
+            if horizontal_positive & last:
+                score += 1
+            elif horizontal_negative & last:
+                score -= 1
+            horizontal_positive = ((horizontal_positive << 1) | 1) & full
+            horizontal_negative = (horizontal_negative << 1) & full
+            positive = horizontal_negative | (~(xv | horizontal_positive) & full)
+            negative = horizontal_positive & xv
+        return score
+    
+    def myers_levenshtein_distance(self, s1: str, s2: str) -> int:
+        """
+        Distance de Levenshtein exacte par l'algorithme bit-parallèle de Myers
+        
+        Une colonne entière de la matrice tient dans un entier : un passage sur s1 avec
+        quelques opérations binaires par caractère
+        
+        Args:
+            s1: Première chaîne
+            s2: Seconde chaîne (motif, masques mis en cache pour les mots-clés)
+            
+        Returns:
+            Distance de Levenshtein
+        """
+        masks = self._pattern_masks.get(s2)
+        if masks is None:
+            masks = self._build_pattern_masks(s2)
+        return self._myers_distance(s2, masks, s1)
+    
     def find_similar_keywords(self, word: str, keywords: set, max_distance: int = 2) -> List[Tuple[str, int]]:
         """
         Trouve les mots-clés similaires avec distance de Levenshtein
@@ -150,47 +359,61 @@ class CommandParser:
             max_distance: Distance maximale autorisée
             
         Returns:
-            Liste de tuples (mot_cle, distance) triée par distance
+            Liste de tuples (mot_cle, distance) triée par distance puis par mot-clé
         """
+        # Ensembles compilés : recherche dans l'arbre BK
+        for keyword_set, index in self._indexed_sets:
+            if keywords is keyword_set:
+                return index.search(word, max_distance)
+        
         similar = []
         
         for keyword in keywords:
-            distance = self.calculate_levenshtein_distance(word, keyword)
+            distance = self.bounded_levenshtein_distance(word, keyword, max_distance)
             if distance <= max_distance:
                 similar.append((keyword, distance))
         
         # Trier par distance (plus petite distance = plus similaire)
-        similar.sort(key=lambda x: x[1])
+        similar.sort(key=lambda x: (x[1], x[0]))
         return similar
     
-    def analyze_restart_intent(self, normalized_text: str) -> Tuple[float, List[str]]:
+    def score_word(self, word: str) -> WordScore:
         """
-        Analyse l'intention de redémarrage dans le texte
+        Scores d'un mot normalisé, conservés dans un cache LRU borné
         
         Args:
-            normalized_text: Texte normalisé à analyser
+            word: Mot normalisé
             
         Returns:
-            Tuple (score_confiance, mots_cles_trouves)
+            Contributions du mot aux analyses de redémarrage et d'aide
         """
-        words = normalized_text.split()
-        matched_keywords = []
-        restart_score = 0.0
-        server_score = 0.0
+        cache = self._word_cache
+        word_score = cache.get(word)
+        if word_score is not None:
+            self.word_cache_hits += 1
+            cache.move_to_end(word)
+            return word_score
+        
+        self.word_cache_misses += 1
+        word_score = self._compute_word_score(word)
+        if self.word_cache_size > 0:
+            cache[word] = word_score
+            if len(cache) > self.word_cache_size:
+                cache.popitem(last=False)
+        return word_score
+    
+    def _compute_word_score(self, word: str) -> WordScore:
+        """Calcule les scores d'un mot (recherches exactes puis approchées)"""
+        restart_score = server_score = 0.0
+        restart_match = None
         
-        for word in words:
+        if word in self.restart_keywords:
             # Recherche exacte dans les mots-clés de redémarrage
-            if word in self.restart_keywords:
-                matched_keywords.append(word)
-                restart_score += 1.0
-                continue
-            
+            restart_score, restart_match = 1.0, word
+        elif word in self.server_keywords:
             # Recherche exacte dans les mots-clés de serveur
-            if word in self.server_keywords:
-                matched_keywords.append(word)
-                server_score += 0.8
-                continue
-            
+            server_score, restart_match = 0.8, word
+        else:
             # Recherche avec tolérance aux fautes (distance 1-2)
             restart_similar = self.find_similar_keywords(word, self.restart_keywords, max_distance=2)
             if restart_similar:
@@ -198,18 +421,51 @@ class CommandParser:
                 # Score inversement proportionnel à la distance
                 score = 1.0 - (distance * 0.3)  # distance 1 = 0.7, distance 2 = 0.4
                 if score > 0:
-                    matched_keywords.append(f"{word}~{best_match}")
-                    restart_score += score
-                continue
-            
-            # Recherche serveur avec tolérance
-            server_similar = self.find_similar_keywords(word, self.server_keywords, max_distance=2)
-            if server_similar:
-                best_match, distance = server_similar[0]
-                score = 0.8 - (distance * 0.2)  # distance 1 = 0.6, distance 2 = 0.4
+                    restart_score, restart_match = score, f"{word}~{best_match}"
+            else:
+                # Recherche serveur avec tolérance
+                server_similar = self.find_similar_keywords(word, self.server_keywords, max_distance=2)
+                if server_similar:
+                    best_match, distance = server_similar[0]
+                    score = 0.8 - (distance * 0.2)  # distance 1 = 0.6, distance 2 = 0.4
+                    if score > 0:
+                        server_score, restart_match = score, f"{word}~{best_match}"
+        
+        help_score = 0.0
+        help_match = None
+        if word in self.help_keywords:
+            help_score, help_match = 1.0, word
+        else:
+            # Recherche avec tolérance aux fautes
+            help_similar = self.find_similar_keywords(word, self.help_keywords, max_distance=1)
+            if help_similar:
+                best_match, distance = help_similar[0]
+                score = 1.0 - (distance * 0.5)
                 if score > 0:
-                    matched_keywords.append(f"{word}~{best_match}")
-                    server_score += score
+                    help_score, help_match = score, f"{word}~{best_match}"
+        
+        return WordScore(restart_score, server_score, restart_match, help_score, help_match)
+    
+    def analyze_restart_intent(self, normalized_text: str) -> Tuple[float, List[str]]:
+        """
+        Analyse l'intention de redémarrage dans le texte
+        
+        Args:
+            normalized_text: Texte normalisé à analyser
+            
+        Returns:
+            Tuple (score_confiance, mots_cles_trouves)
+        """
+        matched_keywords = []
+        restart_score = 0.0
+        server_score = 0.0
+        
+        for word in normalized_text.split():
+            word_score = self.score_word(word)
+            if word_score.restart_match is not None:
+                matched_keywords.append(word_score.restart_match)
+                restart_score += word_score.restart_score
+                server_score += word_score.server_score
         
         # Calcul du score final
         # Il faut au moins un mot de redémarrage ET un mot de serveur pour un bon score
@@ -233,24 +489,14 @@ class CommandParser:
         Returns:
             Tuple (score_confiance, mots_cles_trouves)
         """
-        words = normalized_text.split()
         matched_keywords = []
         help_score = 0.0
         
-        for word in words:
-            if word in self.help_keywords:
-                matched_keywords.append(word)
-                help_score += 1.0
-                continue
-            
-            # Recherche avec tolérance aux fautes
-            help_similar = self.find_similar_keywords(word, self.help_keywords, max_distance=1)
-            if help_similar:
-                best_match, distance = help_similar[0]
-                score = 1.0 - (distance * 0.5)
-                if score > 0:
-                    matched_keywords.append(f"{word}~{best_match}")
-                    help_score += score
+        for word in normalized_text.split():
+            word_score = self.score_word(word)
+            if word_score.help_match is not None:
+                matched_keywords.append(word_score.help_match)
+                help_score += word_score.help_score
         
         confidence = min(0.9, help_score * 0.8)
         return confidence, matched_keywords
@@ -269,13 +515,13 @@ class CommandParser:
         Returns:
             True si le bot est mentionné
         """
-        self.logger.debug(f"Détection mention - Message: '{message_content}'")
+        self.logger.debug("Détection mention - Message: '%s'", message_content)
         
         # PRIORITÉ 1: Vraies mentions Discord (<@!bot_id> ou <@bot_id>)
         if discord_message and hasattr(discord_message, 'mentions'):
             for mention in discord_message.mentions:
                 if mention.bot:  # C'est un bot mentionné
-                    self.logger.debug(f"Vraie mention Discord détectée: {mention.name}")
+                    self.logger.debug("Vraie mention Discord détectée: %s", mention.name)
                     return True
         
         # PRIORITÉ 2: Patterns de mention textuelle
@@ -287,20 +533,56 @@ class CommandParser:
             f"@{bot_name_lower}",           # @CubeGuardian
             f"@ {bot_name_lower}",          # @ CubeGuardian
             f"{bot_name_lower}",            # CubeGuardian
-            "bot",                          # bot
-            "@bot",                         # @bot
-            "hey bot",                      # hey bot
-            "salut bot",                    # salut bot
-        ]
+        ] + self.text_triggers              # bot, @bot, hey bot, salut bot (configurables)
         
         for pattern in mention_patterns:
             if pattern in message_lower:
-                self.logger.debug(f"Mention textuelle détectée: '{pattern}'")
+                self.logger.debug("Mention textuelle détectée: '%s'", pattern)
                 return True
         
         self.logger.debug("Aucune mention détectée")
         return False
 
+    def prefilter(self, message_content: str, bot_name: str = "CubeGuardian",
+                  require_mention: bool = True, discord_message=None) -> bool:
+        """
+        Filtre rapide avant parse_command : écarte les messages qui ne peuvent déclencher
+        ni redémarrage ni aide
+        
+        - Aucun mot à distance de recherche d'un mot-clé de redémarrage ou d'aide : rejet
+          sans recherche approchée
+        - Mention requise et absente (ni vraie mention ni déclencheur textuel) : le score de
+          redémarrage serait réduit sous le seuil, seuls les mots proches d'un mot-clé d'aide
+          font passer le message (l'aide reste disponible sans mention)
+        
+        Args:
+            message_content: Contenu du message
+            bot_name: Nom du bot (pour détecter les mentions)
+            require_mention: Si True, exige une mention du bot
+            discord_message: Objet message Discord (pour détecter les vraies mentions)
+            
+        Returns:
+            True si le message doit être analysé par parse_command
+        """
+        if not self.prefilter_enabled:
+            return True
+        
+        self.prefilter_checks += 1
+        if not message_content or not message_content.strip():
+            self.prefilter_rejected_keywords += 1
+            return False
+        
+        mentioned = not require_mention or self.detect_bot_mention(message_content, bot_name, discord_message)
+        might_match = (self.keyword_filter if mentioned else self.help_filter).might_match
+        if any(might_match(word) for word in self.normalize_text(message_content).split()):
+            return True
+        
+        if mentioned:
+            self.prefilter_rejected_keywords += 1
+        else:
+            self.prefilter_rejected_mention += 1
+        return False
+    
     def parse_command(self, message_content: str, bot_name: str = "CubeGuardian", 
                      require_mention: bool = True, discord_message=None) -> CommandResult:
         """
@@ -394,7 +676,7 @@ class CommandParser:
 
 💡 **Astuce :** Le bot tolère les fautes d'orthographe !"""
     
-    def get_statistics(self) -> Dict[str, int]:
+    def get_statistics(self) -> Dict[str, float]:
         """
         Retourne les statistiques du parser
         
@@ -405,7 +687,17 @@ class CommandParser:
             'restart_keywords_count': len(self.restart_keywords),
             'server_keywords_count': len(self.server_keywords),
             'help_keywords_count': len(self.help_keywords),
-            'total_keywords': len(self.restart_keywords) + len(self.server_keywords) + len(self.help_keywords)
+            'total_keywords': len(self.restart_keywords) + len(self.server_keywords) + len(self.help_keywords),
+            'fuzzy_searches': sum(index.searches for index in self.keyword_indexes.values()),
+            'fuzzy_comparisons': sum(index.comparisons for index in self.keyword_indexes.values()),
+            'prefilter_checks': self.prefilter_checks,
+            'prefilter_rejected_mention': self.prefilter_rejected_mention,
+            'prefilter_rejected_keywords': self.prefilter_rejected_keywords,
+            'word_cache_size': len(self._word_cache),
+            'word_cache_hits': self.word_cache_hits,
+            'word_cache_misses': self.word_cache_misses,
+            'word_cache_hit_rate': (self.word_cache_hits / (self.word_cache_hits + self.word_cache_misses)
+                                    if self.word_cache_hits + self.word_cache_misses else 0.0)
         }
     
     def __str__(self) -> str:
@@ -342,7 +342,7 @@ class ConfigManager:
         Returns:
             Valeur du timer en secondes
         """
-        return self.get_config(f'timers.{timer_name}', 60)
+        return self.get_config(f'bot.timers.{timer_name}', 60)
     
     def get_server_config(self, server_name: str) -> Dict[str, Any]:
         """
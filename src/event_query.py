@@ -0,0 +1,205 @@
+"""
+Requêtes sur le flux d'événements structurés du Bot CubeGuardian
+Les segments NDJSON sont projetés en mémoire (mmap) : seules les lignes candidates
+sont décodées, les segments hors de la plage de temps ne sont pas ouverts
+
+Exemple :
+    python -m src.event_query --type lifecycle --where operation=startup --since 30d --summary duration
+"""
+
+import argparse
+import json
+import mmap
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Iterator, Iterable
+
+from .log_manager import SegmentedLogHandler
+
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """
+    Convertit une date en timestamp
+
+    Args:
+        value: Date ISO (2025-01-16, 2025-01-16T08:00) ou durée relative (30d, 12h, 15m)
+
+    Returns:
+        Timestamp, None si value est vide
+    """
+    if not value:
+        return None
+
+    units = {'d': 86400, 'h': 3600, 'm': 60, 's': 1}
+    if value[-1] in units and value[:-1].isdigit():
+        return time.time() - int(value[:-1]) * units[value[-1]]
+
+    return datetime.fromisoformat(value).timestamp()
+
+
+class EventQuery:
+    """Lecture filtrée du flux d'événements (segments indexés + fichier courant)"""
+
+    def __init__(self, events_path: str = './logs/events.ndjson'):
+        """
+        Args:
+            events_path: Chemin du fichier d'événements courant
+        """
+        self.events_path = events_path
+        self.index_path = events_path + SegmentedLogHandler.INDEX_SUFFIX
+
+    def _files(self, since: Optional[float] = None, until: Optional[float] = None) -> List[str]:
+        """
+        Fichiers à parcourir, du plus ancien au plus récent
+
+        Les segments dont la plage [first_timestamp, last_timestamp] de l'index ne
+        recoupe pas [since, until] sont ignorés sans être ouverts
+        """
+        files = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                segments = json.load(f).get('segments', [])
+            for segment in segments:
+                if since is not None and (segment.get('last_timestamp') or 0) < since:
+                    continue
+                if until is not None and (segment.get('first_timestamp') or 0) > until:
+                    continue
+                files.append(f"{self.events_path}.{segment['sequence']}")
+
+        if os.path.exists(self.events_path):
+            files.append(self.events_path)
+        return files
+
+    @staticmethod
+    def _candidate_lines(path: str, needle: Optional[bytes]) -> Iterator[bytes]:
+        """
+        Parcourt les lignes d'un fichier projeté en mémoire
+
+        Args:
+            path: Fichier NDJSON
+            needle: Sous-chaîne obligatoire (seules les lignes la contenant sont renvoyées)
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                size = len(mapped)
+                position = 0
+                while position < size:
+                    if needle:
+                        match = mapped.find(needle, position)
+                        if match < 0:
+                            return
+                        start = mapped.rfind(b'\n', 0, match) + 1
+                    else:
+                        start = position
+                    end = mapped.find(b'\n', start)
+                    if end < 0:
+                        end = size
+                    yield mapped[start:end]
+                    position = end + 1
+
+    def iter_events(self, event_type: Optional[str] = None, user_id: Optional[int] = None,
+                    since: Optional[float] = None, until: Optional[float] = None,
+                    **fields) -> Iterator[Dict[str, Any]]:
+        """
+        Renvoie les événements correspondant aux filtres
+
+        Args:
+            event_type: Type d'événement (voice, server, lifecycle...)
+            user_id: ID Discord de l'utilisateur
+            since: Timestamp minimal
+            until: Timestamp maximal
+            **fields: Égalité stricte sur d'autres champs (ex: operation="startup")
+
+        Returns:
+            Itérateur sur les événements (dict), dans l'ordre chronologique
+        """
+        # Pré-filtre binaire : la sérialisation compacte permet une recherche par sous-chaîne
+        needle = None
+        if event_type is not None:
+            needle = f'"type":{json.dumps(event_type, ensure_ascii=False)}'.encode('utf-8')
+        elif user_id is not None:
+            needle = f'"user_id":{int(user_id)}'.encode('utf-8')
+
+        for path in self._files(since, until):
+            for line in self._candidate_lines(path, needle):
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # Ligne en cours d'écriture dans le fichier courant
+                    continue
+
+                if event_type is not None and event.get('type') != event_type:
+                    continue
+                if user_id is not None and event.get('user_id') != user_id:
+                    continue
+                timestamp = event.get('ts', 0)
+                if since is not None and timestamp < since:
+                    continue
+                if until is not None and timestamp > until:
+                    continue
+                if any(str(event.get(key)) != str(value) for key, value in fields.items()):
+                    continue
+                yield event
+
+    @staticmethod
+    def summarize(events: Iterable[Dict[str, Any]], field: str) -> Dict[str, Any]:
+        """
+        Statistiques d'un champ numérique
+
+        Args:
+            events: Événements à agréger
+            field: Champ à mesurer (ex: duration)
+
+        Returns:
+            count, min, max, mean, p50, p90
+        """
+        values = sorted(event[field] for event in events if isinstance(event.get(field), (int, float)))
+        if not values:
+            return {'count': 0}
+
+        def percentile(p: float) -> float:
+            return values[min(len(values) - 1, int(round((len(values) - 1) * p / 100)))]
+
+        return {
+            'count': len(values),
+            'min': values[0],
+            'max': values[-1],
+            'mean': statistics.fmean(values),
+            'p50': percentile(50),
+            'p90': percentile(90)
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Requêtes sur le flux d'événements CubeGuardian")
+    parser.add_argument('--path', default='./logs/events.ndjson', help="Fichier d'événements courant")
+    parser.add_argument('--type', dest='event_type', help="Type d'événement (voice, server, lifecycle...)")
+    parser.add_argument('--user-id', type=int, help="ID Discord de l'utilisateur")
+    parser.add_argument('--since', help="Début : date ISO ou durée relative (30d, 12h)")
+    parser.add_argument('--until', help="Fin : date ISO ou durée relative")
+    parser.add_argument('--where', action='append', default=[], metavar='CHAMP=VALEUR',
+                        help="Filtre d'égalité sur un champ (répétable)")
+    parser.add_argument('--summary', metavar='CHAMP', help="Afficher les statistiques d'un champ numérique")
+    args = parser.parse_args(argv)
+
+    fields = dict(condition.split('=', 1) for condition in args.where)
+    query = EventQuery(args.path)
+    events = query.iter_events(args.event_type, args.user_id,
+                               parse_time(args.since), parse_time(args.until), **fields)
+
+    if args.summary:
+        print(json.dumps(query.summarize(events, args.summary), ensure_ascii=False))
+    else:
+        for event in events:
+            print(json.dumps(event, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Échantillonnage continu de l'état des serveurs pour Bot CubeGuardian
+Une tâche de fond vérifie Proxmox et Minecraft à intervalle régulier pendant que le serveur
+est en service ; les mesures sont conservées dans un tampon circulaire de taille fixe
+"""
+
+import asyncio
+import logging
+import time
+from array import array
+from typing import Dict, Any, Optional, Callable, Iterator, NamedTuple
+
+from .server_manager.probe_engine import ProbeEngine
+
+
+class HealthSample(NamedTuple):
+    """Mesure de l'état des serveurs"""
+    timestamp: float
+    proxmox_up: bool
+    minecraft_up: bool
+    latency_ms: float
+    players_online: int
+
+    @property
+    def age(self) -> float:
+        """Ancienneté de la mesure (secondes)"""
+        return time.time() - self.timestamp
+
+
+class HealthRingBuffer:
+    """
+    Tampon circulaire de mesures (une colonne array par champ)
+
+    Ajout et lecture de la dernière mesure en O(1), mémoire fixe quelle que soit la durée
+    """
+
+    def __init__(self, capacity: int = 2880):
+        """
+        Args:
+            capacity: Nombre de mesures conservées
+        """
+        self.capacity = capacity
+        self._timestamps = array('d', [0.0]) * capacity
+        self._latencies = array('d', [0.0]) * capacity
+        self._players = array('i', [0]) * capacity
+        self._flags = array('B', [0]) * capacity  # bit 0 : Proxmox, bit 1 : Minecraft
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, sample: HealthSample) -> None:
+        """Ajoute une mesure (écrase la plus ancienne si le tampon est plein)"""
+        index = self._next
+        self._timestamps[index] = sample.timestamp
+        self._latencies[index] = sample.latency_ms
+        self._players[index] = sample.players_online
+        self._flags[index] = int(sample.proxmox_up) | (int(sample.minecraft_up) << 1)
+        self._next = (index + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _sample_at(self, index: int) -> HealthSample:
+        flags = self._flags[index]
+        return HealthSample(self._timestamps[index], bool(flags & 1), bool(flags & 2),
+                            self._latencies[index], self._players[index])
+
+    def latest(self) -> Optional[HealthSample]:
+        """Dernière mesure, None si le tampon est vide"""
+        if not self._count:
+            return None
+        return self._sample_at((self._next - 1) % self.capacity)
+
+    def __iter__(self) -> Iterator[HealthSample]:
+        """Mesures de la plus ancienne à la plus récente"""
+        start = (self._next - self._count) % self.capacity
+        for offset in range(self._count):
+            yield self._sample_at((start + offset) % self.capacity)
+
+
+class HealthSampler:
+    """Tâche de fond alimentant le tampon de mesures tant que is_active() est vrai"""
+
+    def __init__(self, probe_engine: ProbeEngine, logger: logging.Logger,
+                 is_active: Callable[[], bool], interval: float = 30.0, capacity: int = 2880):
+        """
+        Args:
+            probe_engine: Moteur de vérifications (cache et appels partagés)
+            logger: Logger à utiliser
+            is_active: Indique si les serveurs doivent être échantillonnés (état du bot)
+            interval: Intervalle entre deux mesures (secondes)
+            capacity: Nombre de mesures conservées
+        """
+        self.probe_engine = probe_engine
+        self.logger = logger
+        self.is_active = is_active
+        self.interval = interval
+        self.buffer = HealthRingBuffer(capacity)
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], probe_engine: ProbeEngine, logger: logging.Logger,
+                    is_active: Callable[[], bool]) -> 'HealthSampler':
+        """
+        Construit l'échantillonneur depuis la section health_sampler de bot.yaml
+
+        Args:
+            config: Configuration de l'échantillonneur
+            probe_engine: Moteur de vérifications
+            logger: Logger à utiliser
+            is_active: Indique si les serveurs doivent être échantillonnés
+
+        Returns:
+            Échantillonneur configuré
+        """
+        config = config or {}
+        return cls(probe_engine, logger, is_active,
+                   interval=config.get('interval', 30),
+                   capacity=config.get('capacity', 2880))
+
+    def start(self) -> None:
+        """Démarre la tâche d'échantillonnage"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name='health-sampler')
+
+    async def stop(self) -> None:
+        """Arrête la tâche d'échantillonnage"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def sample(self) -> HealthSample:
+        """
+        Vérifie Proxmox et Minecraft en parallèle et enregistre la mesure
+
+        Returns:
+            Mesure enregistrée
+        """
+        snapshot = await self.probe_engine.snapshot('proxmox', 'minecraft')
+        details = snapshot.get('minecraft').get('details', {}) or {}
+        latency = details.get('latency_ms')
+        sample = HealthSample(
+            timestamp=snapshot.started_at,
+            proxmox_up=snapshot.ok('proxmox'),
+            minecraft_up=snapshot.ok('minecraft'),
+            latency_ms=latency if latency is not None else snapshot.duration * 1000,
+            players_online=details.get('players_online') or 0
+        )
+        self.buffer.append(sample)
+        return sample
+
+    async def _run(self) -> None:
+        """Boucle d'échantillonnage"""
+        try:
+            while True:
+                if self.is_active():
+                    try:
+                        sample = await self.sample()
+                        if not sample.minecraft_up:
+                            self.logger.warning(f"Mesure de fond : Minecraft injoignable "
+                                                f"(Proxmox {'UP' if sample.proxmox_up else 'DOWN'})")
+                    except Exception as e:
+                        self.logger.error(f"Erreur lors de l'échantillonnage: {e}")
+                await asyncio.sleep(self.interval)
+        except asyncio.CancelledError:
+            pass
+
+    def latest(self, max_age: Optional[float] = None) -> Optional[HealthSample]:
+        """
+        Dernière mesure, en O(1)
+
+        Args:
+            max_age: Ancienneté maximale acceptée (secondes, par défaut deux intervalles)
+
+        Returns:
+            Dernière mesure, None si aucune mesure assez récente ou si l'échantillonnage est
+            suspendu (une mesure antérieure à un arrêt ne décrit plus l'état des serveurs)
+        """
+        if not self.is_active():
+            return None
+        sample = self.buffer.latest()
+        max_age = max_age if max_age is not None else 2 * self.interval
+        if sample is None or sample.age > max_age:
+            return None
+        return sample
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Récupère les statistiques des mesures conservées
+
+        Returns:
+            Nombre de mesures, disponibilité de Minecraft, latence moyenne, dernière mesure
+        """
+        samples = list(self.buffer)
+        latest = self.buffer.latest()
+        minecraft_up = [sample for sample in samples if sample.minecraft_up]
+        return {
+            'running': self._task is not None and not self._task.done(),
+            'interval': self.interval,
+            'samples': len(samples),
+            'minecraft_availability': len(minecraft_up) / len(samples) if samples else None,
+            'mean_latency_ms': (sum(sample.latency_ms for sample in minecraft_up) / len(minecraft_up)
+                                if minecraft_up else None),
+            'latest': latest._asdict() if latest else None
+        }
@@ -0,0 +1,235 @@
+"""
+Serveur HTTP de supervision pour Bot CubeGuardian
+Expose /health (HEALTHCHECK Docker) et /metrics (Prometheus) sur la boucle asyncio du bot
+"""
+
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from aiohttp import web
+
+try:
+    from prometheus_client import CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST
+    from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily, HistogramMetricFamily
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+
+def _histogram_family(name: str, documentation: str, label_name: str,
+                      series: Dict[str, Dict[str, Any]]) -> 'HistogramMetricFamily':
+    """Construit un histogramme Prometheus depuis les statistiques de LatencyHistogram"""
+    family = HistogramMetricFamily(name, documentation, labels=[label_name])
+    for label_value, statistics in series.items():
+        family.add_metric([label_value], buckets=list(statistics['buckets'].items()),
+                          sum_value=statistics['sum'])
+    return family
+
+
+class BotMetricsCollector:
+    """
+    Collecteur Prometheus construit à chaque requête depuis get_bot_info()
+    et les statistiques des gestionnaires (aucun état dupliqué)
+    """
+
+    def __init__(self, bot, health_server: 'HealthServer'):
+        """
+        Args:
+            bot: Instance de CubeGuardianBot
+            health_server: Serveur de supervision
+        """
+        self.bot = bot
+        self.health_server = health_server
+
+    def collect(self):
+        """Génère les familles de métriques"""
+        info = self.bot.get_bot_info()
+
+        yield GaugeMetricFamily('cubeguardian_uptime_seconds', "Durée de fonctionnement du bot",
+                                value=info.get('uptime_seconds', 0))
+        yield GaugeMetricFamily('cubeguardian_discord_connected', "Connexion à la gateway Discord",
+                                value=1 if self.health_server.is_discord_connected() else 0)
+
+        state = GaugeMetricFamily('cubeguardian_bot_state', "État courant du bot", labels=['state'])
+        for bot_state in type(self.bot.state):
+            state.add_metric([bot_state.value], 1 if bot_state.value == info.get('state') else 0)
+        yield state
+
+        # Vérifications Proxmox / Minecraft
+        probe_statistics = info.get('probe_statistics', {})
+        probes = probe_statistics.get('probes', {})
+        yield _histogram_family('cubeguardian_probe_latency_seconds', "Durée des vérifications de disponibilité",
+                                'probe', {probe: stats['latency'] for probe, stats in probes.items()})
+        results = CounterMetricFamily('cubeguardian_probe', "Résultats des vérifications", labels=['probe', 'result'])
+        last_success = GaugeMetricFamily('cubeguardian_probe_last_success_timestamp_seconds',
+                                         "Dernière vérification réussie", labels=['probe'])
+        for probe, stats in probes.items():
+            results.add_metric([probe, 'success'], stats['success'])
+            results.add_metric([probe, 'failure'], stats['failure'])
+            if stats['last_success'] is not None:
+                last_success.add_metric([probe], stats['last_success'])
+        yield results
+        yield last_success
+
+        minecraft_details = probes.get('minecraft', {}).get('last_details', {})
+        if 'players_online' in minecraft_details:
+            yield GaugeMetricFamily('cubeguardian_minecraft_players_online',
+                                    "Joueurs connectés (dernière vérification réussie)",
+                                    value=minecraft_details.get('players_online') or 0)
+
+        # Démarrages / arrêts / redémarrages
+        lifecycle = probe_statistics.get('lifecycle', {})
+        yield _histogram_family('cubeguardian_lifecycle_duration_seconds',
+                                "Durée des démarrages, arrêts et redémarrages",
+                                'operation', {operation: stats['duration'] for operation, stats in lifecycle.items()})
+        operations = CounterMetricFamily('cubeguardian_lifecycle_operations', "Opérations terminées",
+                                         labels=['operation', 'result'])
+        for operation, stats in lifecycle.items():
+            operations.add_metric([operation, 'success'], stats['success'])
+            operations.add_metric([operation, 'failure'], stats['failure'])
+        yield operations
+
+        # API Proxmox
+        proxmox = info.get('proxmox_http_statistics', {})
+        if proxmox:
+            yield _histogram_family('cubeguardian_proxmox_api_latency_seconds', "Latence des requêtes API Proxmox",
+                                    'method', proxmox.get('latency', {}))
+            yield CounterMetricFamily('cubeguardian_proxmox_connections_created',
+                                      "Connexions TCP/TLS ouvertes vers Proxmox",
+                                      value=proxmox.get('connections_created', 0))
+            yield CounterMetricFamily('cubeguardian_proxmox_connections_reused',
+                                      "Connexions keep-alive réutilisées (handshakes évités)",
+                                      value=proxmox.get('connections_reused', 0))
+
+        # Sécurité (événements conservés sur la fenêtre de rétention)
+        security = info.get('security_statistics', {})
+        events = GaugeMetricFamily('cubeguardian_security_events', "Événements de sécurité par type",
+                                   labels=['type'])
+        for event_type, count in security.get('event_counts', {}).items():
+            events.add_metric([event_type], count)
+        yield events
+
+        # Boucle asyncio
+        loop_statistics = self.bot.loop_monitor.get_statistics()
+        yield _histogram_family('cubeguardian_event_loop_lag_seconds', "Retard d'ordonnancement de la boucle asyncio",
+                                'loop', {'main': loop_statistics['lag']})
+        yield _histogram_family('cubeguardian_slow_callback_duration_seconds',
+                                "Durée des callbacks ayant bloqué la boucle au-delà du seuil",
+                                'loop', {'main': loop_statistics['slow_callbacks']})
+
+
+class HealthServer:
+    """Serveur HTTP aiohttp exposant /health et /metrics"""
+
+    def __init__(self, bot, config: Dict[str, Any], logger: logging.Logger):
+        """
+        Initialise le serveur de supervision
+
+        Args:
+            bot: Instance de CubeGuardianBot
+            config: Section health_server de bot.yaml
+            logger: Logger à utiliser
+        """
+        self.bot = bot
+        self.logger = logger
+        self.enabled = config.get('enabled', True)
+        self.host = config.get('host', '0.0.0.0')
+        self.port = config.get('port', 8080)
+
+        self.runner: Optional[web.AppRunner] = None
+
+        self.registry = None
+        if PROMETHEUS_AVAILABLE:
+            self.registry = CollectorRegistry()
+            self.registry.register(BotMetricsCollector(bot, self))
+
+    def create_app(self) -> web.Application:
+        """
+        Crée l'application aiohttp
+
+        Returns:
+            Application avec les routes /health et /metrics
+        """
+        app = web.Application()
+        app.router.add_get('/health', self.handle_health)
+        app.router.add_get('/metrics', self.handle_metrics)
+        return app
+
+    async def start(self) -> None:
+        """Démarre le serveur HTTP"""
+        if not self.enabled or self.runner:
+            return
+
+        try:
+            self.runner = web.AppRunner(self.create_app(), access_log=None)
+            await self.runner.setup()
+            await web.TCPSite(self.runner, self.host, self.port).start()
+            self.logger.info(f"Serveur de supervision démarré sur {self.host}:{self.port} "
+                             f"(métriques Prometheus: {'oui' if PROMETHEUS_AVAILABLE else 'non'})")
+        except Exception as e:
+            self.logger.error(f"Impossible de démarrer le serveur de supervision: {e}")
+            await self.stop()
+
+    async def stop(self) -> None:
+        """Arrête le serveur HTTP"""
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+    def is_discord_connected(self) -> bool:
+        """Indique si le bot est connecté à la gateway Discord"""
+        return self.bot.is_ready() and not self.bot.is_closed()
+
+    def get_health(self) -> Dict[str, Any]:
+        """
+        État de santé du bot
+
+        Returns:
+            Connexion Discord, état du bot et dernières vérifications réussies
+        """
+        probes = self.bot.server_manager.get_probe_statistics()['probes']
+        last_successful_probe = {}
+        for probe, statistics in probes.items():
+            timestamp = statistics['last_success']
+            last_successful_probe[probe] = {
+                'timestamp': datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S") if timestamp else None,
+                'age_seconds': round(time.time() - timestamp, 1) if timestamp else None
+            }
+
+        connected = self.is_discord_connected()
+        latency = self.bot.latency if connected else None
+        return {
+            'status': 'ok' if connected else 'unavailable',
+            'discord_connected': connected,
+            'discord_latency_ms': round(latency * 1000, 1) if latency is not None and latency == latency else None,
+            'state': self.bot.state.value,
+            'last_successful_probe': last_successful_probe,
+            'event_loop_lag_ms': round(self.bot.loop_monitor.last_lag * 1000, 2)
+        }
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        """GET /health : 200 si la gateway Discord est connectée, 503 sinon"""
+        try:
+            health = self.get_health()
+        except Exception as e:
+            self.logger.error(f"Erreur lors du calcul de l'état de santé: {e}")
+            return web.json_response({'status': 'error', 'error': str(e)}, status=500)
+
+        status = 200 if health['discord_connected'] else 503
+        return web.json_response(health, status=status, dumps=lambda data: json.dumps(data, ensure_ascii=False))
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        """GET /metrics : exposition au format Prometheus"""
+        if not PROMETHEUS_AVAILABLE:
+            return web.Response(status=503, text="prometheus-client non installé\n")
+
+        try:
+            output = generate_latest(self.registry)
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la génération des métriques: {e}")
+            return web.Response(status=500, text=f"{e}\n")
+
+        return web.Response(body=output, headers={'Content-Type': CONTENT_TYPE_LATEST})
@@ -0,0 +1,221 @@
+"""
+Index des mots-clés pour Bot CubeGuardian
+Arbre BK (Burkhard-Keller) : recherche des mots-clés à distance bornée sans comparer le mot
+à tout le vocabulaire ; l'inégalité triangulaire élimine les sous-arbres hors de portée.
+Filtre par suppressions : écarte en quelques recherches de hachage les mots qui ne peuvent
+être proches d'aucun mot-clé
+"""
+
+from itertools import combinations
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class BKTree:
+    """
+    Arbre BK sur une distance d'édition
+
+    Chaque nœud est un mot-clé ; ses enfants sont indexés par leur distance à ce mot-clé.
+    Pour une recherche à distance max_distance, seuls les enfants dont l'arête est dans
+    [d - max_distance, d + max_distance] peuvent contenir un résultat. Avec une distance
+    bornée, le calcul pour un nœud s'arrête dès que d dépasse max_distance + sa plus
+    grande arête : ni le nœud ni ses enfants ne peuvent alors convenir
+    """
+
+    def __init__(self, distance: Callable[[str, str], int], words: Iterable[str] = (),
+                 bounded_distance: Optional[Callable[[str, str, int], int]] = None):
+        """
+        Args:
+            distance: Distance d'édition (métrique entière)
+            words: Mots-clés à indexer (insérés dans l'ordre alphabétique, arbre déterministe)
+            bounded_distance: Variante bornée (s1, s2, borne) -> distance exacte ou borne + 1
+        """
+        self.distance = distance
+        self.bounded_distance = bounded_distance
+        self._root: Optional[list] = None  # [mot-clé, enfants par distance, plus grande arête]
+        self.size = 0
+
+        # Statistiques : recherches et distances calculées
+        self.searches = 0
+        self.comparisons = 0
+
+        for word in sorted(set(words)):
+            self.add(word)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, word: str) -> None:
+        """
+        Ajoute un mot-clé
+
+        Args:
+            word: Mot-clé à indexer
+        """
+        if self._root is None:
+            self._root = [word, {}, 0]
+            self.size = 1
+            return
+
+        node = self._root
+        while True:
+            distance = self.distance(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [word, {}, 0]
+                node[2] = max(node[2], distance)
+                self.size += 1
+                return
+            node = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[str, int]]:
+        """
+        Trouve les mots-clés à distance au plus max_distance
+
+        Args:
+            word: Mot à rechercher
+            max_distance: Distance maximale autorisée
+
+        Returns:
+            Liste de tuples (mot_cle, distance) triée par distance puis par mot-clé
+        """
+        self.searches += 1
+        if self._root is None:
+            return []
+
+        results = []
+        stack = [self._root]
+        while stack:
+            keyword, children, max_edge = stack.pop()
+            self.comparisons += 1
+            if self.bounded_distance is not None:
+                reach = max_distance + max_edge
+                distance = self.bounded_distance(word, keyword, reach)
+                if distance > reach:
+                    continue
+            else:
+                distance = self.distance(word, keyword)
+            if distance <= max_distance:
+                results.append((keyword, distance))
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+
+        results.sort(key=lambda item: (item[1], item[0]))
+        return results
+
+    def get_statistics(self) -> Dict[str, float]:
+        """
+        Récupère les statistiques de l'index
+
+        Returns:
+            Taille, recherches et nombre moyen de distances calculées par recherche
+        """
+        return {
+            'size': self.size,
+            'searches': self.searches,
+            'comparisons': self.comparisons,
+            'comparisons_per_search': self.comparisons / self.searches if self.searches else 0.0
+        }
+
+
+def deletion_variants(word: str, max_deletions: int) -> Iterator[Tuple[str, int]]:
+    """
+    Énumère les chaînes obtenues en supprimant au plus max_deletions caractères
+
+    Args:
+        word: Mot de départ
+        max_deletions: Nombre maximal de suppressions
+
+    Returns:
+        Itérateur de tuples (variante, nombre de suppressions), doublons possibles
+    """
+    length = len(word)
+    for deletions in range(min(max_deletions, length) + 1):
+        for kept in combinations(range(length), length - deletions):
+            yield ''.join(word[i] for i in kept), deletions
+
+
+class DeletionFilter:
+    """
+    Filtre d'appartenance approchée à un vocabulaire (voisinage par suppressions)
+
+    Si la distance de Levenshtein entre un mot et un mot-clé est au plus d, il existe une
+    chaîne obtenue à la fois depuis le mot et depuis le mot-clé en au plus d suppressions
+    (une substitution est une suppression de chaque côté). Les variantes des mots-clés sont
+    précalculées : un mot dont aucune variante n'est connue ne peut correspondre à aucun
+    mot-clé. Le filtre ne rejette jamais à tort ; il peut laisser passer un mot lointain
+    """
+
+    def __init__(self, vocabularies: Iterable[Tuple[Iterable[str], int]] = ()):
+        """
+        Args:
+            vocabularies: Couples (mots-clés, distance maximale de recherche)
+        """
+        # Variante -> plus grande distance de recherche pour laquelle elle est valide
+        self._variants: Dict[str, int] = {}
+        self.max_distance = 0
+        self.min_length = 0
+        self.max_length = 0
+
+        # Statistiques : mots testés et mots écartés
+        self.checks = 0
+        self.rejections = 0
+
+        for keywords, max_distance in vocabularies:
+            self.add(keywords, max_distance)
+
+    def __len__(self) -> int:
+        return len(self._variants)
+
+    def add(self, keywords: Iterable[str], max_distance: int) -> None:
+        """
+        Ajoute un vocabulaire
+
+        Args:
+            keywords: Mots-clés
+            max_distance: Distance maximale utilisée pour les rechercher
+        """
+        for keyword in keywords:
+            if not self._variants:
+                self.min_length = self.max_length = len(keyword)
+            for variant, deletions in deletion_variants(keyword, max_distance):
+                if self._variants.get(variant, -1) < max_distance:
+                    self._variants[variant] = max_distance
+            self.min_length = min(self.min_length, len(keyword) - max_distance)
+            self.max_length = max(self.max_length, len(keyword) + max_distance)
+        self.max_distance = max(self.max_distance, max_distance)
+
+    def might_match(self, word: str) -> bool:
+        """
+        Indique si le mot peut être proche d'un mot-clé
+
+        Args:
+            word: Mot normalisé
+
+        Returns:
+            False si aucun mot-clé n'est à distance de recherche du mot
+        """
+        self.checks += 1
+        if self.min_length <= len(word) <= self.max_length:
+            variants = self._variants
+            for variant, deletions in deletion_variants(word, self.max_distance):
+                if variants.get(variant, -1) >= deletions:
+                    return True
+        self.rejections += 1
+        return False
+
+    def get_statistics(self) -> Dict[str, float]:
+        """
+        Récupère les statistiques du filtre
+
+        Returns:
+            Nombre de variantes, mots testés, mots écartés et taux de rejet
+        """
+        return {
+            'variants': len(self._variants),
+            'checks': self.checks,
+            'rejections': self.rejections,
+            'rejection_rate': self.rejections / self.checks if self.checks else 0.0
+        }
@@ -1,16 +1,296 @@
 """
 Gestionnaire de logs pour Bot CubeGuardian
-Gestion centralisée des logs avec rotation automatique par nombre de lignes
+Gestion centralisée des logs avec rotation par segments (nombre de lignes ou taille)
+Les écritures sont faites par un thread dédié (QueueHandler/QueueListener) :
+un appel de log ne bloque jamais la boucle asyncio
 """
 
+import json
 import logging
 import logging.handlers
 import os
+import queue
 import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+
+class SegmentedLogHandler(logging.FileHandler):
+    """
+    Handler fichier segmenté avec index
+    
+    - Le fichier courant devient un segment (renommage) dès qu'il atteint segment_lines
+      lignes ou max_bytes octets : aucune réécriture de fichier
+    - Index JSON (segment -> premier/dernier timestamp, nombre de lignes, taille, offset)
+      mis à jour uniquement lors des rotations
+    - Compteurs tenus à chaque écriture : statistiques sans relecture des fichiers
+    - Flush groupé : le disque n'est sollicité qu'une fois par lot d'enregistrements
+    """
+    
+    INDEX_SUFFIX = '.index'
+    
+    def __init__(self, filename, segment_lines: int = 200, max_segments: int = 5, max_bytes: int = 0,
+                 keep_oldest: bool = False, flush_batch: int = 50, encoding: str = 'utf-8'):
+        """
+        Args:
+            filename: Chemin du fichier de logs courant
+            segment_lines: Nombre de lignes par segment (0 pour désactiver la rotation par lignes)
+            max_segments: Nombre maximum de segments conservés
+            max_bytes: Taille maximale d'un segment en octets (0 pour illimité)
+            keep_oldest: Une fois max_segments atteint, abandonner les nouvelles lignes
+                         au lieu de supprimer les segments les plus anciens
+            flush_batch: Nombre maximum d'enregistrements écrits avant un flush forcé
+            encoding: Encodage du fichier
+        """
+        super().__init__(filename, mode='a', encoding=encoding, delay=True)
+        self.segment_lines = segment_lines
+        self.max_segments = max(1, max_segments)
+        self.max_bytes = max_bytes
+        self.keep_oldest = keep_oldest
+        self.flush_batch = max(1, flush_batch)
+        self.index_path = self.baseFilename + self.INDEX_SUFFIX
+        
+        self.rotations = 0
+        self.dropped_lines = 0
+        self._pending = 0
+        
+        # Segments fermés (du plus ancien au plus récent) et totaux associés
+        self.segments: List[Dict[str, Any]] = []
+        self.next_sequence = 1
+        self.segments_lines = 0
+        self.segments_size = 0
+        self._load_index()
+        
+        # Fichier courant
+        self.line_count = 0
+        self.size = 0
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+        self._load_live_file()
+    
+    def _load_index(self) -> None:
+        """Charge l'index des segments (ou repart des fichiers numérotés existants)"""
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                self.segments = [segment for segment in index.get('segments', [])
+                                 if os.path.exists(self._segment_path(segment['sequence']))]
+                self.next_sequence = index.get('next_sequence', 1)
+            except (OSError, ValueError, KeyError):
+                self.segments = []
+        
+        if not self.segments:
+            # Pas d'index : ne pas écraser d'anciens fichiers numérotés
+            directory = os.path.dirname(self.baseFilename)
+            prefix = os.path.basename(self.baseFilename) + '.'
+            for name in os.listdir(directory):
+                suffix = name[len(prefix):] if name.startswith(prefix) else ''
+                if suffix.isdigit():
+                    self.next_sequence = max(self.next_sequence, int(suffix) + 1)
+        
+        self.segments_lines = sum(segment['line_count'] for segment in self.segments)
+        self.segments_size = sum(segment['size'] for segment in self.segments)
+    
+    def _load_live_file(self) -> None:
+        """Compte une seule fois les lignes du fichier courant (au plus un segment)"""
+        if not os.path.exists(self.baseFilename):
+            return
+        
+        stat = os.stat(self.baseFilename)
+        self.size = stat.st_size
+        self.first_timestamp = stat.st_ctime
+        self.last_timestamp = stat.st_mtime
+        with open(self.baseFilename, 'rb') as f:
+            self.line_count = sum(1 for _ in f)
+    
+    def _segment_path(self, sequence: int) -> str:
+        """Chemin du fichier d'un segment"""
+        return f"{self.baseFilename}.{sequence}"
+    
+    def _save_index(self) -> None:
+        """Écrit l'index de manière atomique"""
+        temporary_path = self.index_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump({'next_sequence': self.next_sequence, 'segments': self.segments}, f)
+        os.replace(temporary_path, self.index_path)
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Écrit l'enregistrement sans flush systématique puis met à jour les compteurs"""
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            
+            message = self.format(record) + self.terminator
+            self.stream.write(message)
+            
+            self._pending += 1
+            if self._pending >= self.flush_batch:
+                self.flush()
+            
+            self.line_count += message.count('\n')
+            self.size += len(message.encode(self.encoding or 'utf-8'))
+            if self.first_timestamp is None:
+                self.first_timestamp = record.created
+            self.last_timestamp = record.created
+            
+            if self.should_rotate():
+                self.rotate()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def should_rotate(self) -> bool:
+        """Indique si le fichier courant a atteint la taille d'un segment"""
+        return ((self.segment_lines and self.line_count >= self.segment_lines) or
+                (self.max_bytes and self.size >= self.max_bytes))
+    
+    def rotate(self) -> None:
+        """Ferme le fichier courant et le renomme en segment (aucune réécriture)"""
+        if self.stream is not None:
+            self.flush()
+            self.stream.close()
+            self.stream = None
+        
+        if not os.path.exists(self.baseFilename):
+            return
+        
+        previous_lines = self.line_count
+        if self.keep_oldest and len(self.segments) >= self.max_segments:
+            # Stockage plein : les nouvelles lignes sont abandonnées
+            os.remove(self.baseFilename)
+            self.dropped_lines += previous_lines
+            message = f"Rotation des logs: stockage plein, {previous_lines} lignes abandonnées"
+        else:
+            sequence = self.next_sequence
+            os.replace(self.baseFilename, self._segment_path(sequence))
+            offset = (self.segments[-1]['offset'] + self.segments[-1]['size']) if self.segments else 0
+            self.segments.append({
+                'sequence': sequence,
+                'first_timestamp': self.first_timestamp,
+                'last_timestamp': self.last_timestamp,
+                'line_count': self.line_count,
+                'size': self.size,
+                'offset': offset
+            })
+            self.next_sequence += 1
+            self.segments_lines += self.line_count
+            self.segments_size += self.size
+            self._drop_segments(len(self.segments) - self.max_segments)
+            message = f"Rotation des logs effectuée: segment {sequence} ({previous_lines} lignes)"
+        
+        self._save_index()
+        self.line_count = 0
+        self.size = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.rotations += 1
+        logging.getLogger('CubeGuardian.LogManager').info(message)
+    
+    def _drop_segments(self, count: int) -> List[str]:
+        """Supprime les count segments les plus anciens (sans sauvegarder l'index)"""
+        dropped = []
+        for segment in self.segments[:max(0, count)]:
+            path = self._segment_path(segment['sequence'])
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.segments_lines -= segment['line_count']
+            self.segments_size -= segment['size']
+            dropped.append(os.path.basename(path))
+        del self.segments[:len(dropped)]
+        return dropped
+    
+    def drop_segments_before(self, cutoff: float) -> List[str]:
+        """
+        Supprime les segments dont le dernier enregistrement est antérieur à cutoff
+        
+        Args:
+            cutoff: Timestamp limite
+            
+        Returns:
+            Noms des fichiers supprimés
+        """
+        self.acquire()
+        try:
+            count = 0
+            for segment in self.segments:
+                if (segment['last_timestamp'] or 0) >= cutoff:
+                    break
+                count += 1
+            dropped = self._drop_segments(count)
+            if dropped:
+                self._save_index()
+            return dropped
+        finally:
+            self.release()
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Statistiques du stockage (compteurs en mémoire, sans lecture de fichier)
+        
+        Returns:
+            Lignes/taille du fichier courant et des segments
+        """
+        return {
+            'live_lines': self.line_count,
+            'live_size': self.size,
+            'segments_count': len(self.segments),
+            'segments_lines': self.segments_lines,
+            'segments_size': self.segments_size,
+            'total_lines': self.segments_lines + self.line_count,
+            'total_size': self.segments_size + self.size,
+            'oldest_timestamp': (self.segments[0]['first_timestamp'] if self.segments
+                                 else self.first_timestamp),
+            'rotations': self.rotations,
+            'dropped_lines': self.dropped_lines
+        }
+    
+    def flush(self) -> None:
+        """Vide le tampon d'écriture"""
+        super().flush()
+        self._pending = 0
+
+
+class EventFormatter(logging.Formatter):
+    """
+    Formate un événement structuré en une ligne JSON (NDJSON)
+    Champs communs : ts (timestamp), type, level, puis les champs de l'événement
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        """Sérialise l'événement sans espaces (recherche par sous-chaîne possible)"""
+        event = {
+            'ts': round(record.created, 3),
+            'type': record.event_type,
+            'level': record.levelname
+        }
+        event.update(record.event_fields)
+        return json.dumps(event, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def is_event_record(record: logging.LogRecord) -> bool:
+    """Filtre : enregistrement portant un événement structuré"""
+    return hasattr(record, 'event_type')
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener qui vide les handlers lorsque la file est vide
+    Une rafale de logs est écrite en un seul flush
+    """
+    
+    def handle(self, record: logging.LogRecord) -> None:
+        """Traite un enregistrement puis flush les handlers en fin de rafale"""
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+
 class LogManager:
     """Gestionnaire de logs centralisé avec rotation par lignes"""
     
@@ -31,6 +311,12 @@ class LogManager:
         self.max_lines = logging_config.get('max_lines', 200)
         self.rotation_enabled = logging_config.get('rotation_enabled', True)
         self.keep_oldest = logging_config.get('keep_oldest', False)
+        self.flush_batch = logging_config.get('flush_batch', 50)
+        
+        # Pipeline asynchrone (thread d'écriture)
+        self.file_handler: Optional[SegmentedLogHandler] = None
+        self.events_handler: Optional[SegmentedLogHandler] = None
+        self.listener: Optional[BatchingQueueListener] = None
         
         # Création du répertoire de logs
         self.log_file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -56,16 +342,22 @@ class LogManager:
         log_level = bot_config.get('log_level', 'INFO')
         self.logger.setLevel(getattr(logging, log_level))
         
-        # Éviter les doublons de handlers
+        # Éviter les doublons de handlers (et arrêter un pipeline précédent)
+        self.close()
         if self.logger.handlers:
             self.logger.handlers.clear()
         
-        # Handler fichier avec rotation par taille
+        handlers = []
+        
+        # Handler fichier segmenté (rotation par lignes ou par taille = renommage)
         if logging_config.get('file_enabled', True):
-            file_handler = logging.handlers.RotatingFileHandler(
-                self.log_file_path,
-                maxBytes=self._parse_size(logging_config.get('max_file_size', '10MB')),
-                backupCount=logging_config.get('backup_count', 5),
+            file_handler = SegmentedLogHandler(
+                str(self.log_file_path),
+                segment_lines=self.max_lines if self.rotation_enabled else 0,
+                max_segments=logging_config.get('backup_count', 5),
+                max_bytes=self._parse_size(logging_config.get('max_file_size', '10MB')),
+                keep_oldest=self.keep_oldest,
+                flush_batch=self.flush_batch,
                 encoding='utf-8'
             )
             
@@ -75,7 +367,24 @@ class LogManager:
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
             file_handler.setFormatter(file_formatter)
-            self.logger.addHandler(file_handler)
+            self.file_handler = file_handler
+            handlers.append(file_handler)
+        
+        # Flux d'événements structurés (NDJSON segmenté, même index que les logs texte)
+        events_config = logging_config.get('events', {}) or {}
+        if events_config.get('enabled', True):
+            events_handler = SegmentedLogHandler(
+                events_config.get('file_path', str(self.log_file_path.parent / 'events.ndjson')),
+                segment_lines=events_config.get('max_lines', 10000),
+                max_segments=events_config.get('backup_count', 30),
+                max_bytes=self._parse_size(events_config.get('max_file_size', '10MB')),
+                flush_batch=self.flush_batch,
+                encoding='utf-8'
+            )
+            events_handler.setFormatter(EventFormatter())
+            events_handler.addFilter(is_event_record)
+            self.events_handler = events_handler
+            handlers.append(events_handler)
         
         # Handler console
         console_handler = logging.StreamHandler()
@@ -84,7 +393,14 @@ class LogManager:
             datefmt='%H:%M:%S'
         )
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
+        handlers.append(console_handler)
+        
+        # Le logger ne fait que déposer les enregistrements dans la file,
+        # le thread du listener formate et écrit
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self.listener = BatchingQueueListener(log_queue, *handlers, respect_handler_level=True)
+        self.listener.start()
         
         # Premier log
         self.logger.info("Système de logs initialisé")
@@ -113,38 +429,28 @@ class LogManager:
             return int(size_str)
     
     def rotate_logs_by_lines(self) -> None:
-        """Effectue la rotation des logs par nombre de lignes"""
-        if not self.rotation_enabled or not self.log_file_path.exists():
+        """
+        Vérifie la rotation des logs par nombre de lignes
+        La rotation est normalement faite par le handler à chaque écriture ;
+        cette méthode la force si la limite est déjà atteinte
+        """
+        if not self.rotation_enabled or not self.file_handler:
             return
         
         try:
-            # Lire toutes les lignes
-            with open(self.log_file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            # Vérifier si la limite est atteinte
-            if len(lines) >= self.max_lines:
-                # Calculer le nombre de lignes à conserver
-                if self.keep_oldest:
-                    # Garder les lignes les plus anciennes
-                    lines_to_keep = lines[:self.max_lines//2]
-                else:
-                    # Garder les lignes les plus récentes
-                    lines_to_keep = lines[-(self.max_lines//2):]
-                
-                # Réécrire le fichier avec les lignes conservées
-                with open(self.log_file_path, 'w', encoding='utf-8') as f:
-                    f.writelines(lines_to_keep)
-                
-                # Log de la rotation
-                self.logger.info(f"Rotation des logs effectuée: {len(lines)} -> {len(lines_to_keep)} lignes")
+            self.file_handler.acquire()
+            try:
+                if self.file_handler.should_rotate():
+                    self.file_handler.rotate()
+            finally:
+                self.file_handler.release()
                 
         except Exception as e:
             self.logger.error(f"Erreur lors de la rotation des logs: {e}")
     
     def log_with_rotation(self, level: str, message: str) -> None:
         """
-        Log un message et vérifie la rotation
+        Log un message (la rotation est gérée par le thread d'écriture)
         
         Args:
             level: Niveau de log (debug, info, warning, error, critical)
@@ -152,7 +458,18 @@ class LogManager:
         """
         if self.logger:
             getattr(self.logger, level.lower())(message)
-            self.rotate_logs_by_lines()
+    
+    def close(self) -> None:
+        """Arrête le thread d'écriture après avoir écrit les logs en attente"""
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
+        if self.file_handler:
+            self.file_handler.close()
+            self.file_handler = None
+        if self.events_handler:
+            self.events_handler.close()
+            self.events_handler = None
     
     def log_info(self, message: str) -> None:
         """Log un message d'information"""
@@ -174,7 +491,23 @@ class LogManager:
         """Log un message de debug"""
         self.log_with_rotation('debug', message)
     
-    def log_voice_event(self, event_type: str, user: str, channel: str = None) -> None:
+    def log_event(self, event_type: str, message: str, level: str = 'info', **fields) -> None:
+        """
+        Log un message texte accompagné d'un événement structuré (flux NDJSON)
+        
+        Args:
+            event_type: Type d'événement (voice, server, state_change, performance, lifecycle...)
+            message: Message texte pour le log classique
+            level: Niveau de log (debug, info, warning, error, critical)
+            **fields: Champs typés de l'événement
+        """
+        if self.logger:
+            self.logger.log(
+                getattr(logging, level.upper()), message,
+                extra={'event_type': event_type, 'event_fields': fields}
+            )
+    
+    def log_voice_event(self, event_type: str, user: str, channel: str = None, user_id: int = None) -> None:
         """
         Log un événement vocal
         
@@ -182,13 +515,14 @@ class LogManager:
             event_type: Type d'événement (join, leave, move)
             user: Nom de l'utilisateur
             channel: Nom du salon (optionnel)
+            user_id: ID Discord de l'utilisateur (optionnel)
         """
         if channel:
             message = f"Événement vocal: {user} {event_type} {channel}"
         else:
             message = f"Événement vocal: {user} {event_type}"
         
-        self.log_info(message)
+        self.log_event('voice', message, action=event_type, user=user, user_id=user_id, channel=channel)
     
     def log_server_event(self, event_type: str, server: str, details: str = None) -> None:
         """
@@ -204,10 +538,8 @@ class LogManager:
         else:
             message = f"Événement serveur {server}: {event_type}"
         
-        if event_type in ['error', 'failed']:
-            self.log_error(message)
-        else:
-            self.log_info(message)
+        level = 'error' if event_type in ['error', 'failed'] else 'info'
+        self.log_event('server', message, level, action=event_type, server=server, details=details)
     
     def log_powershell_script(self, script_name: str, success: bool, details: str = None) -> None:
         """
@@ -224,10 +556,8 @@ class LogManager:
         if details:
             message += f" - {details}"
         
-        if success:
-            self.log_info(message)
-        else:
-            self.log_error(message)
+        level = 'info' if success else 'error'
+        self.log_event('script', message, level, script=script_name, success=success, details=details)
     
     def log_discord_event(self, event_type: str, details: str = None) -> None:
         """
@@ -242,10 +572,8 @@ class LogManager:
         if details:
             message += f" - {details}"
         
-        if event_type in ['error', 'disconnect']:
-            self.log_error(message)
-        else:
-            self.log_info(message)
+        level = 'error' if event_type in ['error', 'disconnect'] else 'info'
+        self.log_event('discord', message, level, action=event_type, details=details)
     
     def log_bot_state_change(self, old_state: str, new_state: str, reason: str = None) -> None:
         """
@@ -261,7 +589,7 @@ class LogManager:
         if reason:
             message += f" (Raison: {reason})"
         
-        self.log_info(message)
+        self.log_event('state_change', message, old_state=old_state, new_state=new_state, reason=reason)
     
     def log_performance(self, operation: str, duration: float, details: str = None) -> None:
         """
@@ -277,7 +605,24 @@ class LogManager:
         if details:
             message += f" - {details}"
         
-        self.log_info(message)
+        self.log_event('performance', message, operation=operation, duration=duration, details=details)
+    
+    def log_lifecycle(self, operation: str, success: bool, duration: float,
+                      phases: Optional[Dict[str, float]] = None) -> None:
+        """
+        Log une opération de cycle de vie terminée (démarrage, arrêt, redémarrage)
+        
+        Args:
+            operation: Type d'opération (startup, shutdown, restart)
+            success: True si l'opération a abouti
+            duration: Durée totale en secondes
+            phases: Temps écoulé (secondes) à la fin de chaque phase atteinte
+        """
+        status = "réussi" if success else "échoué"
+        message = f"Cycle de vie {operation} {status} en {duration:.0f}s"
+        
+        self.log_event('lifecycle', message, operation=operation, success=success,
+                       duration=round(duration, 3), phases=phases or {})
     
     def get_log_stats(self) -> Dict[str, Any]:
         """
@@ -291,39 +636,38 @@ class LogManager:
             'log_file_size': 0,
             'log_file_lines': 0,
             'rotation_enabled': self.rotation_enabled,
-            'max_lines': self.max_lines
+            'max_lines': self.max_lines,
+            'rotations': 0
         }
         
-        if self.log_file_path.exists():
-            try:
-                stats['log_file_size'] = self.log_file_path.stat().st_size
-                
-                with open(self.log_file_path, 'r', encoding='utf-8') as f:
-                    stats['log_file_lines'] = len(f.readlines())
-                    
-            except Exception as e:
-                self.log_error(f"Erreur lors de la lecture des statistiques de logs: {e}")
+        # Compteurs tenus par le handler et l'index des segments : pas de lecture de fichier
+        if self.file_handler:
+            handler_stats = self.file_handler.get_statistics()
+            stats['log_file_size'] = handler_stats['live_size']
+            stats['log_file_lines'] = handler_stats['live_lines']
+            stats['rotations'] = handler_stats['rotations']
+            stats['segments'] = handler_stats
+        if self.events_handler:
+            stats['events'] = self.events_handler.get_statistics()
         
         return stats
     
     def cleanup_old_logs(self, days_to_keep: int = 7) -> None:
         """
-        Nettoie les anciens fichiers de logs
+        Nettoie les anciens logs en supprimant les segments entiers trop anciens
         
         Args:
             days_to_keep: Nombre de jours à conserver
         """
-        if not self.log_file_path.parent.exists():
+        if not self.file_handler:
             return
         
         try:
             current_time = time.time()
             cutoff_time = current_time - (days_to_keep * 24 * 60 * 60)
             
-            for log_file in self.log_file_path.parent.glob('*.log*'):
-                if log_file.stat().st_mtime < cutoff_time:
-                    log_file.unlink()
-                    self.log_info(f"Ancien fichier de log supprimé: {log_file.name}")
+            for segment_name in self.file_handler.drop_segments_before(cutoff_time):
+                self.log_info(f"Ancien segment de log supprimé: {segment_name}")
                     
         except Exception as e:
             self.log_error(f"Erreur lors du nettoyage des anciens logs: {e}")
@@ -0,0 +1,234 @@
+"""
+Surveillance de la boucle asyncio pour Bot CubeGuardian
+Mesure le retard d'ordonnancement et détecte les callbacks bloquants
+(nom de la coroutine et pile d'appels capturée pendant le blocage)
+
+Attention : le chronométrage remplace la méthode privée asyncio.events.Handle._run pour tout
+le processus (toutes les boucles, pas seulement celle surveillée) ; les callbacks des autres
+boucles sont exécutés sans mesure. Un seul moniteur doit être actif à la fois, et stop() ne
+restaure la méthode d'origine que si personne ne l'a remplacée entre-temps. Ce comportement
+dépend de l'implémentation interne d'asyncio (CPython) et peut être désactivé via
+loop_monitor.enabled dans bot.yaml.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Dict, Any, Optional, Deque
+
+from .server_manager.metrics import LatencyHistogram
+
+
+def describe_callback(handle: asyncio.Handle) -> str:
+    """
+    Nom lisible d'un callback de la boucle
+
+    Args:
+        handle: Handle exécuté par la boucle
+
+    Returns:
+        Nom de la tâche et de sa coroutine, ou nom qualifié du callback
+    """
+    callback = getattr(handle, '_callback', None)
+    owner = getattr(callback, '__self__', None)
+    if isinstance(owner, asyncio.Task):
+        coroutine = owner.get_coro()
+        return f"Task {owner.get_name()} ({getattr(coroutine, '__qualname__', repr(coroutine))})"
+    return getattr(callback, '__qualname__', repr(callback))
+
+
+class LoopMonitor:
+    """
+    Moniteur de la boucle asyncio
+
+    - Retard d'ordonnancement : écart entre le réveil prévu et le réveil effectif d'une tâche
+    - Callbacks lents : chaque Handle exécuté par la boucle est chronométré ; au-delà du seuil,
+      un thread de surveillance capture la pile du thread de la boucle pendant le blocage
+    """
+
+    def __init__(self, logger: logging.Logger, lag_interval: float = 1.0,
+                 slow_callback_threshold: float = 0.1, max_records: int = 50,
+                 capture_stack: bool = True):
+        """
+        Args:
+            logger: Logger à utiliser
+            lag_interval: Intervalle de mesure du retard (secondes)
+            slow_callback_threshold: Durée à partir de laquelle un callback est signalé (secondes)
+            max_records: Nombre de callbacks lents conservés
+            capture_stack: Capturer la pile d'appels pendant un blocage
+        """
+        self.logger = logger
+        self.lag_interval = lag_interval
+        self.threshold = slow_callback_threshold
+        self.capture_stack = capture_stack
+
+        self.lag = LatencyHistogram()
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.slow_callbacks = LatencyHistogram()
+        self.slow_callback_records: Deque[Dict[str, Any]] = deque(maxlen=max_records)
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._original_run = None
+        self._timed_run = None
+        self._lag_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # Callback en cours (handle, début) et pile capturée par le thread de surveillance
+        self._running = None
+        self._captured = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], logger: logging.Logger) -> 'LoopMonitor':
+        """
+        Construit le moniteur depuis la section loop_monitor de bot.yaml
+
+        Args:
+            config: Configuration du moniteur
+            logger: Logger à utiliser
+
+        Returns:
+            Moniteur configuré
+        """
+        config = config or {}
+        return cls(
+            logger,
+            lag_interval=config.get('lag_interval', 1.0),
+            slow_callback_threshold=config.get('slow_callback_threshold', 0.1),
+            max_records=config.get('max_records', 50),
+            capture_stack=config.get('capture_stack', True)
+        )
+
+    def start(self) -> None:
+        """Démarre la surveillance de la boucle courante"""
+        if self.loop is not None:
+            return
+
+        self.loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._install_timing()
+        self._lag_task = asyncio.create_task(self._sample_lag())
+
+        if self.capture_stack:
+            self._stop_event.clear()
+            self._watchdog = threading.Thread(target=self._watch, name='LoopMonitorWatchdog', daemon=True)
+            self._watchdog.start()
+
+        self.logger.info(f"Surveillance de la boucle asyncio démarrée (seuil callbacks lents: "
+                         f"{self.threshold * 1000:.0f}ms)")
+
+    def stop(self) -> None:
+        """Arrête la surveillance et restaure l'exécution normale des callbacks"""
+        if self._lag_task:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self._original_run is not None:
+            if asyncio.events.Handle._run is self._timed_run:
+                asyncio.events.Handle._run = self._original_run
+            else:
+                # Remplacée par-dessus le chronométrage : la restaurer casserait l'autre remplacement,
+                # le chronométrage reste en place mais n'agit plus (aucune boucle surveillée)
+                self.logger.warning("Handle._run remplacée par un autre module - chronométrage laissé inactif")
+            self._original_run = None
+            self._timed_run = None
+        if self._watchdog:
+            self._stop_event.set()
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+        self.loop = None
+
+    def _install_timing(self) -> None:
+        """Chronomètre chaque callback exécuté par la boucle surveillée"""
+        original_run = asyncio.events.Handle._run
+        self._original_run = original_run
+        monitor = self
+
+        def _timed_run(handle):
+            if handle._loop is not monitor.loop:
+                return original_run(handle)
+            start = time.perf_counter()
+            monitor._running = (handle, start)
+            try:
+                return original_run(handle)
+            finally:
+                monitor._running = None
+                duration = time.perf_counter() - start
+                if duration >= monitor.threshold:
+                    monitor._record_slow_callback(handle, duration)
+
+        self._timed_run = _timed_run
+        asyncio.events.Handle._run = _timed_run
+
+    def _watch(self) -> None:
+        """Thread de surveillance : capture la pile du thread de la boucle pendant un blocage"""
+        interval = max(self.threshold / 2, 0.01)
+        while not self._stop_event.wait(interval):
+            running = self._running
+            if running is None:
+                continue
+            handle, start = running
+            captured = self._captured
+            if (captured is not None and captured[0] is handle) or time.perf_counter() - start < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self._captured = (handle, ''.join(traceback.format_stack(frame, limit=15)))
+
+    def _record_slow_callback(self, handle: asyncio.Handle, duration: float) -> None:
+        """Enregistre un callback ayant bloqué la boucle au-delà du seuil"""
+        captured = self._captured
+        stack = captured[1] if captured is not None and captured[0] is handle else None
+        self._captured = None
+
+        name = describe_callback(handle)
+        self.slow_callbacks.observe(duration)
+        self.slow_callback_records.append({
+            'timestamp': time.time(),
+            'callback': name,
+            'duration_ms': round(duration * 1000, 1),
+            'stack': stack
+        })
+
+        location = ''
+        if stack:
+            location = f" - {stack.strip().splitlines()[-2].strip()}"
+        self.logger.warning(f"Boucle asyncio bloquée {duration * 1000:.0f}ms par {name}{location}")
+
+    async def _sample_lag(self) -> None:
+        """Mesure périodiquement le retard d'ordonnancement de la boucle"""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                expected = loop.time() + self.lag_interval
+                await asyncio.sleep(self.lag_interval)
+                self.last_lag = max(0.0, loop.time() - expected)
+                self.max_lag = max(self.max_lag, self.last_lag)
+                self.lag.observe(self.last_lag)
+        except asyncio.CancelledError:
+            pass
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Récupère les statistiques de la boucle
+
+        Returns:
+            Histogrammes du retard et des callbacks lents, derniers callbacks lents
+        """
+        return {
+            'running': self.loop is not None,
+            'threshold_ms': self.threshold * 1000,
+            'last_lag_ms': round(self.last_lag * 1000, 2),
+            'max_lag_ms': round(self.max_lag * 1000, 2),
+            'lag': self.lag.get_statistics(),
+            'slow_callbacks': self.slow_callbacks.get_statistics(),
+            'recent_slow_callbacks': [
+                {key: value for key, value in record.items() if key != 'stack'}
+                for record in self.slow_callback_records
+            ]
+        }
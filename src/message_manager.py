@@ -77,6 +77,24 @@ class MessageManager:
             self.logger.error(f"Erreur lors du formatage du message: {e}")
             return template
     
+    @staticmethod
+    def _format_duration(seconds: int) -> str:
+        """
+        Formate une durée pour l'affichage Discord
+        
+        Args:
+            seconds: Durée en secondes
+            
+        Returns:
+            Durée lisible (ex: "3 min 20 s")
+        """
+        minutes, seconds = divmod(int(seconds), 60)
+        if not minutes:
+            return f"{seconds} s"
+        if not seconds:
+            return f"{minutes} min"
+        return f"{minutes} min {seconds} s"
+    
     async def send_startup_message(self, user: discord.Member) -> None:
         """
         Envoie un message de démarrage du serveur
@@ -96,15 +114,27 @@ class MessageManager:
         except Exception as e:
             self.logger.error(f"Erreur lors de l'envoi du message de démarrage: {e}")
     
-    async def send_startup_progress_message(self) -> None:
-        """Envoie un message de progression du démarrage"""
+    async def send_startup_progress_message(self, eta: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Envoie un message de progression du démarrage
+        
+        Args:
+            eta: Estimation issue de l'historique (remaining_seconds, samples), None si inconnue
+        """
         if not self.text_channel:
             return
         
         try:
-            message = self.config_manager.get_message('startup.in_progress')
+            if eta and eta.get('remaining_seconds'):
+                message = self.config_manager.get_message(
+                    'startup.in_progress_eta',
+                    eta=self._format_duration(eta['remaining_seconds']),
+                    samples=eta.get('samples', 0)
+                )
+            else:
+                message = self.config_manager.get_message('startup.in_progress')
             await self.text_channel.send(message)
-            self.logger.info("Message de progression du démarrage envoyé")
+            self.logger.info(f"Message de progression du démarrage envoyé (estimation: {eta})")
             
         except Exception as e:
             self.logger.error(f"Erreur lors de l'envoi du message de progression: {e}")
@@ -177,19 +207,62 @@ class MessageManager:
         except Exception as e:
             self.logger.error(f"Erreur lors de l'envoi du message d'arrêt: {e}")
     
-    async def send_shutdown_cancelled_message(self, user: discord.Member) -> None:
+    async def send_shutdown_postponed_message(self, players: int) -> None:
+        """
+        Envoie un message de report d'arrêt (joueurs connectés sur Minecraft)
+        
+        Args:
+            players: Nombre de joueurs connectés
+        """
+        if not self.text_channel:
+            return
+        
+        try:
+            message = self.config_manager.get_message('shutdown.postponed_players', players=players)
+            await self.text_channel.send(message)
+            self.logger.info(f"Message de report d'arrêt envoyé ({players} joueurs)")
+            
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'envoi du message de report d'arrêt: {e}")
+    
+    async def send_fleet_message(self, event: str, server: str, channel: Optional[discord.TextChannel] = None,
+                                 **kwargs) -> None:
+        """
+        Envoie un message concernant une instance de la flotte
+        
+        Args:
+            event: Type d'événement (starting, ready, stopped, failed)
+            server: Nom de l'instance
+            channel: Salon textuel de la liaison concernée (salon principal par défaut)
+            **kwargs: Variables du message (user, time, error...)
+        """
+        channel = channel or self.text_channel
+        if not channel:
+            return
+        
+        try:
+            message = self.config_manager.get_message(f'fleet.{event}', server=server, **kwargs)
+            await channel.send(message)
+            self.logger.info(f"Message de flotte envoyé ({server}: {event})")
+            
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'envoi du message de flotte: {e}")
+    
+    async def send_shutdown_cancelled_message(self, user: discord.Member, channel: Optional[discord.TextChannel] = None) -> None:
         """
         Envoie un message d'annulation d'arrêt
         
         Args:
             user: Utilisateur qui a annulé l'arrêt
+            channel: Salon textuel de la liaison concernée (salon principal par défaut)
         """
-        if not self.text_channel:
+        channel = channel or self.text_channel
+        if not channel:
             return
         
         try:
             message = self.config_manager.get_message('shutdown.cancelled', user=user.display_name)
-            await self.text_channel.send(message)
+            await channel.send(message)
             self.logger.info(f"Message d'annulation d'arrêt envoyé pour {user.display_name}")
             
         except Exception as e:
@@ -235,37 +308,41 @@ class MessageManager:
         except Exception as e:
             self.logger.error(f"Erreur lors de l'envoi du message d'échec d'arrêt: {e}")
     
-    async def send_user_joined_message(self, user: discord.Member) -> None:
+    async def send_user_joined_message(self, user: discord.Member, channel: Optional[discord.TextChannel] = None) -> None:
         """
         Envoie un message d'arrivée d'utilisateur
         
         Args:
             user: Utilisateur qui a rejoint
+            channel: Salon textuel de la liaison concernée (salon principal par défaut)
         """
-        if not self.text_channel:
+        channel = channel or self.text_channel
+        if not channel:
             return
         
         try:
             message = self.config_manager.get_message('info.user_joined', user=user.display_name)
-            await self.text_channel.send(message)
+            await channel.send(message)
             self.logger.info(f"Message d'arrivée envoyé pour {user.display_name}")
             
         except Exception as e:
             self.logger.error(f"Erreur lors de l'envoi du message d'arrivée: {e}")
     
-    async def send_user_left_message(self, user: discord.Member) -> None:
+    async def send_user_left_message(self, user: discord.Member, channel: Optional[discord.TextChannel] = None) -> None:
         """
         Envoie un message de départ d'utilisateur
         
         Args:
             user: Utilisateur qui a quitté
+            channel: Salon textuel de la liaison concernée (salon principal par défaut)
         """
-        if not self.text_channel:
+        channel = channel or self.text_channel
+        if not channel:
             return
         
         try:
             message = self.config_manager.get_message('info.user_left', user=user.display_name)
-            await self.text_channel.send(message)
+            await channel.send(message)
             self.logger.info(f"Message de départ envoyé pour {user.display_name}")
             
         except Exception as e:
@@ -284,19 +361,21 @@ class MessageManager:
         except Exception as e:
             self.logger.error(f"Erreur lors de l'envoi du message de démarrage du bot: {e}")
     
-    async def send_monitoring_active_message(self, channel_name: str) -> None:
+    async def send_monitoring_active_message(self, channel_name: str, channel: Optional[discord.TextChannel] = None) -> None:
         """
         Envoie un message de surveillance active
         
         Args:
             channel_name: Nom du salon surveillé
+            channel: Salon textuel de la liaison concernée (salon principal par défaut)
         """
-        if not self.text_channel:
+        channel = channel or self.text_channel
+        if not channel:
             return
         
         try:
             message = self.config_manager.get_message('info.monitoring_active', channel=channel_name)
-            await self.text_channel.send(message)
+            await channel.send(message)
             self.logger.info(f"Message de surveillance active envoyé pour {channel_name}")
             
         except Exception as e:
@@ -7,18 +7,22 @@ Redémarrages LXC Proxmox, cooldowns, monitoring
 
 import asyncio
 import logging
-import aiohttp
 import time
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 from datetime import datetime
 
+from .server_manager.proxmox_api import ProxmoxAPI
+from .server_manager.proxmox_client import ProxmoxHTTPClient
+from .server_manager.fleet import ServerFleet
+
 class MinecraftManager:
     """
     Gestionnaire spécifique du serveur Minecraft
     Intègre le SecurityManager pour cooldowns et LXC Proxmox pour redémarrages
     """
     
-    def __init__(self, config_manager, server_manager, security_manager, log_manager):
+    def __init__(self, config_manager, server_manager, security_manager, log_manager,
+                 proxmox_client: Optional[ProxmoxHTTPClient] = None):
         """
         Initialise le gestionnaire Minecraft
         
@@ -27,6 +31,7 @@ class MinecraftManager:
             server_manager: Gestionnaire de serveurs Proxmox
             security_manager: Gestionnaire de sécurité
             log_manager: Gestionnaire de logs
+            proxmox_client: Client HTTP Proxmox partagé (pool keep-alive)
         """
         self.config_manager = config_manager
         self.server_manager = server_manager
@@ -35,7 +40,9 @@ class MinecraftManager:
         self.logger = logging.getLogger('CubeGuardian.MinecraftManager')
         
         # Configuration Minecraft
-        self.container_id = 105  # LXC-game selon le cahier des charges
+        default_instance = self.server_manager.fleet.get(ServerFleet.DEFAULT_INSTANCE)
+        self.container_id = (default_instance.config.vmid if default_instance
+                             else self.config_manager.get_server_config('minecraft').get('container_id', 105))
         self.restart_timeout = 300  # 5 minutes max pour redémarrage
         self.monitoring_interval = 10  # Vérification toutes les 10 secondes
         
@@ -53,6 +60,10 @@ class MinecraftManager:
             'verify_ssl': False  # SSL non vérifié pour serveur local
         }
         
+        # Client HTTP partagé : évite un handshake TLS par appel API
+        self.proxmox_client = proxmox_client or ProxmoxHTTPClient(self.logger)
+        self.proxmox_api = ProxmoxAPI(self.logger, self.proxmox_client)
+        
         self.logger.info("MinecraftManager initialisé")
 
     # ========================================
@@ -133,10 +144,14 @@ class MinecraftManager:
             restart_result = await self._execute_lxc_restart()
             
             if not restart_result['success']:
+                self._record_restart(start_time, False, restart_result)
                 return restart_result
             
             # 3. Surveillance du redémarrage
-            monitoring_result = await self._monitor_restart_completion(start_time)
+            monitoring_result = await self._monitor_restart_completion(
+                start_time, restart_result.get('container_running', False)
+            )
+            self._record_restart(start_time, monitoring_result['success'], restart_result, monitoring_result)
             
             if monitoring_result['success']:
                 # 4. Mise à jour du cooldown en cas de succès
@@ -169,14 +184,38 @@ class MinecraftManager:
                 del self.pending_confirmations[user_id]
             self.logger.debug(f"Verrous de redémarrage nettoyés pour {user.name}")
 
+    def _record_restart(self, start_time: float, success: bool, *results: Dict[str, Any]) -> None:
+        """
+        Enregistre le redémarrage et le temps de chaque phase dans l'historique
+        
+        Args:
+            start_time: Timestamp du début du redémarrage
+            success: True si Minecraft est de nouveau disponible
+            *results: Résultats des étapes (timestamps stopped_at, running_at, ready_at)
+        """
+        if not hasattr(self.server_manager, 'record_lifecycle'):
+            return
+        
+        timestamps = {}
+        for result in results:
+            timestamps.update({key: value for key, value in result.items()
+                               if key.endswith('_at') and value is not None})
+        phases = {
+            phase: timestamps[key] - start_time
+            for phase, key in (('lxc_stopped', 'stopped_at'), ('lxc_running', 'running_at'),
+                               ('slp_ready', 'ready_at'))
+            if key in timestamps
+        }
+        self.server_manager.record_lifecycle('restart', success, time.time() - start_time, phases)
+
     async def _execute_lxc_restart(self) -> Dict[str, Any]:
         """
         Exécute le redémarrage LXC GRACIEUX via API Proxmox (shutdown + start)
         
         Étapes:
         1. Arrêt gracieux du conteneur (save-all automatique)
-        2. Attente arrêt complet 
-        3. Redémarrage du conteneur
+        2. Attente arrêt complet (suivi de la tâche Proxmox via son UPID)
+        3. Redémarrage du conteneur (suivi de la tâche de démarrage)
         
         Returns:
             Résultat de l'opération de redémarrage
@@ -184,70 +223,85 @@ class MinecraftManager:
         try:
             self.logger.info(f"Redémarrage GRACIEUX conteneur LXC {self.container_id} via API Proxmox")
             
-            # Configuration API
-            base_url = f"https://{self.proxmox_config['host']}:{self.proxmox_config['port']}"
-            headers = {
-                'Content-Type': 'application/x-www-form-urlencoded',
-                'Authorization': f"PVEAPIToken={self.proxmox_config['api_token_id']}={self.proxmox_config['api_token_secret']}"
-            }
+            api_url, token_id, token_secret, node = self._get_api_credentials()
+            
+            # 1. ARRÊT GRACIEUX du conteneur
+            self.logger.info(f"Étape 1/3: Arrêt gracieux LXC {self.container_id}")
+            shutdown_response = await self.proxmox_api.shutdown_lxc(
+                api_url, token_id, token_secret, self.container_id, node
+            )
+            if not shutdown_response['success']:
+                return {
+                    'success': False,
+                    'error': 'shutdown_failed',
+                    'details': f"Arrêt gracieux échoué - Status {shutdown_response.get('status')}: {shutdown_response.get('error')}"
+                }
             
-            timeout = aiohttp.ClientTimeout(total=30)
-            connector = aiohttp.TCPConnector(verify_ssl=self.proxmox_config['verify_ssl'])
+            # Le serveur Minecraft s'arrête : les derniers résultats de vérification sont obsolètes
+            self.server_manager.invalidate_status()
             
-            async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
-                
-                # 1. ARRÊT GRACIEUX du conteneur
-                shutdown_url = f"{base_url}/api2/json/nodes/{self.proxmox_config['node']}/lxc/{self.container_id}/status/shutdown"
-                
-                self.logger.info(f"Étape 1/3: Arrêt gracieux LXC {self.container_id}")
-                async with session.post(shutdown_url, headers=headers) as shutdown_response:
-                    if shutdown_response.status != 200:
-                        error_text = await shutdown_response.text()
-                        return {
-                            'success': False,
-                            'error': 'shutdown_failed',
-                            'details': f"Arrêt gracieux échoué - Status {shutdown_response.status}: {error_text}"
-                        }
-                
-                # 2. ATTENDRE que le conteneur soit complètement arrêté
-                self.logger.info(f"Étape 2/3: Attente arrêt complet LXC {self.container_id}")
-                max_wait = 120  # 120 secondes max pour arrêt gracieux
-                wait_interval = 2
-                
-                for attempt in range(max_wait // wait_interval):
-                    status_result = await self._check_lxc_status()
-                    if status_result['success'] and status_result['status'] == 'stopped':
-                        self.logger.info(f"LXC {self.container_id} arrêté avec succès après {attempt * wait_interval}s")
-                        break
-                    
-                    await asyncio.sleep(wait_interval)
-                else:
+            # 2. ATTENDRE que le conteneur soit complètement arrêté
+            self.logger.info(f"Étape 2/3: Attente arrêt complet LXC {self.container_id}")
+            max_wait = 120  # 120 secondes max pour arrêt gracieux
+            
+            shutdown_upid = shutdown_response.get('upid')
+            if shutdown_upid:
+                task_result = await self.proxmox_api.wait_for_task(
+                    api_url, token_id, token_secret, shutdown_upid, node, timeout=max_wait
+                )
+                if not task_result['success']:
+                    return {
+                        'success': False,
+                        'error': 'shutdown_timeout' if task_result.get('exitstatus') is None else 'shutdown_failed',
+                        'details': f"Arrêt LXC non confirmé: {task_result['error']}"
+                    }
+                self.logger.info(f"LXC {self.container_id} arrêté avec succès après {task_result['elapsed']:.1f}s "
+                                 f"({task_result['polls']} requêtes)")
+            else:
+                # Pas d'UPID renvoyé : repli sur la surveillance du statut du conteneur
+                if not await self._wait_for_lxc_status('stopped', max_wait):
                     return {
                         'success': False,
                         'error': 'shutdown_timeout',
                         'details': f"Timeout: LXC pas arrêté après {max_wait}s"
                     }
-                
-                # 3. REDÉMARRAGE du conteneur
-                start_url = f"{base_url}/api2/json/nodes/{self.proxmox_config['node']}/lxc/{self.container_id}/status/start"
-                
-                self.logger.info(f"Étape 3/3: Redémarrage LXC {self.container_id}")
-                async with session.post(start_url, headers=headers) as start_response:
-                    if start_response.status == 200:
-                        self.logger.info(f"Redémarrage gracieux LXC {self.container_id} initié avec succès")
-                        return {
-                            'success': True,
-                            'container_id': self.container_id,
-                            'operation': 'graceful_restart',
-                            'timestamp': time.time()
-                        }
-                    else:
-                        error_text = await start_response.text()
-                        return {
-                            'success': False,
-                            'error': 'start_failed',
-                            'details': f"Redémarrage échoué - Status {start_response.status}: {error_text}"
-                        }
+            stopped_at = time.time()
+            
+            # 3. REDÉMARRAGE du conteneur
+            self.logger.info(f"Étape 3/3: Redémarrage LXC {self.container_id}")
+            start_response = await self.proxmox_api.start_lxc(
+                api_url, token_id, token_secret, self.container_id, node
+            )
+            if not start_response['success']:
+                return {
+                    'success': False,
+                    'error': 'start_failed',
+                    'details': f"Redémarrage échoué - Status {start_response.get('status')}: {start_response.get('error')}"
+                }
+            
+            start_upid = start_response.get('upid')
+            if start_upid:
+                task_result = await self.proxmox_api.wait_for_task(
+                    api_url, token_id, token_secret, start_upid, node, timeout=max_wait
+                )
+                if not task_result['success']:
+                    return {
+                        'success': False,
+                        'error': 'start_failed',
+                        'details': f"Démarrage LXC non confirmé: {task_result['error']}"
+                    }
+            running_at = time.time() if start_upid else None
+            
+            self.logger.info(f"Redémarrage gracieux LXC {self.container_id} initié avec succès")
+            return {
+                'success': True,
+                'container_id': self.container_id,
+                'operation': 'graceful_restart',
+                'container_running': start_upid is not None,
+                'stopped_at': stopped_at,
+                'running_at': running_at,
+                'timestamp': time.time()
+            }
             
         except asyncio.TimeoutError:
             return {
@@ -262,12 +316,43 @@ class MinecraftManager:
                 'details': f"Erreur API Proxmox: {str(e)}"
             }
 
-    async def _monitor_restart_completion(self, start_time: float) -> Dict[str, Any]:
+    async def _wait_for_lxc_status(self, expected_status: str, timeout: float) -> bool:
+        """
+        Attend que le conteneur LXC atteigne un statut (intervalle adaptatif)
+        
+        Args:
+            expected_status: Statut attendu (running, stopped)
+            timeout: Durée maximale d'attente (secondes)
+            
+        Returns:
+            True si le statut a été atteint dans les temps
+        """
+        start_time = time.time()
+        interval = 0.5
+        
+        while True:
+            status_result = await self._check_lxc_status()
+            if status_result['success'] and status_result['status'] == expected_status:
+                self.logger.info(f"LXC {self.container_id} {expected_status} après {time.time() - start_time:.1f}s")
+                return True
+            
+            if time.time() - start_time + interval > timeout:
+                return False
+            
+            await asyncio.sleep(interval)
+            interval = min(interval * 1.5, self.monitoring_interval)
+
+    async def _monitor_restart_completion(self, start_time: float, container_running: bool = False) -> Dict[str, Any]:
         """
         Surveille la completion du redémarrage
         
+        Le serveur Minecraft est testé dès que le conteneur tourne, avec un intervalle
+        court qui s'allonge progressivement jusqu'à monitoring_interval. Le
+        startup_delay configuré ne sert plus que de borne haute.
+        
         Args:
             start_time: Timestamp du début du redémarrage
+            container_running: True si la tâche de démarrage a déjà confirmé le conteneur
             
         Returns:
             Résultat de la surveillance
@@ -275,49 +360,55 @@ class MinecraftManager:
         try:
             self.logger.info(f"Surveillance du redémarrage LXC {self.container_id}")
             
-            # Attendre le délai de démarrage Minecraft (comme au boot initial)
             startup_delay = self.config_manager.get_server_config('minecraft').get('startup_delay', 60)
-            self.logger.info(f"Attente startup_delay de {startup_delay}s pour démarrage Minecraft")
-            await asyncio.sleep(startup_delay)
-            
-            max_attempts = self.restart_timeout // self.monitoring_interval
+            deadline = start_time + startup_delay + self.restart_timeout
+            interval = 2.0
             attempt = 0
+            running_at = None
             
-            while attempt < max_attempts:
+            while time.time() < deadline:
                 attempt += 1
                 elapsed = int(time.time() - start_time)
                 
-                self.logger.debug(f"Surveillance tentative {attempt}/{max_attempts} - {elapsed}s écoulées")
-                
-                # Vérifier le statut du conteneur
-                status_result = await self._check_lxc_status()
+                self.logger.debug(f"Surveillance tentative {attempt} - {elapsed}s écoulées")
                 
-                if status_result['success']:
-                    if status_result['status'] == 'running':
-                        # Vérification ROBUSTE: utiliser la même méthode que le démarrage initial
-                        minecraft_status = await self.server_manager.check_minecraft_status()
-                        
-                        if minecraft_status['success']:
-                            self.logger.info(f"Redémarrage LXC {self.container_id} terminé avec succès en {elapsed}s")
-                            self.logger.info(f"Minecraft Server VRAIMENT disponible sur {minecraft_status.get('details', {}).get('target_host')}:{minecraft_status.get('details', {}).get('port')}")
-                            return {
-                                'success': True,
-                                'elapsed_time': elapsed,
-                                'attempts': attempt
-                            }
+                # Vérifier le statut du conteneur (inutile si la tâche de démarrage l'a confirmé)
+                if not container_running:
+                    status_result = await self._check_lxc_status()
+                    if status_result['success']:
+                        container_running = status_result['status'] == 'running'
+                        if container_running:
+                            running_at = time.time()
                         else:
-                            self.logger.debug(f"LXC running mais Minecraft pas encore accessible - {minecraft_status.get('message', 'Erreur inconnue')}")
+                            self.logger.debug(f"LXC status: {status_result['status']}")
+                    else:
+                        self.logger.warning(f"Erreur lors de la vérification du statut: {status_result}")
+                
+                if container_running:
+                    # Vérification ROBUSTE: utiliser la même méthode que le démarrage initial
+                    minecraft_status = await self.server_manager.check_minecraft_status()
+                    
+                    if minecraft_status['success']:
+                        elapsed = int(time.time() - start_time)
+                        self.logger.info(f"Redémarrage LXC {self.container_id} terminé avec succès en {elapsed}s")
+                        self.logger.info(f"Minecraft Server VRAIMENT disponible sur {minecraft_status.get('details', {}).get('target_host')}:{minecraft_status.get('details', {}).get('port')}")
+                        return {
+                            'success': True,
+                            'elapsed_time': elapsed,
+                            'attempts': attempt,
+                            'running_at': running_at,
+                            'ready_at': time.time()
+                        }
                     else:
-                        self.logger.debug(f"LXC status: {status_result['status']}")
-                else:
-                    self.logger.warning(f"Erreur lors de la vérification du statut: {status_result}")
+                        self.logger.debug(f"LXC running mais Minecraft pas encore accessible - {minecraft_status.get('message', 'Erreur inconnue')}")
                 
-                # Attendre avant la prochaine vérification
-                await asyncio.sleep(self.monitoring_interval)
+                # Attendre avant la prochaine vérification (intervalle croissant)
+                await asyncio.sleep(interval)
+                interval = min(interval * 1.5, self.monitoring_interval)
             
             # Timeout atteint
             elapsed = int(time.time() - start_time)
-            self.logger.error(f"Timeout du redémarrage après {elapsed}s ({max_attempts} tentatives)")
+            self.logger.error(f"Timeout du redémarrage après {elapsed}s ({attempt} tentatives)")
             
             return {
                 'success': False,
@@ -337,6 +428,38 @@ class MinecraftManager:
                 'elapsed_time': elapsed
             }
 
+    def _get_api_credentials(self) -> Tuple[str, str, str, str]:
+        """
+        Récupère les paramètres d'accès à l'API Proxmox
+        
+        Returns:
+            Tuple (api_url, token_id, token_secret, node)
+        """
+        api_url = f"https://{self.proxmox_config['host']}:{self.proxmox_config['port']}/api2/json"
+        return (api_url, self.proxmox_config['api_token_id'],
+                self.proxmox_config['api_token_secret'], self.proxmox_config['node'])
+
+    def _get_api_headers(self) -> Dict[str, str]:
+        """
+        Construit l'en-tête d'authentification API Token Proxmox
+        
+        Returns:
+            En-têtes HTTP d'authentification
+        """
+        return {
+            'Authorization': f"PVEAPIToken={self.proxmox_config['api_token_id']}={self.proxmox_config['api_token_secret']}"
+        }
+
+    def _get_lxc_url(self) -> str:
+        """
+        Construit l'URL API du conteneur LXC Minecraft
+        
+        Returns:
+            URL de base du conteneur LXC
+        """
+        api_url, _, _, node = self._get_api_credentials()
+        return f"{api_url}/nodes/{node}/lxc/{self.container_id}"
+
     async def _check_lxc_status(self) -> Dict[str, Any]:
         """
         Vérifie le statut du conteneur LXC
@@ -345,44 +468,26 @@ class MinecraftManager:
             Statut du conteneur
         """
         try:
-            # Utiliser le server_manager existant si possible
-            if hasattr(self.server_manager, 'check_proxmox_status'):
-                proxmox_result = await self.server_manager.check_proxmox_status()
-                if not proxmox_result.get('success', False):
-                    return {
-                        'success': False,
-                        'error': 'proxmox_unreachable',
-                        'details': 'Serveur Proxmox non accessible'
-                    }
+            # API call direct pour le statut LXC (connexion keep-alive réutilisée) ;
+            # un nœud injoignable fait échouer la requête, sans vérification TCP préalable,
+            # au bout du timeout de connectivité (un cycle de surveillance n'attend pas plus)
+            status_url = f"{self._get_lxc_url()}/status/current"
+            timeout = self.config_manager.get_server_config('minecraft').get('timeout', 5)
             
-            # API call direct pour le statut LXC
-            base_url = f"https://{self.proxmox_config['host']}:{self.proxmox_config['port']}"
-            status_url = f"{base_url}/api2/json/nodes/{self.proxmox_config['node']}/lxc/{self.container_id}/status/current"
-            
-            timeout = aiohttp.ClientTimeout(total=10)
-            connector = aiohttp.TCPConnector(verify_ssl=self.proxmox_config['verify_ssl'])
-            
-            async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
-                # Headers avec authentification API Token
-                headers = {
-                    'Authorization': f"PVEAPIToken={self.proxmox_config['api_token_id']}={self.proxmox_config['api_token_secret']}"
+            response = await self.proxmox_client.request("GET", status_url, self._get_api_headers(), timeout=timeout)
+            if response['success']:
+                status = (response['data'] or {}).get('status', 'unknown')
+                return {
+                    'success': True,
+                    'status': status,
+                    'container_id': self.container_id
+                }
+            else:
+                return {
+                    'success': False,
+                    'error': 'status_check_failed',
+                    'details': f"HTTP {response['status']}"
                 }
-                
-                async with session.get(status_url, headers=headers) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        status = result.get('data', {}).get('status', 'unknown')
-                        return {
-                            'success': True,
-                            'status': status,
-                            'container_id': self.container_id
-                        }
-                    else:
-                        return {
-                            'success': False,
-                            'error': 'status_check_failed',
-                            'details': f"HTTP {response.status}"
-                        }
             
         except Exception as e:
             return {
@@ -409,6 +514,7 @@ class MinecraftManager:
                 'restart_timeout': self.restart_timeout,
                 'monitoring_interval': self.monitoring_interval,
                 'proxmox_host': self.proxmox_config['host'],
+                'proxmox_http_pool': self.proxmox_client.get_statistics(),
                 'security_statistics': security_stats,
                 'manager_status': 'operational'
             }
@@ -0,0 +1,256 @@
+"""
+Évaluation hors ligne et mesure de débit du CommandParser
+Un corpus annoté (JSONL) est analysé en lot : précision/rappel par intention, latences
+p50/p99 et messages par seconde ; deux configurations de l'analyseur peuvent être comparées
+pour vérifier qu'une optimisation ne dégrade pas la reconnaissance
+
+Format du corpus (une ligne par message, require_mention vaut true par défaut) :
+    {"message": "@CubeGuardian redémarre le serveur", "intent": "restart_minecraft", "require_mention": true}
+
+Exemple :
+    python -m src.parser_benchmark tests/data/command_parser_regression.jsonl --compare '{"word_cache_size": 0}'
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Dict, Any, Optional, List
+
+from .command_parser import CommandParser, CommandIntent
+
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    """
+    Charge un corpus annoté
+
+    Args:
+        path: Fichier JSONL (message, intent, require_mention optionnel)
+
+    Returns:
+        Liste des cas, intention attendue convertie en CommandIntent
+    """
+    corpus = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            case = json.loads(line)
+            try:
+                corpus.append({
+                    'message': case['message'],
+                    'intent': CommandIntent(case['intent']),
+                    'require_mention': case.get('require_mention', True)
+                })
+            except (KeyError, ValueError) as e:
+                raise ValueError(f"{path}:{line_number}: cas invalide ({e})") from e
+    return corpus
+
+
+def percentile(sorted_values: List[float], percent: float) -> Optional[float]:
+    """
+    Percentile par rang le plus proche
+
+    Args:
+        sorted_values: Valeurs triées
+        percent: Percentile (0-100)
+
+    Returns:
+        Valeur du percentile, None si la liste est vide
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class ParserEvaluator:
+    """Analyse en lot d'un corpus annoté avec une configuration de l'analyseur"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, bot_name: str = "CubeGuardian"):
+        """
+        Args:
+            config: Configuration de l'analyseur (section command_parser de bot.yaml)
+            bot_name: Nom du bot (pour détecter les mentions)
+        """
+        self.config = config or {}
+        self.bot_name = bot_name
+        self.parser = CommandParser.from_config(self.config)
+
+    def classify(self, message: str, require_mention: bool) -> CommandIntent:
+        """
+        Intention retenue pour un message, comme dans on_message (filtre rapide puis analyse)
+
+        Args:
+            message: Contenu du message
+            require_mention: Si True, exige une mention du bot
+
+        Returns:
+            Intention détectée (UNKNOWN si le filtre rapide écarte le message)
+        """
+        if not self.parser.prefilter(message, bot_name=self.bot_name, require_mention=require_mention):
+            return CommandIntent.UNKNOWN
+        return self.parser.parse_command(message, bot_name=self.bot_name,
+                                         require_mention=require_mention).intent
+
+    def evaluate(self, corpus: List[Dict[str, Any]], repeat: int = 1) -> Dict[str, Any]:
+        """
+        Analyse le corpus et mesure précision, rappel et débit
+
+        Args:
+            corpus: Cas chargés par load_corpus
+            repeat: Nombre de passes (les prédictions viennent de la première passe)
+
+        Returns:
+            Rapport : métriques par intention, latences (ms), débit, prédictions
+        """
+        predictions = []
+        latencies = []
+        started = time.perf_counter()
+        for iteration in range(max(1, repeat)):
+            for case in corpus:
+                start = time.perf_counter()
+                predicted = self.classify(case['message'], case['require_mention'])
+                latencies.append(time.perf_counter() - start)
+                if iteration == 0:
+                    predictions.append(predicted)
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+
+        intents = {}
+        for intent in CommandIntent:
+            true_positives = sum(1 for case, predicted in zip(corpus, predictions)
+                                 if predicted == intent and case['intent'] == intent)
+            predicted_count = sum(1 for predicted in predictions if predicted == intent)
+            expected_count = sum(1 for case in corpus if case['intent'] == intent)
+            intents[intent.value] = {
+                'expected': expected_count,
+                'predicted': predicted_count,
+                'precision': true_positives / predicted_count if predicted_count else None,
+                'recall': true_positives / expected_count if expected_count else None
+            }
+
+        correct = sum(1 for case, predicted in zip(corpus, predictions) if predicted == case['intent'])
+        return {
+            'config': self.config,
+            'messages': len(corpus),
+            'passes': max(1, repeat),
+            'accuracy': correct / len(corpus) if corpus else None,
+            'intents': intents,
+            'latency_ms': {
+                'p50': percentile(latencies, 50) * 1000 if latencies else None,
+                'p99': percentile(latencies, 99) * 1000 if latencies else None,
+                'max': latencies[-1] * 1000 if latencies else None
+            },
+            'messages_per_second': len(latencies) / elapsed if elapsed > 0 else None,
+            'errors': [{'message': case['message'], 'require_mention': case['require_mention'],
+                        'expected': case['intent'].value, 'predicted': predicted.value}
+                       for case, predicted in zip(corpus, predictions) if predicted != case['intent']],
+            'predictions': [predicted.value for predicted in predictions],
+            'parser_statistics': self.parser.get_statistics()
+        }
+
+
+def compare(corpus: List[Dict[str, Any]], baseline: Dict[str, Any],
+            candidate: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compare deux rapports d'evaluate sur le même corpus
+
+    Args:
+        corpus: Cas évalués
+        baseline: Rapport de la configuration de référence
+        candidate: Rapport de la configuration candidate
+
+    Returns:
+        Écarts de métriques, facteur de débit et cas dégradés ou corrigés par la candidate
+    """
+    regressions = []
+    fixes = []
+    for case, before, after in zip(corpus, baseline['predictions'], candidate['predictions']):
+        expected = case['intent'].value
+        entry = {'message': case['message'], 'require_mention': case['require_mention'],
+                 'expected': expected, 'baseline': before, 'candidate': after}
+        if before == expected and after != expected:
+            regressions.append(entry)
+        elif before != expected and after == expected:
+            fixes.append(entry)
+
+    def delta(after: Optional[float], before: Optional[float]) -> Optional[float]:
+        return after - before if after is not None and before is not None else None
+
+    baseline_rate = baseline['messages_per_second']
+    candidate_rate = candidate['messages_per_second']
+    return {
+        'intents': {
+            intent: {
+                'precision_delta': delta(candidate['intents'][intent]['precision'], metrics['precision']),
+                'recall_delta': delta(candidate['intents'][intent]['recall'], metrics['recall'])
+            }
+            for intent, metrics in baseline['intents'].items()
+        },
+        'accuracy_delta': delta(candidate['accuracy'], baseline['accuracy']),
+        'speedup': candidate_rate / baseline_rate if baseline_rate and candidate_rate else None,
+        'p50_ms_delta': delta(candidate['latency_ms']['p50'], baseline['latency_ms']['p50']),
+        'p99_ms_delta': delta(candidate['latency_ms']['p99'], baseline['latency_ms']['p99']),
+        'regressions': regressions,
+        'fixes': fixes
+    }
+
+
+def format_report(name: str, report: Dict[str, Any]) -> str:
+    """Rapport d'evaluate sous forme de tableau lisible"""
+    def ratio(value: Optional[float]) -> str:
+        return f"{value:6.1%}" if value is not None else "     -"
+
+    lines = [f"[{name}] config={json.dumps(report['config'], ensure_ascii=False)}",
+             f"  {'intention':<20} {'attendus':>8} {'prédits':>8} {'précision':>10} {'rappel':>8}"]
+    for intent, metrics in report['intents'].items():
+        lines.append(f"  {intent:<20} {metrics['expected']:>8} {metrics['predicted']:>8} "
+                     f"{ratio(metrics['precision']):>10} {ratio(metrics['recall']):>8}")
+    latency = report['latency_ms']
+    lines.append(f"  exactitude {ratio(report['accuracy']).strip()} sur {report['messages']} messages, "
+                 f"{len(report['errors'])} erreur(s)")
+    lines.append(f"  latence p50 {latency['p50']:.3f} ms, p99 {latency['p99']:.3f} ms, "
+                 f"{report['messages_per_second']:.0f} messages/s ({report['passes']} passe(s))"
+                 if latency['p50'] is not None else "  aucune mesure")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée : python -m src.parser_benchmark"""
+    parser = argparse.ArgumentParser(description="Évaluation et mesure de débit du CommandParser")
+    parser.add_argument('corpus', help="Corpus annoté (JSONL : message, intent, require_mention)")
+    parser.add_argument('--config', default='{}', metavar='JSON',
+                        help="Configuration de référence (clés de command_parser dans bot.yaml)")
+    parser.add_argument('--compare', metavar='JSON', help="Configuration candidate à comparer")
+    parser.add_argument('--repeat', type=int, default=20, help="Nombre de passes pour les mesures de débit")
+    parser.add_argument('--json', action='store_true', help="Rapport complet en JSON")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus)
+    baseline = ParserEvaluator(json.loads(args.config)).evaluate(corpus, args.repeat)
+    candidate = comparison = None
+    if args.compare is not None:
+        candidate = ParserEvaluator(json.loads(args.compare)).evaluate(corpus, args.repeat)
+        comparison = compare(corpus, baseline, candidate)
+
+    if args.json:
+        print(json.dumps({'baseline': baseline, 'candidate': candidate, 'comparison': comparison},
+                         ensure_ascii=False, indent=2))
+    else:
+        print(format_report('référence', baseline))
+        if candidate is not None:
+            print(format_report('candidate', candidate))
+            speedup = f"x{comparison['speedup']:.2f}" if comparison['speedup'] else "-"
+            print(f"Débit candidate/référence : {speedup}, {len(comparison['regressions'])} régression(s), "
+                  f"{len(comparison['fixes'])} correction(s)")
+            for entry in comparison['regressions']:
+                print(f"  RÉGRESSION {entry['message']!r} (mention requise: {entry['require_mention']}) : "
+                      f"{entry['baseline']} -> {entry['candidate']}")
+
+    # Code de retour non nul si la candidate dégrade la reconnaissance (intégration continue)
+    return 1 if comparison and comparison['regressions'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,14 +5,32 @@ Remplace les scripts PowerShell par des modules Python natifs
 
 from .server_manager import ServerManager
 from .wake_on_lan import WakeOnLANManager
+from .broadcast_discovery import BroadcastDiscovery
 from .ssh_manager import SSHManager
 from .connectivity_checker import ConnectivityChecker
 from .minecraft_checker import MinecraftChecker
+from .proxmox_client import ProxmoxHTTPClient
+from .polling_scheduler import PollingScheduler, ReadyTimeEstimator
+from .lifecycle_history import LifecycleHistory
+from .metrics import LatencyHistogram
+from .probe_engine import ProbeEngine, ReadinessSnapshot
+from .fleet import ServerFleet, GameInstance, InstanceState
 
 __all__ = [
     'ServerManager',
     'WakeOnLANManager', 
+    'BroadcastDiscovery',
     'SSHManager',
     'ConnectivityChecker',
-    'MinecraftChecker'
+    'MinecraftChecker',
+    'ProxmoxHTTPClient',
+    'PollingScheduler',
+    'ReadyTimeEstimator',
+    'LifecycleHistory',
+    'LatencyHistogram',
+    'ProbeEngine',
+    'ReadinessSnapshot',
+    'ServerFleet',
+    'GameInstance',
+    'InstanceState'
 ]
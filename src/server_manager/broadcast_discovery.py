@@ -0,0 +1,158 @@
+"""
+Découverte des adresses de broadcast - Version Python natif
+Sous-réseaux locaux lus via psutil (ou /proc/net/route), mis en cache avec une durée de validité
+"""
+
+import ipaddress
+import socket
+import time
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+class BroadcastDiscovery:
+    """
+    Calcule les cibles Wake-on-LAN minimales pour une adresse IP
+
+    - Hôte sur un sous-réseau local : broadcast dirigé de ce sous-réseau uniquement
+    - Sinon (conteneur sur un réseau bridge, hôte routé) : broadcast dirigé supposé
+      (préfixe fallback_prefix) et adresse directe de l'hôte
+    """
+
+    def __init__(self, logger: logging.Logger, ttl: float = 300.0, fallback_prefix: int = 24,
+                 route_path: str = '/proc/net/route'):
+        """
+        Args:
+            logger: Logger à utiliser
+            ttl: Durée de validité du cache des sous-réseaux (secondes)
+            fallback_prefix: Préfixe supposé pour un hôte hors des sous-réseaux locaux
+            route_path: Table de routage du noyau (si psutil est indisponible)
+        """
+        self.logger = logger
+        self.ttl = ttl
+        self.fallback_prefix = fallback_prefix
+        self.route_path = route_path
+
+        self._networks: List[ipaddress.IPv4Network] = []
+        self._source: Optional[str] = None
+        self._expires_at = 0.0
+
+        self.discoveries = 0
+        self.cache_hits = 0
+
+    def _networks_from_psutil(self) -> List[ipaddress.IPv4Network]:
+        """Sous-réseaux des interfaces IPv4 actives (hors loopback)"""
+        stats = psutil.net_if_stats()
+        networks = []
+        for name, addresses in psutil.net_if_addrs().items():
+            if name in stats and not stats[name].isup:
+                continue
+            for address in addresses:
+                if address.family != socket.AF_INET or not address.netmask:
+                    continue
+                interface = ipaddress.IPv4Interface(f"{address.address}/{address.netmask}")
+                if not interface.is_loopback:
+                    networks.append(interface.network)
+        return networks
+
+    def _networks_from_proc(self) -> List[ipaddress.IPv4Network]:
+        """Sous-réseaux directement connectés d'après /proc/net/route (routes sans passerelle)"""
+        networks = []
+        with open(self.route_path, 'r', encoding='ascii') as f:
+            next(f, None)
+            for line in f:
+                fields = line.split()
+                if len(fields) < 8:
+                    continue
+                destination, gateway, mask = (int(fields[index], 16) for index in (1, 2, 7))
+                if destination == 0 or gateway != 0:
+                    continue
+                # Valeurs hexadécimales en ordre little-endian
+                network = ipaddress.IPv4Address(destination.to_bytes(4, 'little'))
+                netmask = ipaddress.IPv4Address(mask.to_bytes(4, 'little'))
+                networks.append(ipaddress.IPv4Network(f"{network}/{netmask}", strict=False))
+        return networks
+
+    def get_networks(self) -> Tuple[List[ipaddress.IPv4Network], Optional[str]]:
+        """
+        Sous-réseaux locaux (depuis le cache s'il est encore valide)
+
+        Returns:
+            (sous-réseaux, source : psutil, proc ou None)
+        """
+        now = time.monotonic()
+        if now < self._expires_at:
+            self.cache_hits += 1
+            return self._networks, self._source
+
+        networks, source = [], None
+        try:
+            if PSUTIL_AVAILABLE:
+                networks, source = self._networks_from_psutil(), 'psutil'
+            else:
+                networks, source = self._networks_from_proc(), 'proc'
+        except Exception as e:
+            self.logger.warning(f"Découverte des interfaces impossible: {e}")
+
+        self._networks = list(dict.fromkeys(networks))
+        self._source = source
+        self._expires_at = now + self.ttl
+        self.discoveries += 1
+        self.logger.debug(f"Sous-réseaux locaux ({source}): {[str(network) for network in self._networks]}")
+        return self._networks, self._source
+
+    def invalidate(self) -> None:
+        """Force une nouvelle découverte au prochain appel"""
+        self._expires_at = 0.0
+
+    def targets_for(self, target_host: str) -> Dict[str, Any]:
+        """
+        Cibles d'envoi pour une adresse IP
+
+        Args:
+            target_host: Adresse IP du serveur à réveiller
+
+        Returns:
+            addresses, on_link, network, source
+        """
+        host = ipaddress.IPv4Address(target_host)
+        networks, source = self.get_networks()
+
+        # Sous-réseau le plus spécifique contenant l'hôte
+        matching = [network for network in networks if host in network]
+        if matching:
+            network = max(matching, key=lambda candidate: candidate.prefixlen)
+            return {
+                'addresses': [str(network.broadcast_address)],
+                'on_link': True,
+                'network': str(network),
+                'source': source
+            }
+
+        network = ipaddress.IPv4Network(f"{host}/{self.fallback_prefix}", strict=False)
+        return {
+            'addresses': [str(network.broadcast_address), target_host],
+            'on_link': False,
+            'network': str(network),
+            'source': source
+        }
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Récupère les statistiques de découverte
+
+        Returns:
+            Sous-réseaux en cache, source, découvertes et réponses depuis le cache
+        """
+        return {
+            'networks': [str(network) for network in self._networks],
+            'source': self._source,
+            'discoveries': self.discoveries,
+            'cache_hits': self.cache_hits
+        }
@@ -0,0 +1,517 @@
+"""
+Flotte de serveurs de jeu - Version Python natif
+Plusieurs nœuds Proxmox (chacun avec son pool HTTP, son pool SSH et son Wake-on-LAN) et
+plusieurs instances de jeu LXC/QEMU, chacune avec sa propre machine à états ; les
+opérations sur des instances différentes s'exécutent en parallèle
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Any, Optional, List, Iterable
+import logging
+
+from .server_manager import ServerManager
+from .proxmox_client import ProxmoxHTTPClient
+from .polling_scheduler import PollingScheduler
+
+
+class InstanceState(Enum):
+    """États d'une instance de jeu"""
+    UNKNOWN = "unknown"
+    STOPPED = "stopped"
+    STARTING = "starting"
+    RUNNING = "running"
+    STOPPING = "stopping"
+    ERROR = "error"
+
+
+# Transitions autorisées (les états stables peuvent aussi être corrigés par refresh())
+TRANSITIONS = {
+    InstanceState.UNKNOWN: {InstanceState.STOPPED, InstanceState.RUNNING, InstanceState.STARTING,
+                            InstanceState.STOPPING, InstanceState.ERROR},
+    InstanceState.STOPPED: {InstanceState.STARTING, InstanceState.RUNNING},
+    InstanceState.STARTING: {InstanceState.RUNNING, InstanceState.ERROR, InstanceState.STOPPED},
+    InstanceState.RUNNING: {InstanceState.STOPPING, InstanceState.STOPPED, InstanceState.ERROR},
+    InstanceState.STOPPING: {InstanceState.STOPPED, InstanceState.ERROR, InstanceState.RUNNING},
+    InstanceState.ERROR: {InstanceState.STARTING, InstanceState.STOPPING, InstanceState.STOPPED,
+                          InstanceState.RUNNING},
+}
+
+
+@dataclass
+class InstanceConfig:
+    """Configuration d'une instance de jeu"""
+    name: str
+    node: str
+    vmid: int
+    guest_type: str = 'lxc'
+    ipv4: str = ''
+    port: int = 25565
+    startup_timeout: int = 380
+    shutdown_timeout: int = 120
+
+
+class FleetNode:
+    """Nœud Proxmox de la flotte (API, Wake-on-LAN et SSH dédiés)"""
+
+    def __init__(self, name: str, config: Dict[str, Any], manager: ServerManager, logger: logging.Logger,
+                 wake_timeout: int = 600):
+        """
+        Args:
+            name: Nom du nœud dans la flotte
+            config: Section du nœud (format de la section proxmox de servers.yaml)
+            manager: Gestionnaire natif du nœud (pools HTTP et SSH du nœud)
+            logger: Logger à utiliser
+            wake_timeout: Attente maximale de l'API après un Wake-on-LAN (secondes)
+        """
+        self.name = name
+        self.config = config
+        self.manager = manager
+        self.logger = logger
+        self.wake_timeout = wake_timeout
+        self._wake_lock = asyncio.Lock()
+
+    @property
+    def node_name(self) -> str:
+        """Nom du nœud dans l'API Proxmox"""
+        return self.config.get('node_name', 'pve')
+
+    def api_credentials(self) -> tuple:
+        """(api_url, token_id, token_secret) du nœud"""
+        return self.config.get('api_url'), self.config.get('api_token_id'), self.config.get('api_token_secret')
+
+    async def is_online(self) -> bool:
+        """Indique si l'API REST du nœud répond"""
+        result = await self.manager.check_node_status()
+        return bool(result.get('success'))
+
+    async def ensure_online(self) -> Dict[str, Any]:
+        """
+        Réveille le nœud si nécessaire et attend que son API réponde
+
+        Un seul réveil à la fois par nœud : les instances qui démarrent ensemble le partagent
+
+        Returns:
+            Dict avec success, message, timestamp, details
+        """
+        async with self._wake_lock:
+            if await self.is_online():
+                return {
+                    'success': True,
+                    'message': f"Nœud {self.name} en ligne",
+                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    'details': {'woken': False}
+                }
+
+            if not self.config.get('wake_on_lan_enabled', True):
+                return {
+                    'success': False,
+                    'message': f"Nœud {self.name} hors ligne",
+                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    'error': "Wake-on-LAN désactivé"
+                }
+
+            self.logger.info(f"Réveil du nœud {self.name}")
+            wake_result = await self.manager.wake_server()
+            if not wake_result['success']:
+                return wake_result
+
+            scheduler = PollingScheduler(self.wake_timeout, initial_interval=2, max_interval=10)
+            while await scheduler.wait():
+                if await self.is_online():
+                    self.logger.info(f"Nœud {self.name} en ligne après {scheduler.elapsed:.0f}s")
+                    return {
+                        'success': True,
+                        'message': f"Nœud {self.name} réveillé",
+                        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        'details': {'woken': True, 'elapsed': scheduler.elapsed}
+                    }
+
+            return {
+                'success': False,
+                'message': f"Nœud {self.name} injoignable",
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'error': f"API non disponible après {self.wake_timeout}s"
+            }
+
+    async def shutdown(self) -> Dict[str, Any]:
+        """Arrête le nœud via l'API REST"""
+        self.logger.info(f"Arrêt du nœud {self.name}")
+        return await self.manager.shutdown_server()
+
+    async def close(self) -> None:
+        """Ferme les connexions du nœud"""
+        await self.manager.close()
+        await self.manager.proxmox_api.http_client.close()
+
+
+class GameInstance:
+    """Instance de jeu (conteneur LXC ou VM QEMU) avec sa machine à états"""
+
+    def __init__(self, config: InstanceConfig, node: FleetNode, logger: logging.Logger, history_size: int = 50):
+        """
+        Args:
+            config: Configuration de l'instance
+            node: Nœud hébergeant l'instance
+            logger: Logger à utiliser
+            history_size: Nombre de transitions conservées
+        """
+        self.config = config
+        self.node = node
+        self.logger = logger
+        self.state = InstanceState.UNKNOWN
+        self.state_since = time.time()
+        self.history = deque(maxlen=history_size)
+        self._lock = asyncio.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+    def transition(self, new_state: InstanceState) -> bool:
+        """
+        Change l'état de l'instance si la transition est autorisée
+
+        Args:
+            new_state: Nouvel état
+
+        Returns:
+            True si l'état a changé
+        """
+        if new_state == self.state:
+            return False
+        if new_state not in TRANSITIONS[self.state]:
+            self.logger.warning(f"Instance {self.name}: transition {self.state.value} -> {new_state.value} refusée")
+            return False
+
+        self.history.append((time.time(), self.state.value, new_state.value))
+        self.logger.info(f"Instance {self.name}: {self.state.value} -> {new_state.value}")
+        self.state = new_state
+        self.state_since = time.time()
+        return True
+
+    def _result(self, success: bool, message: str, error: Optional[str] = None,
+                details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Résultat au format des gestionnaires de serveurs"""
+        result = {
+            'success': success,
+            'message': message,
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'operation': 'instance',
+            'details': {'instance': self.name, 'state': self.state.value, **(details or {})}
+        }
+        if error:
+            result['error'] = error
+        return result
+
+    async def check_game(self) -> Dict[str, Any]:
+        """Server List Ping du serveur de jeu"""
+        return await self.node.manager.check_minecraft_status(self.config.ipv4, self.config.port)
+
+    async def _guest_action(self, action: str) -> Dict[str, Any]:
+        """Lance une action Proxmox sur l'invité et attend la fin de la tâche"""
+        api_url, token_id, token_secret = self.node.api_credentials()
+        api = self.node.manager.proxmox_api
+        method = api.start_guest if action == 'start' else api.shutdown_guest
+        response = await method(api_url, token_id, token_secret, self.config.vmid,
+                                self.node.node_name, self.config.guest_type)
+        if not response['success'] or not response.get('upid'):
+            return response
+
+        timeout = self.config.shutdown_timeout if action == 'shutdown' else self.config.startup_timeout
+        return await api.wait_for_task(api_url, token_id, token_secret, response['upid'],
+                                       self.node.node_name, timeout=timeout)
+
+    async def start(self) -> Dict[str, Any]:
+        """
+        Démarre l'instance : réveil du nœud, démarrage de l'invité, attente du serveur de jeu
+
+        Returns:
+            Dict avec success, message, timestamp, details
+        """
+        async with self._lock:
+            if self.state == InstanceState.RUNNING:
+                return self._result(True, f"Instance {self.name} déjà démarrée")
+
+            start_time = time.time()
+            self.transition(InstanceState.STARTING)
+            try:
+                node_result = await self.node.ensure_online()
+                if not node_result['success']:
+                    self.transition(InstanceState.ERROR)
+                    return self._result(False, f"Nœud {self.node.name} indisponible", node_result.get('error'))
+
+                guest_result = await self._guest_action('start')
+                if not guest_result['success']:
+                    self.transition(InstanceState.ERROR)
+                    return self._result(False, f"Démarrage de {self.name} échoué", guest_result.get('error'))
+
+                scheduler = PollingScheduler(self.config.startup_timeout, initial_interval=2, max_interval=10,
+                                             immediate_first=True)
+                while await scheduler.wait():
+                    if (await self.check_game())['success']:
+                        self.transition(InstanceState.RUNNING)
+                        return self._result(True, f"Instance {self.name} démarrée",
+                                            details={'elapsed': time.time() - start_time})
+
+                self.transition(InstanceState.ERROR)
+                return self._result(False, f"Instance {self.name} non disponible",
+                                    f"Serveur de jeu injoignable après {self.config.startup_timeout}s")
+
+            except Exception as e:
+                self.logger.error(f"Erreur lors du démarrage de l'instance {self.name}: {e}")
+                self.transition(InstanceState.ERROR)
+                return self._result(False, f"Erreur lors du démarrage de {self.name}", str(e))
+
+    async def stop(self) -> Dict[str, Any]:
+        """
+        Arrête proprement l'invité de l'instance (le nœud reste allumé)
+
+        Returns:
+            Dict avec success, message, timestamp, details
+        """
+        async with self._lock:
+            if self.state == InstanceState.STOPPED:
+                return self._result(True, f"Instance {self.name} déjà arrêtée")
+
+            start_time = time.time()
+            self.transition(InstanceState.STOPPING)
+            try:
+                guest_result = await self._guest_action('shutdown')
+                if not guest_result['success']:
+                    self.transition(InstanceState.ERROR)
+                    return self._result(False, f"Arrêt de {self.name} échoué", guest_result.get('error'))
+
+                self.transition(InstanceState.STOPPED)
+                return self._result(True, f"Instance {self.name} arrêtée",
+                                    details={'elapsed': time.time() - start_time})
+
+            except Exception as e:
+                self.logger.error(f"Erreur lors de l'arrêt de l'instance {self.name}: {e}")
+                self.transition(InstanceState.ERROR)
+                return self._result(False, f"Erreur lors de l'arrêt de {self.name}", str(e))
+
+    async def refresh(self) -> InstanceState:
+        """
+        Met à jour l'état depuis le serveur de jeu (sans effet pendant un démarrage ou un arrêt)
+
+        Returns:
+            État de l'instance
+        """
+        if self._lock.locked():
+            return self.state
+
+        game = await self.check_game()
+        self.transition(InstanceState.RUNNING if game['success'] else InstanceState.STOPPED)
+        return self.state
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Récupère l'état de l'instance
+
+        Returns:
+            Nœud, invité, état et ancienneté de l'état
+        """
+        return {
+            'node': self.node.name,
+            'vmid': self.config.vmid,
+            'guest_type': self.config.guest_type,
+            'address': f"{self.config.ipv4}:{self.config.port}",
+            'state': self.state.value,
+            'state_age': time.time() - self.state_since,
+            'busy': self._lock.locked()
+        }
+
+
+class ServerFleet:
+    """Ensemble des nœuds et des instances de jeu gérés par le bot"""
+
+    DEFAULT_INSTANCE = 'default'
+
+    def __init__(self, logger: logging.Logger):
+        """
+        Args:
+            logger: Logger à utiliser
+        """
+        self.logger = logger
+        self.nodes: Dict[str, FleetNode] = {}
+        self.instances: Dict[str, GameInstance] = {}
+        self._owned_nodes: set = set()  # Nœuds dont les connexions ont été créées par la flotte
+
+    @classmethod
+    def from_config(cls, servers_config: Dict[str, Any], logger: logging.Logger,
+                    default_manager: Optional[ServerManager] = None) -> 'ServerFleet':
+        """
+        Construit la flotte depuis servers.yaml
+
+        La section fleet décrit les nœuds et les instances ; le nœud proxmox (section proxmox)
+        en fait toujours partie. Sans instances, la flotte contient l'instance default
+        (conteneur minecraft.container_id sur le nœud proxmox)
+
+        Args:
+            servers_config: Section servers de servers.yaml
+            logger: Logger à utiliser
+            default_manager: Gestionnaire natif existant, réutilisé pour le nœud proxmox
+
+        Returns:
+            Flotte configurée
+        """
+        fleet = cls(logger)
+        servers_config = servers_config or {}
+        fleet_config = servers_config.get('fleet') or {}
+
+        proxmox = servers_config.get('proxmox', {}) or {}
+        minecraft = servers_config.get('minecraft', {}) or {}
+        node_configs = {}
+        if 'proxmox' in servers_config or default_manager is not None:
+            node_configs['proxmox'] = proxmox
+        for name, config in (fleet_config.get('nodes') or {}).items():
+            if name in node_configs:
+                logger.warning(f"Nœud {name} de la section fleet ignoré : défini par la section proxmox")
+                continue
+            node_configs[name] = config
+        instance_configs = dict(fleet_config.get('instances') or {}) or {
+            cls.DEFAULT_INSTANCE: {
+                'node': 'proxmox',
+                'vmid': minecraft.get('container_id', 105),
+                'type': 'lxc',
+                'ipv4': minecraft.get('ipv4', ''),
+                'port': minecraft.get('port', 25565),
+                'startup_timeout': minecraft.get('startup_delay', 380)
+            }
+        }
+
+        for name, config in node_configs.items():
+            # Champs lus sans valeur par défaut par le gestionnaire natif
+            config = dict(config or {})
+            config.setdefault('node_name', 'pve')
+            if name == 'proxmox' and default_manager is not None:
+                manager = default_manager
+            else:
+                # Pools HTTP et SSH propres au nœud
+                http_client = ProxmoxHTTPClient.from_config(config, logger)
+                manager = ServerManager({'proxmox': config, 'minecraft': {}}, logger, http_client)
+                fleet._owned_nodes.add(name)
+            fleet.nodes[name] = FleetNode(name, config, manager, logger,
+                                          wake_timeout=fleet_config.get('wake_timeout', 600))
+
+        for name, config in instance_configs.items():
+            node = fleet.nodes.get(config.get('node', 'proxmox'))
+            if node is None:
+                logger.error(f"Instance {name}: nœud '{config.get('node')}' inconnu")
+                continue
+            fleet.instances[name] = GameInstance(InstanceConfig(
+                name=name,
+                node=node.name,
+                vmid=int(config['vmid']),
+                guest_type=config.get('type', 'lxc'),
+                ipv4=config.get('ipv4', ''),
+                port=int(config.get('port', 25565)),
+                startup_timeout=config.get('startup_timeout', 380),
+                shutdown_timeout=config.get('shutdown_timeout', 120)
+            ), node, logger)
+
+        logger.info(f"Flotte: {len(fleet.nodes)} nœud(s), {len(fleet.instances)} instance(s)")
+        return fleet
+
+    def get(self, name: str) -> Optional[GameInstance]:
+        """Instance par nom (None si inconnue)"""
+        return self.instances.get(name)
+
+    def instances_on(self, node_name: str) -> List[GameInstance]:
+        """Instances hébergées par un nœud"""
+        return [instance for instance in self.instances.values() if instance.node.name == node_name]
+
+    async def _run_many(self, names: Iterable[str], operation: str) -> Dict[str, Dict[str, Any]]:
+        """Lance la même opération sur plusieurs instances en parallèle"""
+        names = list(names) or list(self.instances)
+        unknown = [name for name in names if name not in self.instances]
+        for name in unknown:
+            self.logger.error(f"Instance inconnue: {name}")
+
+        known = [name for name in names if name in self.instances]
+        results = await asyncio.gather(*(getattr(self.instances[name], operation)() for name in known))
+        return dict(zip(known, results))
+
+    async def start(self, *names: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Démarre des instances en parallèle (toutes si aucun nom)
+
+        Returns:
+            Résultat par instance
+        """
+        return await self._run_many(names, 'start')
+
+    async def stop(self, *names: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Arrête des instances en parallèle (toutes si aucun nom)
+
+        Returns:
+            Résultat par instance
+        """
+        return await self._run_many(names, 'stop')
+
+    async def refresh(self) -> Dict[str, str]:
+        """
+        Met à jour l'état de toutes les instances en parallèle
+
+        Returns:
+            État par instance
+        """
+        states = await asyncio.gather(*(instance.refresh() for instance in self.instances.values()),
+                                      return_exceptions=True)
+        return {
+            name: state.value if isinstance(state, InstanceState) else InstanceState.ERROR.value
+            for name, state in zip(self.instances, states)
+        }
+
+    def idle_nodes(self) -> List[FleetNode]:
+        """
+        Nœuds dont toutes les instances sont arrêtées
+
+        Une instance dans un état inconnu ou en erreur peut être en service : son nœud n'est
+        pas considéré comme inactif
+        """
+        return [node for node in self.nodes.values()
+                if all(instance.state == InstanceState.STOPPED for instance in self.instances_on(node.name))]
+
+    async def is_node_idle(self, node: FleetNode) -> bool:
+        """
+        Met à jour les instances d'un nœud puis indique si toutes sont arrêtées
+
+        Args:
+            node: Nœud à vérifier
+
+        Returns:
+            True si le nœud peut être éteint sans interrompre une instance
+        """
+        await asyncio.gather(*(instance.refresh() for instance in self.instances_on(node.name)),
+                             return_exceptions=True)
+        return node in self.idle_nodes()
+
+    async def close(self) -> None:
+        """Ferme les connexions des nœuds créés par la flotte"""
+        for node in self.nodes.values():
+            if node.name in self._owned_nodes:
+                try:
+                    await node.close()
+                except Exception as e:
+                    self.logger.warning(f"Fermeture du nœud {node.name}: {e}")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Récupère l'état de la flotte
+
+        Returns:
+            Nœuds et état de chaque instance
+        """
+        return {
+            'nodes': {name: {'node_name': node.node_name, 'ipv4': node.config.get('ipv4'),
+                             'instances': [instance.name for instance in self.instances_on(name)]}
+                      for name, node in self.nodes.items()},
+            'instances': {name: instance.get_status() for name, instance in self.instances.items()}
+        }
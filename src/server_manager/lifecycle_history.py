@@ -0,0 +1,244 @@
+"""
+Historique des opérations de cycle de vie - Version Python natif
+Enregistre chaque démarrage, arrêt et redémarrage (durée totale et temps de chaque phase)
+dans une base SQLite en ajout seul, pour calculer des percentiles et une estimation d'attente
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterable
+import logging
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Percentile par interpolation linéaire sur une liste triée"""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * percentile / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+class LifecycleHistory:
+    """
+    Historique persistant des opérations (startup, shutdown, restart)
+
+    Phases enregistrées (secondes écoulées depuis le début de l'opération) :
+    - wol_sent : Wake-on-LAN envoyé
+    - proxmox_up : Proxmox accessible en TCP
+    - lxc_stopped / lxc_running : état du conteneur Minecraft
+    - slp_ready : Minecraft répond au Server List Ping
+    """
+
+    PHASES = ('wol_sent', 'proxmox_up', 'lxc_stopped', 'lxc_running', 'slp_ready')
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS operations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            operation TEXT NOT NULL,
+            started_at REAL NOT NULL,
+            success INTEGER NOT NULL,
+            duration REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS phases (
+            operation_id INTEGER NOT NULL REFERENCES operations(id),
+            phase TEXT NOT NULL,
+            offset REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_operations_type ON operations(operation, success, id);
+        CREATE INDEX IF NOT EXISTS idx_phases_operation ON phases(operation_id);
+    """
+
+    def __init__(self, db_path: str, logger: logging.Logger, window: int = 100, eta_percentile: float = 80):
+        """
+        Initialise l'historique
+
+        Args:
+            db_path: Chemin du fichier SQLite (":memory:" pour un historique non persistant)
+            logger: Logger à utiliser
+            window: Nombre d'opérations récentes prises en compte dans les calculs
+            eta_percentile: Percentile utilisé pour l'estimation d'attente
+        """
+        self.db_path = db_path
+        self.logger = logger
+        self.window = window
+        self.eta_percentile = eta_percentile
+
+        if db_path != ':memory:':
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        self.connection.commit()
+
+    @classmethod
+    def from_config(cls, history_config: Dict[str, Any], logger: logging.Logger) -> 'LifecycleHistory':
+        """
+        Construit l'historique depuis la section history de bot.yaml
+
+        Args:
+            history_config: Configuration de l'historique
+            logger: Logger à utiliser
+
+        Returns:
+            Historique configuré (en mémoire si désactivé)
+        """
+        history_config = history_config or {}
+        db_path = history_config.get('path', './logs/lifecycle_history.db')
+        if not history_config.get('enabled', True):
+            db_path = ':memory:'
+
+        return cls(
+            db_path,
+            logger,
+            window=history_config.get('window', 100),
+            eta_percentile=history_config.get('eta_percentile', 80)
+        )
+
+    def record_operation(self, operation: str, success: bool, duration: float,
+                         phases: Optional[Dict[str, float]] = None,
+                         started_at: Optional[float] = None) -> Optional[int]:
+        """
+        Ajoute une opération à l'historique
+
+        Args:
+            operation: Type d'opération (startup, shutdown, restart)
+            success: True si l'opération a abouti
+            duration: Durée totale en secondes
+            phases: Temps écoulé (secondes) à la fin de chaque phase atteinte
+            started_at: Timestamp du début de l'opération (déduit de la durée par défaut)
+
+        Returns:
+            Identifiant de l'enregistrement, None en cas d'erreur
+        """
+        if started_at is None:
+            started_at = time.time() - duration
+
+        try:
+            with self.connection:
+                cursor = self.connection.execute(
+                    "INSERT INTO operations (operation, started_at, success, duration) VALUES (?, ?, ?, ?)",
+                    (operation, started_at, int(success), float(duration))
+                )
+                operation_id = cursor.lastrowid
+                if phases:
+                    self.connection.executemany(
+                        "INSERT INTO phases (operation_id, phase, offset) VALUES (?, ?, ?)",
+                        [(operation_id, phase, float(offset)) for phase, offset in phases.items()
+                         if offset is not None]
+                    )
+
+            self.logger.debug(f"Opération {operation} enregistrée ({duration:.1f}s, succès={success}, phases={phases})")
+            return operation_id
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Erreur lors de l'enregistrement de l'historique: {e}")
+            return None
+
+    def get_durations(self, operation: str, phase: Optional[str] = None, limit: Optional[int] = None) -> List[float]:
+        """
+        Récupère les durées des dernières opérations réussies
+
+        Args:
+            operation: Type d'opération
+            phase: Phase à mesurer (durée totale si None)
+            limit: Nombre maximum d'opérations (window par défaut)
+
+        Returns:
+            Durées en secondes, de la plus ancienne à la plus récente
+        """
+        limit = limit or self.window
+        if phase is None:
+            query = ("SELECT duration FROM operations WHERE operation = ? AND success = 1 "
+                     "ORDER BY id DESC LIMIT ?")
+            params = (operation, limit)
+        else:
+            query = ("SELECT p.offset FROM operations o JOIN phases p ON p.operation_id = o.id "
+                     "WHERE o.operation = ? AND o.success = 1 AND p.phase = ? ORDER BY o.id DESC LIMIT ?")
+            params = (operation, phase, limit)
+
+        try:
+            rows = self.connection.execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Erreur lors de la lecture de l'historique: {e}")
+            return []
+
+        return [row[0] for row in reversed(rows)]
+
+    def get_percentiles(self, operation: str, percentiles: Iterable[float] = (50, 90, 99),
+                        phase: Optional[str] = None) -> Dict[str, float]:
+        """
+        Calcule les percentiles des durées d'une opération
+
+        Args:
+            operation: Type d'opération
+            percentiles: Percentiles à calculer
+            phase: Phase à mesurer (durée totale si None)
+
+        Returns:
+            Dict {"p50": ..., "p90": ...}, vide sans historique
+        """
+        durations = sorted(self.get_durations(operation, phase))
+        if not durations:
+            return {}
+        return {f"p{percentile:g}": _percentile(durations, percentile) for percentile in percentiles}
+
+    def estimate_eta(self, operation: str, elapsed: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Estime le temps restant d'une opération en cours
+
+        Args:
+            operation: Type d'opération
+            elapsed: Temps déjà écoulé depuis le début de l'opération
+
+        Returns:
+            Dict avec remaining_seconds, expected_seconds, samples ; None sans historique
+        """
+        durations = sorted(self.get_durations(operation))
+        if not durations:
+            return None
+
+        expected = _percentile(durations, self.eta_percentile)
+        return {
+            'remaining_seconds': max(0, int(round(expected - elapsed))),
+            'expected_seconds': expected,
+            'percentile': self.eta_percentile,
+            'samples': len(durations)
+        }
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Récupère les statistiques de l'historique
+
+        Returns:
+            Nombre d'opérations, taux de succès et percentiles par type d'opération
+        """
+        try:
+            rows = self.connection.execute(
+                "SELECT operation, COUNT(*), SUM(success) FROM operations GROUP BY operation"
+            ).fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Erreur lors de la lecture de l'historique: {e}")
+            return {'error': str(e)}
+
+        statistics = {'db_path': self.db_path, 'operations': {}}
+        for operation, count, successes in rows:
+            statistics['operations'][operation] = {
+                'count': count,
+                'success_rate': (successes or 0) / count,
+                'durations': self.get_percentiles(operation),
+                'phases': {
+                    phase: self.get_percentiles(operation, (50, 90), phase)
+                    for phase in self.PHASES
+                    if self.get_durations(operation, phase, limit=1)
+                }
+            }
+        return statistics
+
+    def close(self) -> None:
+        """Ferme la connexion à la base"""
+        self.connection.close()
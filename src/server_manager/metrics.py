@@ -0,0 +1,74 @@
+"""
+Métriques légères - Version Python natif
+Histogrammes de latence cumulatifs (format compatible Prometheus) sans dépendance externe
+"""
+
+import bisect
+from typing import Dict, Any, List, Tuple, Iterable
+
+
+class LatencyHistogram:
+    """
+    Histogramme de durées à seuils fixes
+
+    observe() est en O(log n) sur le nombre de seuils et n'alloue rien :
+    utilisable à chaque requête ou vérification
+    """
+
+    # Seuils par défaut (secondes) : requêtes réseau et vérifications de connectivité
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    # Seuils pour les opérations longues (démarrage, arrêt, redémarrage)
+    OPERATION_BUCKETS = (10, 30, 60, 120, 180, 240, 300, 420, 600, 900)
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets: Seuils supérieurs des intervalles (secondes)
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Enregistre une durée
+
+        Args:
+            value: Durée en secondes
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_buckets(self) -> List[Tuple[str, int]]:
+        """
+        Compteurs cumulés par seuil (dernier seuil : +Inf)
+
+        Returns:
+            Liste de (seuil, nombre d'observations <= seuil)
+        """
+        cumulative = []
+        total = 0
+        for bucket, count in zip(self.buckets, self.counts):
+            total += count
+            cumulative.append((f"{bucket:g}", total))
+        cumulative.append(("+Inf", self.count))
+        return cumulative
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Récupère les statistiques de l'histogramme
+
+        Returns:
+            Nombre d'observations, somme, moyenne et compteurs cumulés
+        """
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else None,
+            'buckets': dict(self.cumulative_buckets())
+        }
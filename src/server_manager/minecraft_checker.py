@@ -1,24 +1,237 @@
 """
 Module de vérification Minecraft natif Python
 Remplace le script PowerShell check-minecraft-bot.ps1
+Utilise le protocole Server List Ping (SLP) : le serveur n'est considéré
+disponible que lorsqu'il répond réellement à une requête de statut
 """
 
 import asyncio
-import socket
+import json
+import struct
+import time
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 import logging
 
 
+def _encode_varint(value: int) -> bytes:
+    """Encode un entier au format VarInt du protocole Minecraft"""
+    value &= 0xFFFFFFFF
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            encoded.append(byte | 0x80)
+        else:
+            encoded.append(byte)
+            return bytes(encoded)
+
+
+def _decode_varint(data: bytes, offset: int = 0) -> Tuple[int, int]:
+    """
+    Décode un VarInt depuis un buffer
+
+    Returns:
+        Tuple (valeur, nouvel offset)
+    """
+    value = 0
+    for position in range(5):
+        if offset >= len(data):
+            raise ValueError("VarInt tronqué")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << (7 * position)
+        if not byte & 0x80:
+            if value & 0x80000000:
+                value -= 1 << 32
+            return value, offset
+    raise ValueError("VarInt trop long")
+
+
+async def _read_varint(reader: asyncio.StreamReader) -> int:
+    """Lit un VarInt depuis le flux TCP"""
+    value = 0
+    for position in range(5):
+        byte = (await reader.readexactly(1))[0]
+        value |= (byte & 0x7F) << (7 * position)
+        if not byte & 0x80:
+            return value
+    raise ValueError("VarInt trop long")
+
+
+def _pack_packet(packet_id: int, payload: bytes = b'') -> bytes:
+    """Construit un paquet préfixé par sa longueur"""
+    body = _encode_varint(packet_id) + payload
+    return _encode_varint(len(body)) + body
+
+
+def _pack_string(value: str) -> bytes:
+    """Encode une chaîne au format du protocole (VarInt longueur + UTF-8)"""
+    encoded = value.encode('utf-8')
+    return _encode_varint(len(encoded)) + encoded
+
+
+def _flatten_motd(description: Any) -> str:
+    """Convertit la description (texte ou composant JSON) en texte brut"""
+    if isinstance(description, str):
+        return description
+    if isinstance(description, dict):
+        text = description.get('text', '')
+        for extra in description.get('extra', []) or []:
+            text += _flatten_motd(extra)
+        return text
+    if isinstance(description, list):
+        return ''.join(_flatten_motd(part) for part in description)
+    return ''
+
+
 class MinecraftChecker:
     """Vérificateur Minecraft natif Python"""
 
+    # Limite de taille d'une réponse de statut (protection contre un flux invalide)
+    MAX_STATUS_LENGTH = 65536
+
     def __init__(self, logger: logging.Logger):
         self.logger = logger
 
+    async def _status_ping(self, target_host: str, port: int, timeout_seconds: float) -> Dict[str, Any]:
+        """
+        Effectue un Server List Ping moderne (1.7+) : handshake, requête de statut puis ping/pong
+
+        Returns:
+            Informations du serveur (version, motd, joueurs, latence)
+        """
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(target_host, port),
+            timeout=timeout_seconds
+        )
+        try:
+            # Handshake (état suivant = 1 : statut) puis requête de statut
+            handshake = (_encode_varint(-1) + _pack_string(target_host) +
+                         struct.pack('>H', port) + _encode_varint(1))
+            writer.write(_pack_packet(0x00, handshake) + _pack_packet(0x00))
+            await writer.drain()
+
+            # Réponse de statut : longueur, id de paquet, chaîne JSON
+            length = await asyncio.wait_for(_read_varint(reader), timeout=timeout_seconds)
+            if length <= 0 or length > self.MAX_STATUS_LENGTH:
+                raise ValueError(f"Longueur de réponse invalide: {length}")
+            packet = await asyncio.wait_for(reader.readexactly(length), timeout=timeout_seconds)
+            packet_id, offset = _decode_varint(packet)
+            if packet_id != 0x00:
+                raise ValueError(f"Paquet de statut inattendu: {packet_id}")
+            json_length, offset = _decode_varint(packet, offset)
+            status = json.loads(packet[offset:offset + json_length].decode('utf-8'))
+
+            # Ping/pong pour mesurer la latence aller-retour
+            payload = int(time.time() * 1000)
+            ping_start = time.perf_counter()
+            writer.write(_pack_packet(0x01, struct.pack('>q', payload)))
+            await writer.drain()
+            latency_ms = None
+            try:
+                pong_length = await asyncio.wait_for(_read_varint(reader), timeout=timeout_seconds)
+                await asyncio.wait_for(reader.readexactly(pong_length), timeout=timeout_seconds)
+                latency_ms = (time.perf_counter() - ping_start) * 1000
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                # Certains serveurs ferment la connexion sans répondre au ping
+                pass
+
+            version = status.get('version', {}) or {}
+            players = status.get('players', {}) or {}
+            return {
+                "protocol": "slp",
+                "version": version.get('name'),
+                "protocol_version": version.get('protocol'),
+                "motd": _flatten_motd(status.get('description', '')),
+                "players_online": players.get('online', 0),
+                "players_max": players.get('max', 0),
+                "latency_ms": latency_ms
+            }
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _legacy_ping(self, target_host: str, port: int, timeout_seconds: float) -> Dict[str, Any]:
+        """
+        Effectue un Server List Ping legacy (format 1.6, compris par les anciens serveurs)
+
+        Returns:
+            Informations du serveur (version, motd, joueurs, latence)
+        """
+        start = time.perf_counter()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(target_host, port),
+            timeout=timeout_seconds
+        )
+        try:
+            host_bytes = target_host.encode('utf-16-be')
+            channel = 'MC|PingHost'.encode('utf-16-be')
+            plugin_data = (struct.pack('>B', 74) + struct.pack('>H', len(target_host)) +
+                           host_bytes + struct.pack('>I', port))
+            request = (b'\xfe\x01\xfa' + struct.pack('>H', len('MC|PingHost')) + channel +
+                       struct.pack('>H', len(plugin_data)) + plugin_data)
+            writer.write(request)
+            await writer.drain()
+
+            header = await asyncio.wait_for(reader.readexactly(3), timeout=timeout_seconds)
+            if header[0] != 0xFF:
+                raise ValueError("Réponse legacy invalide")
+            length = struct.unpack('>H', header[1:3])[0]
+            raw = await asyncio.wait_for(reader.readexactly(length * 2), timeout=timeout_seconds)
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            fields = raw.decode('utf-16-be').split('\x00')
+            if len(fields) < 6 or fields[0] != '\xa71':
+                raise ValueError("Format de réponse legacy non reconnu")
+            return {
+                "protocol": "legacy",
+                "version": fields[2],
+                "protocol_version": int(fields[1]) if fields[1].isdigit() else None,
+                "motd": fields[3],
+                "players_online": int(fields[4]) if fields[4].isdigit() else 0,
+                "players_max": int(fields[5]) if fields[5].isdigit() else 0,
+                "latency_ms": latency_ms
+            }
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def ping_server(self, target_host: str, port: int = 25565, timeout_seconds: float = 5) -> Dict[str, Any]:
+        """
+        Interroge le serveur Minecraft (SLP moderne puis legacy en repli)
+
+        Args:
+            target_host: Adresse IP du serveur Minecraft
+            port: Port Minecraft (défaut: 25565)
+            timeout_seconds: Timeout en secondes
+
+        Returns:
+            Informations du serveur (version, motd, joueurs, latence)
+
+        Raises:
+            asyncio.TimeoutError, OSError: serveur injoignable
+            ValueError: le port répond mais pas au protocole Minecraft
+        """
+        try:
+            return await self._status_ping(target_host, port, timeout_seconds)
+        except (ValueError, asyncio.IncompleteReadError, json.JSONDecodeError, UnicodeDecodeError) as e:
+            self.logger.debug(f"SLP moderne échoué pour {target_host}:{port} ({e}), essai legacy")
+            try:
+                return await self._legacy_ping(target_host, port, timeout_seconds)
+            except (asyncio.IncompleteReadError, UnicodeDecodeError, struct.error) as legacy_error:
+                raise ValueError(f"Réponse legacy invalide: {legacy_error}") from legacy_error
+
     async def check_minecraft_connectivity(self, target_host: str, port: int = 25565, timeout_seconds: int = 5) -> Dict[str, Any]:
         """
-        Vérifie la connectivité du serveur Minecraft
+        Vérifie la disponibilité du serveur Minecraft via Server List Ping
 
         Args:
             target_host: Adresse IP du serveur Minecraft
@@ -29,13 +242,7 @@ class MinecraftChecker:
             Dict avec success, message, timestamp, details
         """
         try:
-            # Test de connectivité TCP asynchrone
-            future = asyncio.open_connection(target_host, port)
-            reader, writer = await asyncio.wait_for(future, timeout=timeout_seconds)
-
-            # Fermeture de la connexion
-            writer.close()
-            await writer.wait_closed()
+            server_info = await self.ping_server(target_host, port, timeout_seconds)
 
             result = {
                 "success": True,
@@ -44,11 +251,16 @@ class MinecraftChecker:
                 "details": {
                     "target_host": target_host,
                     "port": port,
-                    "operation": "minecraft_check"
+                    "operation": "minecraft_check",
+                    **server_info
                 }
             }
 
-            self.logger.info(f"Minecraft {target_host}:{port} accessible")
+            latency = server_info.get('latency_ms')
+            latency_text = f"{latency:.0f}ms" if latency is not None else "n/a"
+            self.logger.info(f"Minecraft {target_host}:{port} accessible "
+                             f"({server_info.get('version')}, {server_info.get('players_online')}/"
+                             f"{server_info.get('players_max')} joueurs, {latency_text})")
             return result
 
         except asyncio.TimeoutError:
@@ -66,6 +278,23 @@ class MinecraftChecker:
             self.logger.warning(f"Minecraft {target_host}:{port} timeout")
             return result
 
+        except ValueError as e:
+            # Port ouvert mais le serveur ne répond pas encore au statut (monde en chargement)
+            result = {
+                "success": False,
+                "message": "Serveur Minecraft pas encore prêt",
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "error": str(e),
+                "details": {
+                    "target_host": target_host,
+                    "port": port,
+                    "operation": "minecraft_check"
+                }
+            }
+
+            self.logger.info(f"Minecraft {target_host}:{port} pas encore prêt: {e}")
+            return result
+
         except Exception as e:
             result = {
                 "success": False,
@@ -0,0 +1,214 @@
+"""
+Planificateur de vérifications adaptatif - Version Python natif
+Remplace les attentes fixes entre deux tests de disponibilité (démarrage/arrêt)
+"""
+
+import asyncio
+import random
+import statistics
+from collections import defaultdict, deque
+from typing import Dict, Any, Optional, Deque
+
+
+class ReadyTimeEstimator:
+    """
+    Estimation du temps de disponibilité à partir des opérations précédentes
+    Conserve les dernières durées observées par type d'opération (startup, shutdown...)
+    """
+
+    def __init__(self, max_samples: int = 20):
+        """
+        Args:
+            max_samples: Nombre de durées conservées par opération
+        """
+        self.max_samples = max_samples
+        self.samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.max_samples))
+
+    def record(self, operation: str, duration: float) -> None:
+        """
+        Enregistre la durée d'une opération réussie
+
+        Args:
+            operation: Type d'opération (startup, shutdown, restart)
+            duration: Durée en secondes
+        """
+        if duration > 0:
+            self.samples[operation].append(float(duration))
+
+    def expected(self, operation: str) -> Optional[float]:
+        """
+        Durée attendue d'une opération (médiane des dernières observations)
+
+        Args:
+            operation: Type d'opération
+
+        Returns:
+            Durée attendue en secondes, None sans historique
+        """
+        samples = self.samples.get(operation)
+        if not samples:
+            return None
+        return statistics.median(samples)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Récupère les statistiques de l'estimateur
+
+        Returns:
+            Nombre d'échantillons et durée attendue par opération
+        """
+        return {
+            operation: {
+                'samples': len(samples),
+                'expected_seconds': self.expected(operation)
+            }
+            for operation, samples in self.samples.items()
+        }
+
+
+class PollingScheduler:
+    """
+    Planificateur d'intervalles de vérification
+
+    - Backoff exponentiel ou Fibonacci entre initial_interval et max_interval
+    - Jitter aléatoire pour ne pas synchroniser les vérifications
+    - Phase rapide (fast_interval) autour du temps de disponibilité attendu
+    - Échéance stricte : aucune attente ne dépasse le timeout
+    """
+
+    STRATEGIES = ('exponential', 'fibonacci')
+
+    def __init__(self, timeout: float, initial_interval: float = 5.0, max_interval: float = 60.0,
+                 strategy: str = 'fibonacci', factor: float = 2.0, jitter: float = 0.1,
+                 expected_ready: Optional[float] = None, fast_window: float = 30.0,
+                 fast_interval: float = 5.0, start_time: Optional[float] = None,
+                 immediate_first: bool = False):
+        """
+        Args:
+            timeout: Échéance stricte en secondes depuis start_time
+            initial_interval: Premier intervalle de backoff (secondes)
+            max_interval: Intervalle maximal (secondes)
+            strategy: 'exponential' ou 'fibonacci'
+            factor: Facteur multiplicatif du backoff exponentiel
+            jitter: Variation aléatoire relative appliquée à chaque attente (0.1 = ±10%)
+            expected_ready: Temps de disponibilité attendu (secondes), None si inconnu
+            fast_window: Demi-largeur de la phase rapide autour de expected_ready
+            fast_interval: Intervalle utilisé pendant la phase rapide
+            start_time: Référence temporelle (loop.time()), maintenant par défaut
+            immediate_first: Première vérification sans attente
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Stratégie de polling inconnue: {strategy}")
+
+        self.timeout = timeout
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.strategy = strategy
+        self.factor = factor
+        self.jitter = jitter
+        self.expected_ready = expected_ready
+        self.fast_window = fast_window
+        self.fast_interval = fast_interval
+        self.immediate_first = immediate_first
+
+        self._loop = asyncio.get_event_loop()
+        self.start_time = start_time if start_time is not None else self._loop.time()
+        self.attempts = 0
+        self._backoff_step = 0
+        self._in_fast_phase = False
+
+    @classmethod
+    def from_config(cls, polling_config: Dict[str, Any], timeout: float, **kwargs) -> 'PollingScheduler':
+        """
+        Construit un planificateur depuis la section polling de bot.yaml
+
+        Args:
+            polling_config: Configuration du polling
+            timeout: Échéance stricte (secondes)
+            **kwargs: Paramètres supplémentaires (expected_ready, start_time...)
+
+        Returns:
+            Planificateur configuré
+        """
+        polling_config = polling_config or {}
+        params = {
+            key: polling_config[key]
+            for key in ('initial_interval', 'max_interval', 'strategy', 'factor',
+                        'jitter', 'fast_window', 'fast_interval')
+            if key in polling_config
+        }
+        params.update(kwargs)
+        return cls(timeout, **params)
+
+    @property
+    def elapsed(self) -> float:
+        """Temps écoulé depuis start_time (secondes)"""
+        return self._loop.time() - self.start_time
+
+    @property
+    def remaining(self) -> float:
+        """Temps restant avant l'échéance (secondes)"""
+        return max(0.0, self.timeout - self.elapsed)
+
+    def _backoff_interval(self, step: int) -> float:
+        """Intervalle de backoff pour une étape donnée"""
+        if self.strategy == 'fibonacci':
+            previous, current = 0, 1
+            for _ in range(step):
+                previous, current = current, previous + current
+                if current * self.initial_interval >= self.max_interval:
+                    break
+            interval = current * self.initial_interval
+        else:
+            interval = self.initial_interval * (self.factor ** min(step, 32))
+        return min(interval, self.max_interval)
+
+    def next_delay(self) -> float:
+        """
+        Calcule la prochaine attente en tenant compte de la phase rapide et de l'échéance
+
+        Returns:
+            Attente en secondes (0 si l'échéance est atteinte)
+        """
+        elapsed = self.elapsed
+
+        if self.expected_ready is not None:
+            fast_start = self.expected_ready - self.fast_window
+            fast_end = self.expected_ready + self.fast_window
+
+            if fast_start <= elapsed <= fast_end:
+                self._in_fast_phase = True
+                delay = self.fast_interval
+            else:
+                if self._in_fast_phase:
+                    # Sortie de la phase rapide : le backoff repart de zéro
+                    self._in_fast_phase = False
+                    self._backoff_step = 0
+                delay = self._backoff_interval(self._backoff_step)
+                self._backoff_step += 1
+                if elapsed < fast_start:
+                    # Ne pas dépasser le début de la phase rapide
+                    delay = min(delay, fast_start - elapsed)
+        else:
+            delay = self._backoff_interval(self._backoff_step)
+            self._backoff_step += 1
+
+        if self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+
+        return max(0.0, min(delay, self.remaining))
+
+    async def wait(self) -> bool:
+        """
+        Attend jusqu'à la prochaine vérification
+
+        Returns:
+            True si une vérification doit être faite, False si l'échéance est atteinte
+        """
+        if self.remaining <= 0:
+            return False
+
+        if not (self.immediate_first and self.attempts == 0):
+            await asyncio.sleep(self.next_delay())
+        self.attempts += 1
+        return True
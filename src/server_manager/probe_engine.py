@@ -0,0 +1,166 @@
+"""
+Exécution concurrente des vérifications - Version Python natif
+Les vérifications demandées sont lancées en parallèle ; une vérification identique déjà
+en cours est partagée entre les appelants au lieu d'être relancée, et son résultat est
+conservé pendant une courte durée (invalidé explicitement lors des changements d'état)
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, Awaitable, Tuple
+import logging
+
+from .metrics import LatencyHistogram
+
+
+@dataclass
+class ReadinessSnapshot:
+    """Résultats d'un ensemble de vérifications lancées ensemble"""
+    results: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    started_at: float = 0.0
+    duration: float = 0.0
+
+    def ok(self, probe: str) -> bool:
+        """Indique si une vérification a réussi"""
+        return bool(self.results.get(probe, {}).get('success'))
+
+    def get(self, probe: str) -> Dict[str, Any]:
+        """Résultat d'une vérification (dict vide si elle n'a pas été lancée)"""
+        return self.results.get(probe, {})
+
+
+class ProbeEngine:
+    """
+    Moteur de vérifications
+
+    Chaque vérification est une coroutine enregistrée sous un nom et renvoyant un dict
+    avec au moins la clé success (format des gestionnaires de serveurs)
+    """
+
+    def __init__(self, logger: logging.Logger):
+        """
+        Args:
+            logger: Logger à utiliser
+        """
+        self.logger = logger
+        self._probes: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]] = {}
+        self._ttl: Dict[str, float] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+        # Cache : nom -> (expiration, résultat) ; la génération change à chaque invalidation
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._generation: Dict[str, int] = defaultdict(int)
+
+        # Statistiques : exécutions réelles, appels partagés, réponses du cache, latence
+        self.executions: Dict[str, int] = defaultdict(int)
+        self.coalesced: Dict[str, int] = defaultdict(int)
+        self.cache_hits: Dict[str, int] = defaultdict(int)
+        self.latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+
+    def register(self, name: str, probe: Callable[[], Awaitable[Dict[str, Any]]], ttl: float = 0.0) -> None:
+        """
+        Enregistre une vérification
+
+        Args:
+            name: Nom de la vérification (proxmox, proxmox_api, lxc, minecraft...)
+            probe: Coroutine sans argument renvoyant un dict avec success
+            ttl: Durée de conservation du résultat (secondes, 0 = aucun cache)
+        """
+        self._probes[name] = probe
+        self._ttl[name] = ttl
+
+    async def _execute(self, name: str) -> Dict[str, Any]:
+        """Exécute une vérification (les exceptions deviennent un résultat en échec)"""
+        generation = self._generation[name]
+        start = time.perf_counter()
+        try:
+            result = await self._probes[name]()
+        except Exception as e:
+            self.logger.warning(f"Vérification {name} en erreur: {e}")
+            result = {'success': False, 'error': str(e)}
+        finally:
+            self.executions[name] += 1
+            self.latency[name].observe(time.perf_counter() - start)
+
+        # Un résultat obtenu avant une invalidation n'est pas conservé
+        if self._ttl[name] > 0 and generation == self._generation[name]:
+            self._cache[name] = (time.monotonic() + self._ttl[name], result)
+        return result
+
+    async def probe(self, name: str) -> Dict[str, Any]:
+        """
+        Renvoie le résultat en cache, rejoint la vérification en cours ou en lance une
+
+        Args:
+            name: Nom de la vérification
+
+        Returns:
+            Résultat de la vérification
+        """
+        cached = self._cache.get(name)
+        if cached is not None and time.monotonic() < cached[0]:
+            self.cache_hits[name] += 1
+            return dict(cached[1])
+
+        task = self._in_flight.get(name)
+        if task is None:
+            task = asyncio.create_task(self._execute(name), name=f"probe-{name}")
+            self._in_flight[name] = task
+            task.add_done_callback(lambda done: self._in_flight.pop(name, None)
+                                   if self._in_flight.get(name) is done else None)
+        else:
+            self.coalesced[name] += 1
+
+        # shield : l'annulation d'un appelant n'interrompt pas la vérification partagée
+        return dict(await asyncio.shield(task))
+
+    def invalidate(self, *names: str) -> None:
+        """
+        Oublie les résultats en cache (changement d'état, action sur le serveur)
+
+        Les vérifications en cours ne sont plus partagées : l'appel suivant en relance une
+
+        Args:
+            *names: Vérifications à invalider (toutes si vide)
+        """
+        for name in names or tuple(self._probes):
+            self._generation[name] += 1
+            self._cache.pop(name, None)
+            self._in_flight.pop(name, None)
+
+    async def snapshot(self, *names: str) -> ReadinessSnapshot:
+        """
+        Lance plusieurs vérifications en parallèle
+
+        Args:
+            *names: Vérifications à lancer (toutes les vérifications enregistrées si vide)
+
+        Returns:
+            Résultats de l'ensemble des vérifications
+        """
+        names = names or tuple(self._probes)
+        started_at = time.time()
+        start = time.perf_counter()
+        results = await asyncio.gather(*(self.probe(name) for name in names))
+        return ReadinessSnapshot(dict(zip(names, results)), started_at, time.perf_counter() - start)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Récupère les statistiques des vérifications
+
+        Returns:
+            Exécutions, appels partagés et latence par vérification
+        """
+        return {
+            name: {
+                'executions': self.executions[name],
+                'coalesced': self.coalesced[name],
+                'cache_hits': self.cache_hits[name],
+                'ttl': self._ttl[name],
+                'in_flight': name in self._in_flight,
+                'latency': self.latency[name].get_statistics()
+            }
+            for name in self._probes
+        }
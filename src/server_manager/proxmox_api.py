@@ -4,35 +4,30 @@ Remplace le module SSH pour la gestion des VMs via l'API REST
 """
 
 import asyncio
-import aiohttp
-import ssl
 from datetime import datetime
 from typing import Dict, Any, Optional
 import logging
 
+from .proxmox_client import ProxmoxHTTPClient
+
 
 class ProxmoxAPI:
     """Client API REST Proxmox natif Python"""
 
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, http_client: Optional[ProxmoxHTTPClient] = None):
         self.logger = logger
-        self.session = None
+        # Client HTTP partagé (pool keep-alive) ou client dédié si aucun n'est fourni
+        self._owns_client = http_client is None
+        self.http_client = http_client or ProxmoxHTTPClient(logger)
 
     async def __aenter__(self):
         """Contexte manager pour la session HTTP"""
-        # Configuration SSL pour ignorer les certificats auto-signés
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
-        self.session = aiohttp.ClientSession(connector=connector)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Fermeture de la session HTTP"""
-        if self.session:
-            await self.session.close()
+        """Fermeture de la session HTTP (uniquement si le client n'est pas partagé)"""
+        if self._owns_client:
+            await self.http_client.close()
 
     async def _make_request(self, method: str, url: str, headers: Dict[str, str] = None, 
                           data: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -48,65 +43,7 @@ class ProxmoxAPI:
         Returns:
             Réponse de l'API
         """
-        try:
-            # Utiliser form data si Content-Type est application/x-www-form-urlencoded
-            if headers and headers.get("Content-Type") == "application/x-www-form-urlencoded":
-                async with self.session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    data=data,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return {
-                            "success": True,
-                            "data": result.get("data", result),
-                            "status": response.status
-                        }
-                    else:
-                        error_text = await response.text()
-                        return {
-                            "success": False,
-                            "error": f"HTTP {response.status}: {error_text}",
-                            "status": response.status
-                        }
-            else:
-                async with self.session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=data,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return {
-                            "success": True,
-                            "data": result.get("data", result),
-                            "status": response.status
-                        }
-                    else:
-                        error_text = await response.text()
-                        return {
-                            "success": False,
-                            "error": f"HTTP {response.status}: {error_text}",
-                            "status": response.status
-                        }
-                    
-        except asyncio.TimeoutError:
-            return {
-                "success": False,
-                "error": "Timeout de la requête API",
-                "status": 408
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Erreur de connexion: {str(e)}",
-                "status": 0
-            }
+        return await self.http_client.request(method, url, headers, data)
 
     async def get_vm_status(self, api_url: str, token_id: str, token_secret: str, 
                           vm_id: str, node_name: str = "pve") -> Dict[str, Any]:
@@ -279,3 +216,210 @@ class ProxmoxAPI:
             }
         else:
             return result
+
+    async def _guest_status_action(self, api_url: str, token_id: str, token_secret: str,
+                                   guest_id: str, action: str, node_name: str = "pve",
+                                   guest_type: str = "lxc") -> Dict[str, Any]:
+        """
+        Déclenche une action de statut sur un conteneur LXC ou une VM QEMU (start, shutdown, stop...)
+        
+        Args:
+            api_url: URL de l'API Proxmox
+            token_id: ID du token API
+            token_secret: Secret du token API
+            guest_id: ID du conteneur LXC ou de la VM
+            action: Action Proxmox (start, shutdown, stop, reboot)
+            node_name: Nom du nœud Proxmox
+            guest_type: Type d'invité Proxmox (lxc ou qemu)
+            
+        Returns:
+            Résultat avec l'UPID de la tâche Proxmox créée
+        """
+        url = f"{api_url}/nodes/{node_name}/{guest_type}/{guest_id}/status/{action}"
+        headers = {
+            "Authorization": f"PVEAPIToken={token_id}={token_secret}",
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
+        
+        result = await self._make_request("POST", url, headers)
+        
+        if result["success"]:
+            # Proxmox renvoie l'UPID de la tâche asynchrone dans "data"
+            upid = result["data"] if isinstance(result["data"], str) else None
+            self.logger.info(f"{guest_type.upper()} {guest_id}: action {action} lancée (UPID: {upid})")
+            return {
+                "success": True,
+                "upid": upid,
+                "container_id": guest_id,
+                "action": action,
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+        else:
+            self.logger.error(f"Échec de l'action {action} sur {guest_type.upper()} {guest_id}: {result.get('error')}")
+            return result
+
+    async def start_lxc(self, api_url: str, token_id: str, token_secret: str,
+                        container_id: str, node_name: str = "pve") -> Dict[str, Any]:
+        """
+        Démarre un conteneur LXC
+        
+        Returns:
+            Résultat avec l'UPID de la tâche de démarrage
+        """
+        return await self.start_guest(api_url, token_id, token_secret, container_id, node_name, "lxc")
+
+    async def shutdown_lxc(self, api_url: str, token_id: str, token_secret: str,
+                           container_id: str, node_name: str = "pve") -> Dict[str, Any]:
+        """
+        Arrête proprement un conteneur LXC
+        
+        Returns:
+            Résultat avec l'UPID de la tâche d'arrêt
+        """
+        return await self.shutdown_guest(api_url, token_id, token_secret, container_id, node_name, "lxc")
+
+    async def start_guest(self, api_url: str, token_id: str, token_secret: str,
+                          guest_id: str, node_name: str = "pve", guest_type: str = "lxc") -> Dict[str, Any]:
+        """
+        Démarre un conteneur LXC ou une VM QEMU
+        
+        Returns:
+            Résultat avec l'UPID de la tâche de démarrage
+        """
+        return await self._guest_status_action(api_url, token_id, token_secret, guest_id, "start",
+                                               node_name, guest_type)
+
+    async def shutdown_guest(self, api_url: str, token_id: str, token_secret: str,
+                             guest_id: str, node_name: str = "pve", guest_type: str = "lxc") -> Dict[str, Any]:
+        """
+        Arrête proprement un conteneur LXC ou une VM QEMU
+        
+        Returns:
+            Résultat avec l'UPID de la tâche d'arrêt
+        """
+        return await self._guest_status_action(api_url, token_id, token_secret, guest_id, "shutdown",
+                                               node_name, guest_type)
+
+    async def get_guest_status(self, api_url: str, token_id: str, token_secret: str,
+                               guest_id: str, node_name: str = "pve", guest_type: str = "lxc") -> Dict[str, Any]:
+        """
+        Récupère le statut d'un conteneur LXC ou d'une VM QEMU
+        
+        Args:
+            api_url: URL de l'API Proxmox
+            token_id: ID du token API
+            token_secret: Secret du token API
+            guest_id: ID du conteneur ou de la VM
+            node_name: Nom du nœud Proxmox
+            guest_type: Type d'invité Proxmox (lxc ou qemu)
+            
+        Returns:
+            Statut de l'invité (running, stopped...)
+        """
+        url = f"{api_url}/nodes/{node_name}/{guest_type}/{guest_id}/status/current"
+        headers = {
+            "Authorization": f"PVEAPIToken={token_id}={token_secret}"
+        }
+        
+        result = await self._make_request("GET", url, headers)
+        
+        if result["success"]:
+            guest_data = result["data"] or {}
+            return {
+                "success": True,
+                "guest_id": guest_id,
+                "guest_type": guest_type,
+                "status": guest_data.get("status", "unknown"),
+                "uptime": guest_data.get("uptime", 0)
+            }
+        else:
+            return result
+
+    async def get_task_status(self, api_url: str, token_id: str, token_secret: str,
+                              upid: str, node_name: str = "pve") -> Dict[str, Any]:
+        """
+        Récupère le statut d'une tâche Proxmox
+        
+        Args:
+            api_url: URL de l'API Proxmox
+            token_id: ID du token API
+            token_secret: Secret du token API
+            upid: Identifiant de la tâche (UPID)
+            node_name: Nom du nœud Proxmox
+            
+        Returns:
+            Statut de la tâche (running/stopped) et code de sortie
+        """
+        url = f"{api_url}/nodes/{node_name}/tasks/{upid}/status"
+        headers = {
+            "Authorization": f"PVEAPIToken={token_id}={token_secret}"
+        }
+        
+        result = await self._make_request("GET", url, headers)
+        
+        if result["success"]:
+            task_data = result["data"] or {}
+            return {
+                "success": True,
+                "upid": upid,
+                "status": task_data.get("status", "unknown"),
+                "exitstatus": task_data.get("exitstatus")
+            }
+        else:
+            return result
+
+    async def wait_for_task(self, api_url: str, token_id: str, token_secret: str, upid: str,
+                            node_name: str = "pve", timeout: float = 120,
+                            initial_interval: float = 0.5, max_interval: float = 5.0) -> Dict[str, Any]:
+        """
+        Attend la fin d'une tâche Proxmox en suivant son UPID
+        
+        L'intervalle entre deux requêtes démarre court puis augmente (x1.5) jusqu'à
+        max_interval : les tâches rapides sont détectées immédiatement sans
+        multiplier les appels pour les tâches longues.
+        
+        Args:
+            api_url: URL de l'API Proxmox
+            token_id: ID du token API
+            token_secret: Secret du token API
+            upid: Identifiant de la tâche (UPID)
+            node_name: Nom du nœud Proxmox
+            timeout: Durée maximale d'attente (secondes)
+            initial_interval: Premier intervalle entre deux requêtes (secondes)
+            max_interval: Intervalle maximal entre deux requêtes (secondes)
+            
+        Returns:
+            Dict avec success, exitstatus, elapsed, polls
+        """
+        loop = asyncio.get_event_loop()
+        start_time = loop.time()
+        interval = initial_interval
+        polls = 0
+        
+        while True:
+            polls += 1
+            task_result = await self.get_task_status(api_url, token_id, token_secret, upid, node_name)
+            elapsed = loop.time() - start_time
+            
+            if task_result["success"] and task_result["status"] == "stopped":
+                exitstatus = task_result.get("exitstatus")
+                return {
+                    "success": exitstatus == "OK",
+                    "upid": upid,
+                    "exitstatus": exitstatus,
+                    "error": None if exitstatus == "OK" else f"Tâche terminée en erreur: {exitstatus}",
+                    "elapsed": elapsed,
+                    "polls": polls
+                }
+            
+            if elapsed + interval > timeout:
+                return {
+                    "success": False,
+                    "upid": upid,
+                    "error": f"Tâche non terminée après {timeout}s",
+                    "elapsed": elapsed,
+                    "polls": polls
+                }
+            
+            await asyncio.sleep(interval)
+            interval = min(interval * 1.5, max_interval)
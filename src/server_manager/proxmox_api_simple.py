@@ -3,17 +3,28 @@ API Proxmox simplifiée pour l'arrêt du nœud
 Version simplifiée qui utilise uniquement l'arrêt du nœud
 """
 
-import aiohttp
-import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from .proxmox_client import ProxmoxHTTPClient
 
 class ProxmoxAPISimple:
     """API Proxmox simplifiée pour l'arrêt du nœud"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[ProxmoxHTTPClient] = None):
+        """
+        Args:
+            http_client: Client HTTP Proxmox partagé (un client dédié est créé si absent)
+        """
         self.logger = logging.getLogger('CubeGuardian.ProxmoxAPISimple')
+        self._owns_client = http_client is None
+        self.http_client = http_client or ProxmoxHTTPClient(self.logger)
+    
+    async def close(self) -> None:
+        """Ferme la session HTTP (uniquement si le client n'est pas partagé)"""
+        if self._owns_client:
+            await self.http_client.close()
     
     async def shutdown_node_simple(self, api_url: str, token_id: str, token_secret: str, node_name: str, timeout: int = 300) -> Dict[str, Any]:
         """
@@ -43,38 +54,32 @@ class ProxmoxAPISimple:
                 "command": "shutdown"
             }
             
-            async with aiohttp.ClientSession(
-                connector=aiohttp.TCPConnector(ssl=False),
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as session:
-                async with session.post(url, headers=headers, data=data) as response:
-                    if response.status == 200:
-                        result_data = await response.json()
-                        self.logger.info(f"Nœud {node_name} arrêté avec succès")
-                        return {
-                            "success": True,
-                            "message": f"Nœud {node_name} arrêté",
-                            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            "details": {
-                                "node_name": node_name,
-                                "timeout": timeout,
-                                "response": result_data
-                            }
-                        }
-                    else:
-                        error_text = await response.text()
-                        self.logger.error(f"Échec de l'arrêt du nœud {node_name}: HTTP {response.status}")
-                        return {
-                            "success": False,
-                            "error": f"HTTP {response.status}: {error_text}",
-                            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            "details": {
-                                "node_name": node_name,
-                                "timeout": timeout,
-                                "status_code": response.status,
-                                "response": error_text
-                            }
-                        }
+            response = await self.http_client.request("POST", url, headers, data)
+            if response['success']:
+                self.logger.info(f"Nœud {node_name} arrêté avec succès")
+                return {
+                    "success": True,
+                    "message": f"Nœud {node_name} arrêté",
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "details": {
+                        "node_name": node_name,
+                        "timeout": timeout,
+                        "response": {"data": response['data']}
+                    }
+                }
+            else:
+                self.logger.error(f"Échec de l'arrêt du nœud {node_name}: HTTP {response['status']}")
+                return {
+                    "success": False,
+                    "error": response['error'],
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "details": {
+                        "node_name": node_name,
+                        "timeout": timeout,
+                        "status_code": response['status'],
+                        "response": response['error']
+                    }
+                }
                         
         except Exception as e:
             self.logger.error(f"Erreur lors de l'arrêt du nœud {node_name}: {e}")
@@ -109,25 +114,19 @@ class ProxmoxAPISimple:
                 "Content-Type": "application/x-www-form-urlencoded"
             }
             
-            async with aiohttp.ClientSession(
-                connector=aiohttp.TCPConnector(ssl=False),
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            "success": True,
-                            "data": data['data'],
-                            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        }
-                    else:
-                        error_text = await response.text()
-                        return {
-                            "success": False,
-                            "error": f"HTTP {response.status}: {error_text}",
-                            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        }
+            response = await self.http_client.request("GET", url, headers)
+            if response['success']:
+                return {
+                    "success": True,
+                    "data": response['data'],
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": response['error'],
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                }
                         
         except Exception as e:
             return {
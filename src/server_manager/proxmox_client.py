@@ -0,0 +1,205 @@
+"""
+Client HTTP Proxmox partagé - Version Python natif
+Session aiohttp unique avec pool de connexions keep-alive pour tous les appels API
+"""
+
+import asyncio
+import aiohttp
+import ssl
+import time
+from collections import defaultdict
+from typing import Dict, Any, Optional
+import logging
+
+from .metrics import LatencyHistogram
+
+
+class ProxmoxHTTPClient:
+    """
+    Client HTTP partagé vers l'API REST Proxmox
+    Une seule session longue durée : les connexions TLS vers :8006 sont réutilisées
+    entre les appels au lieu d'un nouveau handshake à chaque requête
+    """
+
+    def __init__(self, logger: logging.Logger, pool_size: int = 4, idle_timeout: float = 60.0,
+                 verify_ssl: bool = False, request_timeout: float = 30.0):
+        """
+        Initialise le client HTTP partagé
+
+        Args:
+            logger: Logger à utiliser
+            pool_size: Nombre maximum de connexions simultanées vers Proxmox
+            idle_timeout: Durée (secondes) de conservation d'une connexion inactive
+            verify_ssl: Vérifier le certificat SSL (False pour certificat auto-signé)
+            request_timeout: Timeout par défaut d'une requête (secondes)
+        """
+        self.logger = logger
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.verify_ssl = verify_ssl
+        self.request_timeout = request_timeout
+
+        self.session: Optional[aiohttp.ClientSession] = None
+
+        # Statistiques de réutilisation des connexions
+        self.requests_count = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        
+        # Latence des requêtes par méthode HTTP
+        self.latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+
+    @classmethod
+    def from_config(cls, proxmox_config: Dict[str, Any], logger: logging.Logger) -> 'ProxmoxHTTPClient':
+        """
+        Construit le client depuis la section proxmox de servers.yaml
+
+        Args:
+            proxmox_config: Configuration du serveur Proxmox
+            logger: Logger à utiliser
+
+        Returns:
+            Client HTTP configuré
+        """
+        pool_config = proxmox_config.get('http_pool', {}) or {}
+        return cls(
+            logger,
+            pool_size=pool_config.get('pool_size', 4),
+            idle_timeout=pool_config.get('idle_timeout', 60),
+            verify_ssl=pool_config.get('verify_ssl', False),
+            request_timeout=pool_config.get('request_timeout', 30)
+        )
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Crée la session HTTP avec le pool de connexions et le suivi des handshakes"""
+        if self.verify_ssl:
+            ssl_context = ssl.create_default_context()
+        else:
+            # Configuration SSL pour ignorer les certificats auto-signés
+            ssl_context = ssl.create_default_context()
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+
+        connector = aiohttp.TCPConnector(
+            ssl=ssl_context,
+            limit=self.pool_size,
+            keepalive_timeout=self.idle_timeout
+        )
+
+        self.logger.debug(f"Session HTTP Proxmox créée (pool={self.pool_size}, idle={self.idle_timeout}s)")
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            trace_configs=[trace_config]
+        )
+
+    async def _on_connection_created(self, session, context, params) -> None:
+        """Trace aiohttp : nouvelle connexion TCP/TLS ouverte"""
+        self.connections_created += 1
+
+    async def _on_connection_reused(self, session, context, params) -> None:
+        """Trace aiohttp : connexion keep-alive réutilisée (handshake évité)"""
+        self.connections_reused += 1
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Récupère la session partagée (créée à la première utilisation)
+
+        Returns:
+            Session aiohttp partagée
+        """
+        if self.session is None or self.session.closed:
+            self.session = self._create_session()
+        return self.session
+
+    async def request(self, method: str, url: str, headers: Dict[str, str] = None,
+                      data: Dict[str, Any] = None, timeout: float = None) -> Dict[str, Any]:
+        """
+        Effectue une requête HTTP vers l'API Proxmox via la session partagée
+
+        Args:
+            method: Méthode HTTP (GET, POST, PUT, DELETE)
+            url: URL de la requête
+            headers: En-têtes HTTP
+            data: Données à envoyer
+            timeout: Timeout spécifique à la requête (secondes)
+
+        Returns:
+            Dict avec success, data/error, status
+        """
+        session = self.get_session()
+        self.requests_count += 1
+
+        request_kwargs = {
+            'method': method,
+            'url': url,
+            'headers': headers,
+            'timeout': aiohttp.ClientTimeout(total=timeout or self.request_timeout)
+        }
+        # Utiliser form data si Content-Type est application/x-www-form-urlencoded
+        if headers and headers.get("Content-Type") == "application/x-www-form-urlencoded":
+            request_kwargs['data'] = data
+        elif data is not None:
+            request_kwargs['json'] = data
+
+        start = time.perf_counter()
+        try:
+            async with session.request(**request_kwargs) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    return {
+                        "success": True,
+                        "data": result.get("data", result),
+                        "status": response.status
+                    }
+                else:
+                    error_text = await response.text()
+                    return {
+                        "success": False,
+                        "error": f"HTTP {response.status}: {error_text}",
+                        "status": response.status
+                    }
+
+        except asyncio.TimeoutError:
+            return {
+                "success": False,
+                "error": "Timeout de la requête API",
+                "status": 408
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Erreur de connexion: {str(e)}",
+                "status": 0
+            }
+        finally:
+            self.latency[method.upper()].observe(time.perf_counter() - start)
+
+    async def close(self) -> None:
+        """Ferme la session partagée et toutes les connexions du pool"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+            self.logger.info(f"Session HTTP Proxmox fermée ({self.connections_reused} handshakes évités)")
+        self.session = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Récupère les statistiques du pool de connexions
+
+        Returns:
+            Statistiques de réutilisation des connexions
+        """
+        return {
+            'pool_size': self.pool_size,
+            'idle_timeout': self.idle_timeout,
+            'requests_count': self.requests_count,
+            'connections_created': self.connections_created,
+            'connections_reused': self.connections_reused,
+            'handshakes_saved': self.connections_reused,
+            'session_open': self.session is not None and not self.session.closed,
+            'latency': {method: histogram.get_statistics() for method, histogram in self.latency.items()}
+        }
@@ -5,36 +5,42 @@ Unifie tous les sous-modules pour remplacer les scripts PowerShell
 
 import asyncio
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 
 from .wake_on_lan import WakeOnLANManager
 from .ssh_manager import SSHManager
 from .proxmox_api import ProxmoxAPI
+from .proxmox_client import ProxmoxHTTPClient
 from .connectivity_checker import ConnectivityChecker
 from .minecraft_checker import MinecraftChecker
+from .polling_scheduler import PollingScheduler
 
 
 class ServerManager:
     """Gestionnaire de serveurs unifié - Version Python natif"""
 
-    def __init__(self, config: dict, logger: logging.Logger):
+    def __init__(self, config: dict, logger: logging.Logger, http_client: Optional[ProxmoxHTTPClient] = None):
         self.config = config
         self.logger = logger
 
         # Initialisation des sous-modules
-        self.wake_on_lan = WakeOnLANManager(logger)
-        self.ssh_manager = SSHManager(logger)
-        self.proxmox_api = ProxmoxAPI(logger)
+        self.wake_on_lan = WakeOnLANManager.from_config(config.get('proxmox', {}), logger)
+        self.ssh_manager = SSHManager.from_config(config.get('proxmox', {}), logger)
+        self.proxmox_api = ProxmoxAPI(logger, http_client)
         self.connectivity_checker = ConnectivityChecker(logger)
         self.minecraft_checker = MinecraftChecker(logger)
 
     async def wake_server(self, mac_address: str = None, target_host: str = None) -> Dict[str, Any]:
-        """Wake-on-LAN du serveur Proxmox"""
+        """Wake-on-LAN du serveur Proxmox (rafales renvoyées jusqu'à ce que le port 8006 réponde)"""
         mac_address = mac_address or self.config['proxmox']['mac_address']
         target_host = target_host or self.config['proxmox']['ipv4']
 
-        return await self.wake_on_lan.wake_server(mac_address, target_host)
+        async def proxmox_reachable() -> bool:
+            result = await self.connectivity_checker.check_proxmox_connectivity(target_host, timeout_seconds=2)
+            return result['success']
+
+        return await self.wake_on_lan.wake_server(mac_address, target_host, verify=proxmox_reachable)
 
     async def shutdown_server(self, delay_seconds: int = 0) -> Dict[str, Any]:
         """Arrêt simple du nœud Proxmox via API REST (Proxmox gère automatiquement l'arrêt des conteneurs)"""
@@ -58,11 +64,34 @@ class ServerManager:
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
 
-    async def check_proxmox_status(self, target_host: str = None) -> Dict[str, Any]:
+    async def run_remote_command(self, command: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Exécution d'une commande sur le nœud Proxmox via le pool SSH"""
+        proxmox = self.config['proxmox']
+        return await self.ssh_manager.run_command(proxmox['ipv4'], proxmox['ssh_user'],
+                                                  proxmox['ssh_key_path'], command, timeout=timeout)
+
+    async def check_remote_health(self) -> Dict[str, Any]:
+        """Charge, uptime et mémoire du nœud Proxmox via SSH (commandes en parallèle)"""
+        proxmox = self.config['proxmox']
+        return await self.ssh_manager.check_remote_health(proxmox['ipv4'], proxmox['ssh_user'],
+                                                          proxmox['ssh_key_path'])
+
+    async def close(self) -> None:
+        """Arrête les renvois Wake-on-LAN et ferme les connexions SSH conservées"""
+        await self.wake_on_lan.close()
+        await self.ssh_manager.close()
+
+    async def check_proxmox_status(self, target_host: str = None, timeout_seconds: int = 10) -> Dict[str, Any]:
         """Vérification de la connectivité Proxmox via ping (simple et fiable)"""
         target_host = target_host or self.config['proxmox']['ipv4']
         
-        return await self.connectivity_checker.check_proxmox_connectivity(target_host)
+        return await self.connectivity_checker.check_proxmox_connectivity(target_host, timeout_seconds)
+
+    async def check_node_status(self) -> Dict[str, Any]:
+        """Statut du nœud Proxmox via l'API REST (pveproxy démarré et authentification valide)"""
+        proxmox = self.config['proxmox']
+        return await self.proxmox_api.get_node_status(proxmox['api_url'], proxmox['api_token_id'],
+                                                      proxmox['api_token_secret'], proxmox['node_name'])
 
     async def check_minecraft_status(self, target_host: str = None, port: int = None) -> Dict[str, Any]:
         """Vérification de la connectivité Minecraft"""
@@ -71,39 +100,37 @@ class ServerManager:
 
         return await self.minecraft_checker.check_minecraft_connectivity(target_host, port)
 
-    async def wait_for_startup(self, timeout: int = 600) -> bool:
-        """Attend que le serveur soit disponible"""
-        start_time = asyncio.get_event_loop().time()
+    async def wait_for_startup(self, timeout: int = 600, expected_ready: Optional[float] = None) -> bool:
+        """Attend que le serveur soit disponible (intervalles adaptatifs)"""
+        scheduler = PollingScheduler(timeout, initial_interval=2, max_interval=10,
+                                     expected_ready=expected_ready, immediate_first=True)
 
-        while (asyncio.get_event_loop().time() - start_time) < timeout:
+        while await scheduler.wait():
             # Vérifier Proxmox
             proxmox_result = await self.check_proxmox_status()
             if proxmox_result['success']:
                 # Vérifier Minecraft
                 minecraft_result = await self.check_minecraft_status()
                 if minecraft_result['success']:
-                    self.logger.info("Serveur complètement opérationnel")
+                    self.logger.info(f"Serveur complètement opérationnel ({scheduler.elapsed:.0f}s, "
+                                     f"{scheduler.attempts} vérifications)")
                     return True
 
-            # Attendre 10 secondes avant la prochaine vérification
-            await asyncio.sleep(10)
-
         self.logger.error(f"Timeout d'attente du démarrage ({timeout}s)")
         return False
 
-    async def wait_for_shutdown(self, timeout: int = 60) -> bool:
-        """Attend que le serveur soit arrêté"""
-        start_time = asyncio.get_event_loop().time()
+    async def wait_for_shutdown(self, timeout: int = 60, expected_ready: Optional[float] = None) -> bool:
+        """Attend que le serveur soit arrêté (intervalles adaptatifs)"""
+        scheduler = PollingScheduler(timeout, initial_interval=1, max_interval=5,
+                                     expected_ready=expected_ready, fast_window=5, fast_interval=1,
+                                     immediate_first=True)
 
-        while (asyncio.get_event_loop().time() - start_time) < timeout:
+        while await scheduler.wait():
             # Vérifier que Proxmox n'est plus accessible
             proxmox_result = await self.check_proxmox_status()
             if not proxmox_result['success']:
-                self.logger.info("Serveur arrêté avec succès")
+                self.logger.info(f"Serveur arrêté avec succès ({scheduler.elapsed:.0f}s)")
                 return True
 
-            # Attendre 5 secondes avant la prochaine vérification
-            await asyncio.sleep(5)
-
         self.logger.error(f"Timeout d'attente de l'arrêt ({timeout}s)")
         return False
@@ -6,25 +6,33 @@ Version qui utilise uniquement l'arrêt du nœud Proxmox
 import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .proxmox_api_simple import ProxmoxAPISimple
+from .proxmox_client import ProxmoxHTTPClient
+from .minecraft_checker import MinecraftChecker
 
 class SimpleServerManager:
     """Gestionnaire de serveur simplifié"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], http_client: Optional[ProxmoxHTTPClient] = None):
         """
         Initialise le gestionnaire de serveur simplifié
         
         Args:
             config: Configuration du serveur
+            http_client: Client HTTP Proxmox partagé (optionnel)
         """
         self.config = config
         self.logger = logging.getLogger('CubeGuardian.SimpleServerManager')
-        self.proxmox_api = ProxmoxAPISimple()
+        self.proxmox_api = ProxmoxAPISimple(http_client)
+        self.minecraft_checker = MinecraftChecker(self.logger)
         
         self.logger.info("SimpleServerManager initialisé")
     
+    async def close(self) -> None:
+        """Ferme les connexions créées par le gestionnaire"""
+        await self.proxmox_api.close()
+    
     async def shutdown_server(self, delay_seconds: int = 0) -> Dict[str, Any]:
         """
         Arrêt simple du nœud Proxmox
@@ -116,39 +124,23 @@ class SimpleServerManager:
     
     async def check_minecraft_status(self) -> Dict[str, Any]:
         """
-        Vérifie le statut de Minecraft (connectivité TCP simple)
+        Vérifie le statut de Minecraft (Server List Ping)
         
         Returns:
             Dictionnaire avec le statut
         """
         try:
-            import socket
-            
             minecraft_host = self.config['minecraft']['host']
             minecraft_port = self.config['minecraft']['port']
             
-            # Test de connectivité TCP simple
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            
-            try:
-                result = sock.connect_ex((minecraft_host, minecraft_port))
-                if result == 0:
-                    return {
-                        "success": True,
-                        "accessible": True,
-                        "message": f"Minecraft accessible sur {minecraft_host}:{minecraft_port}",
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "accessible": False,
-                        "message": f"Minecraft non accessible sur {minecraft_host}:{minecraft_port}",
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    }
-            finally:
-                sock.close()
+            result = await self.minecraft_checker.check_minecraft_connectivity(minecraft_host, minecraft_port)
+            return {
+                "success": result['success'],
+                "accessible": result['success'],
+                "message": f"{result['message']} sur {minecraft_host}:{minecraft_port}",
+                "details": result.get('details', {}),
+                "timestamp": result['timestamp']
+            }
                 
         except Exception as e:
             self.logger.error(f"Erreur lors de la vérification Minecraft: {e}")
@@ -1,13 +1,24 @@
 """
 Module de gestion SSH natif Python
 Remplace le script PowerShell shutdown-pve-bot.ps1
+
+Les appels paramiko (bloquants) sont exécutés dans un pool de threads dédié :
+la boucle asyncio du bot n'est jamais bloquée par une connexion ou une commande.
+Une connexion keep-alive est conservée par hôte et les clés privées sont mises en cache.
 """
 
 import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple, Callable, AsyncIterator
 import logging
 
+from .metrics import LatencyHistogram
+
 try:
     import paramiko
 except ImportError:
@@ -16,81 +27,449 @@ except ImportError:
 
 
 class SSHManager:
-    """Gestionnaire SSH natif Python"""
+    """
+    Gestionnaire SSH natif Python
+
+    - Pool de connexions : un client par (hôte, port, utilisateur), keep-alive SSH, réutilisé
+      tant que le transport est actif ; plusieurs commandes partagent le transport (canaux)
+    - Clés privées lues et analysées une seule fois (rechargées si le fichier change)
+    - Sortie standard transmise ligne par ligne pendant l'exécution (on_output, stream_command)
+    """
+
+    # Commandes de santé exécutées en parallèle sur l'hôte distant
+    HEALTH_COMMANDS = {
+        'loadavg': 'cat /proc/loadavg',
+        'uptime': 'cat /proc/uptime',
+        'meminfo': 'cat /proc/meminfo'
+    }
 
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, connect_timeout: float = 10.0, keepalive_interval: int = 30,
+                 idle_timeout: float = 300.0, command_timeout: float = 60.0, max_workers: int = 4):
+        """
+        Initialise le gestionnaire SSH
+
+        Args:
+            logger: Logger à utiliser
+            connect_timeout: Timeout de connexion et d'authentification (secondes)
+            keepalive_interval: Intervalle des keep-alive SSH (secondes, 0 = désactivé)
+            idle_timeout: Durée (secondes) de conservation d'une connexion inutilisée
+            command_timeout: Timeout par défaut d'une commande sans sortie (secondes)
+            max_workers: Nombre de threads pour les appels paramiko (commandes simultanées)
+        """
         self.logger = logger
         if paramiko is None:
             raise ImportError("Module paramiko non installé. Installez avec: pip install paramiko")
 
-    async def shutdown_server(self, target_host: str, ssh_user: str, ssh_key_path: str, delay_minutes: int = 0) -> Dict[str, Any]:
+        self.connect_timeout = connect_timeout
+        self.keepalive_interval = keepalive_interval
+        self.idle_timeout = idle_timeout
+        self.command_timeout = command_timeout
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='CubeGuardianSSH')
+
+        # Pool : (hôte, port, utilisateur) -> (client, dernier usage) ; un verrou par hôte
+        self._connections: Dict[Tuple[str, int, str], Tuple[Any, float]] = {}
+        self._connect_locks: Dict[Tuple[str, int, str], asyncio.Lock] = {}
+
+        # Cache des clés : chemin -> (date de modification, clé analysée)
+        self._keys: Dict[str, Tuple[float, Any]] = {}
+        self._keys_lock = threading.Lock()
+
+        # Statistiques
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.commands_executed = 0
+        self.command_latency = LatencyHistogram()
+
+    @classmethod
+    def from_config(cls, proxmox_config: Dict[str, Any], logger: logging.Logger) -> 'SSHManager':
         """
-        Arrête le serveur via SSH
+        Construit le gestionnaire depuis la section proxmox de servers.yaml
+
+        Args:
+            proxmox_config: Configuration du serveur Proxmox
+            logger: Logger à utiliser
+
+        Returns:
+            Gestionnaire SSH configuré
+        """
+        pool_config = proxmox_config.get('ssh_pool', {}) or {}
+        return cls(
+            logger,
+            connect_timeout=pool_config.get('connect_timeout', 10),
+            keepalive_interval=pool_config.get('keepalive_interval', 30),
+            idle_timeout=pool_config.get('idle_timeout', 300),
+            command_timeout=pool_config.get('command_timeout', 60),
+            max_workers=pool_config.get('max_workers', 4)
+        )
+
+    async def _run_blocking(self, function: Callable, *args, **kwargs) -> Any:
+        """Exécute un appel paramiko dans le pool de threads SSH"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    def _load_key(self, key_path: str) -> Any:
+        """
+        Charge une clé privée (cache invalidé si le fichier est modifié)
+
+        Args:
+            key_path: Chemin vers la clé SSH privée
+
+        Returns:
+            Clé paramiko (RSA, Ed25519, ECDSA)
+        """
+        mtime = os.path.getmtime(key_path)
+        with self._keys_lock:
+            cached = self._keys.get(key_path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
+        if hasattr(paramiko.PKey, 'from_path'):
+            private_key = paramiko.PKey.from_path(key_path)
+        else:
+            private_key = paramiko.RSAKey.from_private_key_file(key_path)
+
+        with self._keys_lock:
+            self._keys[key_path] = (mtime, private_key)
+        return private_key
+
+    def _connect(self, target_host: str, port: int, ssh_user: str, ssh_key_path: str) -> Any:
+        """Ouvre une connexion SSH authentifiée par clé (appel bloquant)"""
+        ssh_client = paramiko.SSHClient()
+        ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+        ssh_client.connect(
+            hostname=target_host,
+            port=port,
+            username=ssh_user,
+            pkey=self._load_key(ssh_key_path),
+            timeout=self.connect_timeout,
+            banner_timeout=self.connect_timeout,
+            auth_timeout=self.connect_timeout,
+            look_for_keys=False,
+            allow_agent=False
+        )
+
+        transport = ssh_client.get_transport()
+        if transport is not None and self.keepalive_interval:
+            transport.set_keepalive(self.keepalive_interval)
+        return ssh_client
+
+    @staticmethod
+    def _is_active(ssh_client: Any) -> bool:
+        """Indique si le transport SSH d'un client est encore utilisable"""
+        transport = ssh_client.get_transport()
+        return transport is not None and transport.is_active()
+
+    async def _get_client(self, target_host: str, port: int, ssh_user: str, ssh_key_path: str) -> Tuple[Any, bool]:
+        """
+        Renvoie un client du pool, ou en ouvre un nouveau
+
+        Returns:
+            (client, True si la connexion a été réutilisée)
+        """
+        key = (target_host, port, ssh_user)
+        lock = self._connect_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            pooled = self._connections.get(key)
+            if pooled is not None:
+                ssh_client, last_used = pooled
+                if self._is_active(ssh_client) and time.monotonic() - last_used < self.idle_timeout:
+                    self._connections[key] = (ssh_client, time.monotonic())
+                    self.connections_reused += 1
+                    return ssh_client, True
+                self._discard(key)
+
+            ssh_client = await self._run_blocking(self._connect, target_host, port, ssh_user, ssh_key_path)
+            self._connections[key] = (ssh_client, time.monotonic())
+            self.connections_created += 1
+            self.logger.debug(f"Connexion SSH ouverte vers {ssh_user}@{target_host}:{port}")
+            return ssh_client, False
+
+    def _discard(self, key: Tuple[str, int, str]) -> None:
+        """Retire une connexion du pool et la ferme"""
+        pooled = self._connections.pop(key, None)
+        if pooled is not None:
+            self._executor.submit(pooled[0].close)
+
+    def _execute(self, ssh_client: Any, command: str, timeout: float,
+                 on_line: Optional[Callable[[str], None]]) -> Tuple[int, str, str]:
+        """
+        Exécute une commande sur un nouveau canal du transport (appel bloquant)
+
+        Returns:
+            (code de sortie, sortie standard, sortie d'erreur)
+        """
+        stdin, stdout, stderr = ssh_client.exec_command(command, timeout=timeout)
+        stdout_lines = []
+        for line in stdout:
+            stdout_lines.append(line)
+            if on_line is not None:
+                on_line(line.rstrip('\n'))
+        exit_status = stdout.channel.recv_exit_status()
+        error_output = stderr.read()
+        if isinstance(error_output, bytes):
+            error_output = error_output.decode('utf-8', errors='replace')
+        return exit_status, ''.join(stdout_lines), error_output
+
+    async def run_command(self, target_host: str, ssh_user: str, ssh_key_path: str, command: str,
+                          port: int = 22, timeout: Optional[float] = None,
+                          on_output: Optional[Callable[[str], Any]] = None) -> Dict[str, Any]:
+        """
+        Exécute une commande distante via le pool de connexions
 
         Args:
             target_host: Adresse IP du serveur
-            ssh_user: Utilisateur SSH (ex: "root")
+            ssh_user: Utilisateur SSH
             ssh_key_path: Chemin vers la clé SSH privée
-            delay_minutes: Délai avant arrêt (0 = immédiat)
+            command: Commande à exécuter
+            port: Port SSH
+            timeout: Timeout de lecture de la sortie (secondes)
+            on_output: Appelé dans la boucle asyncio pour chaque ligne de sortie standard
 
         Returns:
-            Dict avec success, message, timestamp, details
+            Dict avec success, message, timestamp, details (exit_status, stdout, stderr)
         """
+        timeout = timeout or self.command_timeout
+        on_line = None
+        if on_output is not None:
+            loop = asyncio.get_running_loop()
+            on_line = lambda line: loop.call_soon_threadsafe(on_output, line)
+
+        start = time.perf_counter()
         try:
-            # Connexion SSH
-            ssh_client = paramiko.SSHClient()
-            ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-            # Chargement de la clé privée
-            private_key = paramiko.RSAKey.from_private_key_file(ssh_key_path)
-
-            # Connexion
-            ssh_client.connect(
-                hostname=target_host,
-                username=ssh_user,
-                pkey=private_key,
-                timeout=10
-            )
-
-            # Commande d'arrêt
-            if delay_minutes > 0:
-                command = f"shutdown -h +{delay_minutes}"
-            else:
-                command = "shutdown -h now"
-
-            stdin, stdout, stderr = ssh_client.exec_command(command)
-
-            # Attendre la fin de la commande
-            exit_status = stdout.channel.recv_exit_status()
-            ssh_client.close()
-
-            if exit_status == 0:
-                result = {
-                    "success": True,
-                    "message": "Commande d'arrêt envoyée avec succès",
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "details": {
-                        "target_host": target_host,
-                        "delay_minutes": delay_minutes,
-                        "operation": "shutdown"
-                    }
+            ssh_client, reused = await self._get_client(target_host, port, ssh_user, ssh_key_path)
+            try:
+                exit_status, output, error_output = await self._run_blocking(
+                    self._execute, ssh_client, command, timeout, on_line)
+            except (paramiko.SSHException, EOFError, ConnectionError):
+                # Connexion du pool fermée côté serveur : une seule nouvelle tentative
+                self._discard((target_host, port, ssh_user))
+                if not reused:
+                    raise
+                ssh_client, _ = await self._get_client(target_host, port, ssh_user, ssh_key_path)
+                exit_status, output, error_output = await self._run_blocking(
+                    self._execute, ssh_client, command, timeout, on_line)
+
+            self.commands_executed += 1
+            return {
+                "success": exit_status == 0,
+                "message": "Commande exécutée" if exit_status == 0 else f"Commande échouée (code: {exit_status})",
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "details": {
+                    "target_host": target_host,
+                    "command": command,
+                    "exit_status": exit_status,
+                    "stdout": output,
+                    "stderr": error_output,
+                    "connection_reused": reused,
+                    "operation": "ssh_command"
                 }
-                self.logger.info(f"Shutdown réussi pour {target_host}")
-                return result
-            else:
-                raise Exception(f"Commande SSH échouée (code: {exit_status})")
+            }
 
         except Exception as e:
-            result = {
+            self.logger.error(f"Erreur SSH ({ssh_user}@{target_host}: {command}): {e}")
+            return {
+                "success": False,
+                "message": "Erreur lors de l'exécution de la commande SSH",
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "error": str(e),
+                "details": {
+                    "target_host": target_host,
+                    "command": command,
+                    "operation": "ssh_command"
+                }
+            }
+        finally:
+            self.command_latency.observe(time.perf_counter() - start)
+
+    async def stream_command(self, target_host: str, ssh_user: str, ssh_key_path: str, command: str,
+                             port: int = 22, timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Exécute une commande distante et renvoie sa sortie standard au fil de l'eau
+
+        Args:
+            target_host: Adresse IP du serveur
+            ssh_user: Utilisateur SSH
+            ssh_key_path: Chemin vers la clé SSH privée
+            command: Commande à exécuter
+            port: Port SSH
+            timeout: Timeout de lecture de la sortie (secondes)
+
+        Returns:
+            Itérateur asynchrone sur les lignes de sortie
+
+        Raises:
+            RuntimeError: Si la commande échoue
+        """
+        lines: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(self.run_command(target_host, ssh_user, ssh_key_path, command,
+                                                    port, timeout, on_output=lines.put_nowait))
+        task.add_done_callback(lambda _: lines.put_nowait(None))
+        try:
+            while True:
+                line = await lines.get()
+                if line is None:
+                    break
+                yield line
+        finally:
+            if not task.done():
+                task.cancel()
+
+        result = task.result()
+        if not result['success']:
+            raise RuntimeError(result.get('error') or result['message'])
+
+    async def run_commands(self, target_host: str, ssh_user: str, ssh_key_path: str,
+                           commands: Dict[str, str], port: int = 22,
+                           timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Exécute plusieurs commandes en parallèle sur le même transport SSH
+
+        Args:
+            target_host: Adresse IP du serveur
+            ssh_user: Utilisateur SSH
+            ssh_key_path: Chemin vers la clé SSH privée
+            commands: Nom -> commande
+            port: Port SSH
+            timeout: Timeout de lecture de la sortie (secondes)
+
+        Returns:
+            Nom -> résultat de run_command
+        """
+        # Ouvrir la connexion une seule fois avant de lancer les canaux en parallèle
+        await self._get_client(target_host, port, ssh_user, ssh_key_path)
+        results = await asyncio.gather(*(
+            self.run_command(target_host, ssh_user, ssh_key_path, command, port, timeout)
+            for command in commands.values()
+        ))
+        return dict(zip(commands.keys(), results))
+
+    async def check_remote_health(self, target_host: str, ssh_user: str, ssh_key_path: str,
+                                  port: int = 22) -> Dict[str, Any]:
+        """
+        Récupère la charge, l'uptime et la mémoire disponible de l'hôte distant
+
+        Args:
+            target_host: Adresse IP du serveur
+            ssh_user: Utilisateur SSH
+            ssh_key_path: Chemin vers la clé SSH privée
+            port: Port SSH
+
+        Returns:
+            Dict avec success, message, timestamp, details
+        """
+        results = await self.run_commands(target_host, ssh_user, ssh_key_path, self.HEALTH_COMMANDS, port)
+        failed = [name for name, result in results.items() if not result['success']]
+        if failed:
+            return {
                 "success": False,
-                "message": "Erreur lors de l'envoi de la commande d'arrêt",
+                "message": "Vérification de santé SSH incomplète",
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "error": results[failed[0]].get('error') or results[failed[0]]['message'],
+                "details": {"target_host": target_host, "failed": failed, "operation": "ssh_health"}
+            }
+
+        try:
+            load = [float(value) for value in results['loadavg']['details']['stdout'].split()[:3]]
+            uptime = float(results['uptime']['details']['stdout'].split()[0])
+            meminfo = {}
+            for line in results['meminfo']['details']['stdout'].splitlines():
+                name, _, value = line.partition(':')
+                meminfo[name] = int(value.split()[0]) if value.split() else 0
+        except (ValueError, IndexError) as e:
+            return {
+                "success": False,
+                "message": "Réponse de santé SSH illisible",
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "error": str(e),
+                "details": {"target_host": target_host, "operation": "ssh_health"}
+            }
+
+        return {
+            "success": True,
+            "message": "Santé de l'hôte récupérée",
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "details": {
+                "target_host": target_host,
+                "load_average": load,
+                "uptime_seconds": uptime,
+                "memory_total_mb": meminfo.get('MemTotal', 0) // 1024,
+                "memory_available_mb": meminfo.get('MemAvailable', 0) // 1024,
+                "operation": "ssh_health"
+            }
+        }
+
+    async def shutdown_server(self, target_host: str, ssh_user: str, ssh_key_path: str, delay_minutes: int = 0) -> Dict[str, Any]:
+        """
+        Arrête le serveur via SSH
+
+        Args:
+            target_host: Adresse IP du serveur
+            ssh_user: Utilisateur SSH (ex: "root")
+            ssh_key_path: Chemin vers la clé SSH privée
+            delay_minutes: Délai avant arrêt (0 = immédiat)
+
+        Returns:
+            Dict avec success, message, timestamp, details
+        """
+        # Commande d'arrêt
+        if delay_minutes > 0:
+            command = f"shutdown -h +{delay_minutes}"
+        else:
+            command = "shutdown -h now"
+
+        result = await self.run_command(target_host, ssh_user, ssh_key_path, command)
+
+        if result['success']:
+            self.logger.info(f"Shutdown réussi pour {target_host}")
+            # L'hôte s'arrête : sa connexion ne sera plus réutilisable
+            for key in [key for key in self._connections if key[0] == target_host]:
+                self._discard(key)
+            return {
+                "success": True,
+                "message": "Commande d'arrêt envoyée avec succès",
+                "timestamp": result['timestamp'],
                 "details": {
                     "target_host": target_host,
+                    "delay_minutes": delay_minutes,
                     "operation": "shutdown"
                 }
             }
 
-            self.logger.error(f"Erreur SSH shutdown: {e}")
-            return result
+        error = result.get('error') or f"Commande SSH échouée (code: {result['details'].get('exit_status')})"
+        self.logger.error(f"Erreur SSH shutdown: {error}")
+        return {
+            "success": False,
+            "message": "Erreur lors de l'envoi de la commande d'arrêt",
+            "timestamp": result['timestamp'],
+            "error": error,
+            "details": {
+                "target_host": target_host,
+                "operation": "shutdown"
+            }
+        }
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Récupère les statistiques du pool SSH
+
+        Returns:
+            Connexions ouvertes/réutilisées, commandes exécutées et leur latence
+        """
+        return {
+            'open_connections': len(self._connections),
+            'connections_created': self.connections_created,
+            'connections_reused': self.connections_reused,
+            'commands_executed': self.commands_executed,
+            'cached_keys': len(self._keys),
+            'latency': self.command_latency.get_statistics()
+        }
+
+    async def close(self) -> None:
+        """Ferme les connexions du pool et arrête les threads SSH"""
+        connections = [ssh_client for ssh_client, _ in self._connections.values()]
+        self._connections.clear()
+        for ssh_client in connections:
+            await self._run_blocking(ssh_client.close)
+        self._executor.shutdown(wait=False)
@@ -1,190 +1,241 @@
 """
 Module de gestion Wake-on-LAN natif Python
 Remplace le script PowerShell wakeup-pve-bot.ps1
-Version amelioree avec plusieurs methodes d'envoi
+
+Envoi asynchrone (datagrammes asyncio) en rafales vers les cibles minimales calculées
+depuis les sous-réseaux locaux (BroadcastDiscovery), en parallèle ; les rafales sont
+renvoyées jusqu'à ce que la vérification (port TCP Proxmox) réussisse
 """
 
 import asyncio
 import socket
-import struct
+import time
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
 import logging
 
-try:
-    from wakeonlan import send_magic_packet
-    WAKEONLAN_AVAILABLE = True
-except ImportError:
-    WAKEONLAN_AVAILABLE = False
+from .metrics import LatencyHistogram
+from .broadcast_discovery import BroadcastDiscovery
+
+
+class _WakeProtocol(asyncio.DatagramProtocol):
+    """Protocole d'envoi : conserve la dernière erreur signalée par la boucle"""
+
+    def __init__(self):
+        self.error: Optional[Exception] = None
+
+    def error_received(self, exc: Exception) -> None:
+        self.error = exc
 
 
 class WakeOnLANManager:
-    """Gestionnaire Wake-on-LAN natif Python avec plusieurs methodes"""
+    """Gestionnaire Wake-on-LAN natif Python (rafales asynchrones multi-cibles avec vérification)"""
 
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, ports: Tuple[int, ...] = (7, 9),
+                 broadcast_addresses: Optional[List[str]] = None, burst_count: int = 3,
+                 burst_spacing: float = 0.1, resend_interval: float = 15.0, resend_timeout: float = 180.0,
+                 discovery: Optional[BroadcastDiscovery] = None):
+        """
+        Initialise le gestionnaire Wake-on-LAN
+
+        Args:
+            logger: Logger à utiliser
+            ports: Ports UDP de destination (ports usuels 7 et 9, la carte réseau ignore le port)
+            broadcast_addresses: Adresses toujours utilisées en plus des cibles calculées
+            burst_count: Nombre de paquets envoyés par cible et par rafale
+            burst_spacing: Intervalle entre deux paquets d'une rafale (secondes)
+            resend_interval: Intervalle entre deux rafales tant que l'hôte ne répond pas (secondes)
+            resend_timeout: Durée maximale de la vérification (secondes)
+            discovery: Découverte des sous-réseaux locaux (cache partagé)
+        """
         self.logger = logger
+        self.ports = tuple(ports)
+        self.broadcast_addresses = list(broadcast_addresses or [])
+        self.discovery = discovery or BroadcastDiscovery(logger)
+        self.burst_count = max(1, burst_count)
+        self.burst_spacing = burst_spacing
+        self.resend_interval = resend_interval
+        self.resend_timeout = resend_timeout
+
+        self._verify_task: Optional[asyncio.Task] = None
+
+        # Latence d'envoi par cible ("adresse:port") et réveils vérifiés
+        self.send_latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.send_errors: Dict[str, int] = defaultdict(int)
+        self.verified_wakes: Dict[str, int] = defaultdict(int)
+        self.last_wake: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_config(cls, proxmox_config: Dict[str, Any], logger: logging.Logger) -> 'WakeOnLANManager':
+        """
+        Construit le gestionnaire depuis la section proxmox de servers.yaml
+
+        Args:
+            proxmox_config: Configuration du serveur Proxmox
+            logger: Logger à utiliser
+
+        Returns:
+            Gestionnaire Wake-on-LAN configuré
+        """
+        wol_config = proxmox_config.get('wake_on_lan', {}) or {}
+        return cls(
+            logger,
+            ports=tuple(wol_config.get('ports', (7, 9))),
+            broadcast_addresses=wol_config.get('broadcast_addresses'),
+            burst_count=wol_config.get('burst_count', 3),
+            burst_spacing=wol_config.get('burst_spacing', 0.1),
+            resend_interval=wol_config.get('resend_interval', 15),
+            resend_timeout=wol_config.get('resend_timeout', 180),
+            discovery=BroadcastDiscovery(
+                logger,
+                ttl=wol_config.get('discovery_ttl', 300),
+                fallback_prefix=wol_config.get('fallback_prefix', 24)
+            )
+        )
 
     def _create_magic_packet(self, mac_address: str) -> bytes:
         """
         Cree un Magic Packet pour Wake-on-LAN
-        
+
         Args:
             mac_address: Adresse MAC (format: "00:23:7D:FD:C0:5C")
-            
+
         Returns:
             Magic Packet en bytes
         """
         # Nettoyer l'adresse MAC
         mac_clean = mac_address.replace(':', '').replace('-', '').replace(' ', '')
-        
+
         # Verifier le format
         if len(mac_clean) != 12:
             raise ValueError(f"Adresse MAC invalide: {mac_address}")
-        
+
         # Convertir en bytes
         mac_bytes = bytes.fromhex(mac_clean)
-        
+
         # Creer le Magic Packet: 6 bytes de 0xFF + 16 repetitions de l'adresse MAC
         magic_packet = b'\xff' * 6 + mac_bytes * 16
-        
+
         return magic_packet
 
-    def _send_magic_packet_raw(self, mac_address: str, broadcast_addresses: List[str] = None) -> bool:
+    def _broadcast_targets(self, target_host: str) -> List[str]:
         """
-        Envoie un Magic Packet en utilisant socket UDP brut
-        
+        Adresses de destination : cibles minimales pour l'hôte, puis adresses configurées
+
+        Args:
+            target_host: Adresse IP du serveur
+
+        Returns:
+            Adresses sans doublon
+        """
+        addresses = self.discovery.targets_for(target_host)['addresses'] + self.broadcast_addresses
+        return list(dict.fromkeys(addresses))
+
+    async def _send_to(self, magic_packet: bytes, address: str, port: int) -> Dict[str, Any]:
+        """
+        Envoie une rafale de Magic Packets vers une cible
+
+        Args:
+            magic_packet: Paquet à envoyer
+            address: Adresse de destination
+            port: Port UDP
+
+        Returns:
+            Cible, envoi réussi, latence du premier envoi (ms), erreur éventuelle
+        """
+        target = f"{address}:{port}"
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        latency = None
+        try:
+            transport, protocol = await loop.create_datagram_endpoint(
+                _WakeProtocol, family=socket.AF_INET, allow_broadcast=True)
+            try:
+                for packet_index in range(self.burst_count):
+                    if packet_index:
+                        await asyncio.sleep(self.burst_spacing)
+                    transport.sendto(magic_packet, (address, port))
+                    if latency is None:
+                        latency = time.perf_counter() - start
+            finally:
+                transport.close()
+
+            if protocol.error is not None:
+                raise protocol.error
+
+            self.send_latency[target].observe(latency)
+            return {"target": target, "sent": True, "latency_ms": round(latency * 1000, 3)}
+
+        except Exception as e:
+            self.send_errors[target] += 1
+            self.logger.debug(f"Echec envoi vers {target}: {e}")
+            return {"target": target, "sent": False, "error": str(e)}
+
+    async def send_burst(self, mac_address: str, target_host: str) -> List[Dict[str, Any]]:
+        """
+        Envoie une rafale vers toutes les cibles en parallèle
+
         Args:
             mac_address: Adresse MAC du serveur
-            broadcast_addresses: Liste des adresses de broadcast a utiliser
-            
+            target_host: Adresse IP du serveur
+
         Returns:
-            True si au moins un paquet a ete envoye avec succes
-        """
-        if broadcast_addresses is None:
-            # Adresses de broadcast par defaut
-            broadcast_addresses = [
-                '255.255.255.255',  # Broadcast global
-                '192.168.1.255',    # Broadcast local
-                '192.168.0.255',    # Broadcast reseau alternatif
-            ]
-        
+            Résultat par cible (voir _send_to)
+        """
         magic_packet = self._create_magic_packet(mac_address)
-        success_count = 0
-        
-        for broadcast_addr in broadcast_addresses:
-            try:
-                # Creer un socket UDP
-                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-                
-                # Envoyer le Magic Packet sur le port 9 (ou 7)
-                for port in [9, 7]:
-                    try:
-                        sock.sendto(magic_packet, (broadcast_addr, port))
-                        success_count += 1
-                        self.logger.debug(f"Magic Packet envoye vers {broadcast_addr}:{port}")
-                    except Exception as e:
-                        self.logger.debug(f"Echec envoi vers {broadcast_addr}:{port}: {e}")
-                
-                sock.close()
-                
-            except Exception as e:
-                self.logger.warning(f"Erreur envoi vers {broadcast_addr}: {e}")
-        
-        return success_count > 0
-
-    async def wake_server(self, mac_address: str, target_host: str) -> Dict[str, Any]:
-        """
-        Envoie un Magic Packet Wake-on-LAN avec plusieurs methodes
+        return await asyncio.gather(*(
+            self._send_to(magic_packet, address, port)
+            for address in self._broadcast_targets(target_host)
+            for port in self.ports
+        ))
+
+    async def wake_server(self, mac_address: str, target_host: str,
+                          verify: Optional[Callable[[], Awaitable[bool]]] = None) -> Dict[str, Any]:
+        """
+        Envoie un Magic Packet Wake-on-LAN vers toutes les cibles
 
         Args:
             mac_address: Adresse MAC du serveur (format: "00:23:7D:FD:C0:5C")
             target_host: Adresse IP du serveur (ex: "192.168.1.245")
+            verify: Vérification de disponibilité ; si fournie, les rafales sont renvoyées
+                en arrière-plan jusqu'à ce qu'elle réussisse
 
         Returns:
             Dict avec success, message, timestamp, details
         """
-        methods_used = []
-        success_count = 0
-        
         try:
-            # Methode 1: Module wakeonlan (si disponible)
-            if WAKEONLAN_AVAILABLE:
-                try:
-                    self.logger.debug("Tentative avec module wakeonlan")
-                    send_magic_packet(mac_address)
-                    methods_used.append("wakeonlan_module")
-                    success_count += 1
-                    self.logger.debug("Module wakeonlan: succes")
-                except Exception as e:
-                    self.logger.warning(f"Module wakeonlan echoue: {e}")
-                    methods_used.append(f"wakeonlan_module_failed: {e}")
-            
-            # Methode 2: Socket UDP brut avec broadcast global
-            try:
-                self.logger.debug("Tentative avec socket UDP brut")
-                if self._send_magic_packet_raw(mac_address, ['255.255.255.255']):
-                    methods_used.append("socket_udp_global")
-                    success_count += 1
-                    self.logger.debug("Socket UDP global: succes")
-            except Exception as e:
-                self.logger.warning(f"Socket UDP global echoue: {e}")
-                methods_used.append(f"socket_udp_global_failed: {e}")
-            
-            # Methode 3: Socket UDP brut avec broadcast local
-            try:
-                self.logger.debug("Tentative avec socket UDP local")
-                if self._send_magic_packet_raw(mac_address, ['192.168.1.255']):
-                    methods_used.append("socket_udp_local")
-                    success_count += 1
-                    self.logger.debug("Socket UDP local: succes")
-            except Exception as e:
-                self.logger.warning(f"Socket UDP local echoue: {e}")
-                methods_used.append(f"socket_udp_local_failed: {e}")
-            
-            # Methode 4: Socket UDP brut avec adresse IP specifique
-            try:
-                self.logger.debug("Tentative avec adresse IP specifique")
-                if self._send_magic_packet_raw(mac_address, [target_host]):
-                    methods_used.append("socket_udp_direct")
-                    success_count += 1
-                    self.logger.debug("Socket UDP direct: succes")
-            except Exception as e:
-                self.logger.warning(f"Socket UDP direct echoue: {e}")
-                methods_used.append(f"socket_udp_direct_failed: {e}")
-
-            # Determiner le resultat
-            if success_count > 0:
-                result = {
-                    "success": True,
-                    "message": f"Magic Packet envoye avec succes ({success_count} methodes)",
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "details": {
-                        "mac_address": mac_address,
-                        "target_host": target_host,
-                        "methods_used": methods_used,
-                        "success_count": success_count,
-                        "operation": "wake_on_lan_enhanced"
-                    }
-                }
-                self.logger.info(f"Wake-on-LAN reussi pour {target_host} ({success_count} methodes)")
-            else:
-                result = {
+            sends = await self.send_burst(mac_address, target_host)
+            delivered = [send['target'] for send in sends if send['sent']]
+
+            details = {
+                "mac_address": mac_address,
+                "target_host": target_host,
+                "targets": sends,
+                "success_count": len(delivered),
+                "operation": "wake_on_lan"
+            }
+
+            if not delivered:
+                self.logger.error(f"Wake-on-LAN echoue pour {target_host} - aucune cible joignable")
+                return {
                     "success": False,
-                    "message": "Toutes les methodes d'envoi ont echoue",
+                    "message": "Toutes les cibles d'envoi ont échoué",
                     "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "error": "Aucune methode n'a reussi",
-                    "details": {
-                        "mac_address": mac_address,
-                        "target_host": target_host,
-                        "methods_used": methods_used,
-                        "success_count": success_count,
-                        "operation": "wake_on_lan_enhanced"
-                    }
+                    "error": sends[0].get('error', "Aucune cible") if sends else "Aucune cible",
+                    "details": details
                 }
-                self.logger.error(f"Wake-on-LAN echoue pour {target_host} - toutes les methodes ont echoue")
 
-            return result
+            self.logger.info(f"Wake-on-LAN envoyé vers {target_host} ({len(delivered)}/{len(sends)} cibles)")
+            if verify is not None:
+                self._start_verification(mac_address, target_host, verify, delivered)
+
+            return {
+                "success": True,
+                "message": "Magic Packet envoyé avec succès",
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "details": details
+            }
 
         except Exception as e:
             result = {
@@ -195,9 +246,106 @@ class WakeOnLANManager:
                 "details": {
                     "mac_address": mac_address,
                     "target_host": target_host,
-                    "methods_used": methods_used,
-                    "operation": "wake_on_lan_enhanced"
+                    "operation": "wake_on_lan"
                 }
             }
             self.logger.error(f"Erreur Wake-on-LAN: {e}")
             return result
+
+    def _start_verification(self, mac_address: str, target_host: str,
+                            verify: Callable[[], Awaitable[bool]], delivered: List[str]) -> None:
+        """Lance (ou relance) la boucle de renvoi en arrière-plan"""
+        if self._verify_task is not None and not self._verify_task.done():
+            self._verify_task.cancel()
+        self._verify_task = asyncio.create_task(
+            self._resend_until_awake(mac_address, target_host, verify, delivered))
+
+    async def _resend_until_awake(self, mac_address: str, target_host: str,
+                                  verify: Callable[[], Awaitable[bool]], delivered: List[str]) -> None:
+        """
+        Renvoie des rafales jusqu'à ce que l'hôte réponde ou que resend_timeout soit atteint
+
+        Args:
+            mac_address: Adresse MAC du serveur
+            target_host: Adresse IP du serveur
+            verify: Vérification de disponibilité
+            delivered: Cibles ayant reçu la première rafale
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        rounds = 1
+        delivered_targets = set(delivered)
+        try:
+            while True:
+                if await verify():
+                    # L'interface réseau n'acquitte pas le paquet : toutes les cibles ayant livré
+                    # une rafale avant la vérification sont créditées
+                    for target in delivered_targets:
+                        self.verified_wakes[target] += 1
+                    self.last_wake = {
+                        'target_host': target_host,
+                        'verified': True,
+                        'rounds': rounds,
+                        'elapsed_seconds': round(loop.time() - start, 1),
+                        'delivered_targets': sorted(delivered_targets)
+                    }
+                    self.logger.info(f"Réveil de {target_host} vérifié après {rounds} rafale(s) "
+                                     f"({self.last_wake['elapsed_seconds']}s)")
+                    return
+
+                if loop.time() - start + self.resend_interval > self.resend_timeout:
+                    break
+
+                await asyncio.sleep(self.resend_interval)
+                sends = await self.send_burst(mac_address, target_host)
+                delivered_targets.update(send['target'] for send in sends if send['sent'])
+                rounds += 1
+                self.logger.debug(f"Rafale Wake-on-LAN {rounds} vers {target_host}")
+
+            self.last_wake = {
+                'target_host': target_host,
+                'verified': False,
+                'rounds': rounds,
+                'elapsed_seconds': round(loop.time() - start, 1),
+                'delivered_targets': sorted(delivered_targets)
+            }
+            # Les interfaces ont pu changer : nouvelle découverte au prochain réveil
+            self.discovery.invalidate()
+            self.logger.warning(f"Réveil de {target_host} non vérifié après {rounds} rafale(s)")
+
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la vérification du réveil: {e}")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Récupère les statistiques d'envoi
+
+        Returns:
+            Latence, erreurs et réveils vérifiés par cible ; dernier réveil
+        """
+        targets = set(self.send_latency) | set(self.send_errors)
+        return {
+            'targets': {
+                target: {
+                    'latency': self.send_latency[target].get_statistics(),
+                    'errors': self.send_errors[target],
+                    'verified_wakes': self.verified_wakes[target]
+                }
+                for target in sorted(targets)
+            },
+            'verifying': self._verify_task is not None and not self._verify_task.done(),
+            'last_wake': self.last_wake,
+            'discovery': self.discovery.get_statistics()
+        }
+
+    async def close(self) -> None:
+        """Arrête la boucle de renvoi en cours"""
+        if self._verify_task is not None and not self._verify_task.done():
+            self._verify_task.cancel()
+            try:
+                await self._verify_task
+            except asyncio.CancelledError:
+                pass
+        self._verify_task = None
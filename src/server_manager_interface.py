@@ -4,12 +4,20 @@ Gestion des serveurs Proxmox et Minecraft avec modules Python natifs
 """
 
 import asyncio
+import time
+from collections import defaultdict
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import logging
 
 from .server_manager.server_manager import ServerManager as NativeServerManager
+from .server_manager.proxmox_client import ProxmoxHTTPClient
+from .server_manager.polling_scheduler import ReadyTimeEstimator
+from .server_manager.lifecycle_history import LifecycleHistory
+from .server_manager.metrics import LatencyHistogram
+from .server_manager.probe_engine import ProbeEngine
+from .server_manager.fleet import ServerFleet
 
 @dataclass
 class ServerConfig:
@@ -27,13 +35,14 @@ class ServerConfig:
 class ServerManager:
     """Gestionnaire des serveurs Proxmox et Minecraft - Version Python natif"""
     
-    def __init__(self, config_manager, log_manager):
+    def __init__(self, config_manager, log_manager, proxmox_client: Optional[ProxmoxHTTPClient] = None):
         """
         Initialise le gestionnaire de serveurs
         
         Args:
             config_manager: Gestionnaire de configuration
             log_manager: Gestionnaire de logs
+            proxmox_client: Client HTTP Proxmox partagé (pool keep-alive)
         """
         self.config_manager = config_manager
         self.log_manager = log_manager
@@ -52,6 +61,8 @@ class ServerManager:
                 'mac_address': self.proxmox_config.mac_address,
                 'ssh_user': self.proxmox_config.ssh_user,
                 'ssh_key_path': self.proxmox_config.ssh_key_path,
+                'ssh_pool': self.config_manager.get_server_config('proxmox').get('ssh_pool', {}),
+                'wake_on_lan': self.config_manager.get_server_config('proxmox').get('wake_on_lan', {}),
                 'web_interface': self.proxmox_config.web_interface,
                 # Configuration API REST
                 'api_url': self.config_manager.get_server_config('proxmox').get('api_url'),
@@ -68,12 +79,51 @@ class ServerManager:
         }
         
         # Module natif Python
-        self.native_server_manager = NativeServerManager(self.native_config, self.logger)
+        self.native_server_manager = NativeServerManager(self.native_config, self.logger, proxmox_client)
+        
+        # Flotte de nœuds et d'instances de jeu (le nœud proxmox réutilise le module natif ci-dessus)
+        self.fleet = ServerFleet.from_config(
+            self.config_manager.get_config('servers.servers', {}),
+            logging.getLogger('CubeGuardian.Fleet'),
+            default_manager=self.native_server_manager
+        )
         
         # État des serveurs
         self.proxmox_status = False
         self.minecraft_status = False
         
+        # Durées observées des démarrages/arrêts (phase rapide du polling)
+        self.readiness_estimator = ReadyTimeEstimator()
+        
+        # Historique persistant des opérations (alimente l'estimateur au démarrage du bot)
+        self.lifecycle_history = LifecycleHistory.from_config(
+            self.config_manager.get_config('bot.history', {}),
+            logging.getLogger('CubeGuardian.LifecycleHistory')
+        )
+        for operation in ('startup', 'shutdown', 'restart'):
+            for duration in self.lifecycle_history.get_durations(operation, limit=self.readiness_estimator.max_samples):
+                self.readiness_estimator.record(operation, duration)
+        
+        # Métriques des vérifications et des opérations (exportées par /metrics)
+        self.probe_statistics = {
+            probe: {'latency': LatencyHistogram(), 'success': 0, 'failure': 0,
+                    'last_success': None, 'last_details': {}}
+            for probe in ('proxmox', 'minecraft')
+        }
+        self.lifecycle_durations: Dict[str, LatencyHistogram] = defaultdict(
+            lambda: LatencyHistogram(LatencyHistogram.OPERATION_BUCKETS)
+        )
+        self.lifecycle_results: Dict[str, Dict[str, int]] = defaultdict(lambda: {'success': 0, 'failure': 0})
+        
+        # Vérifications partagées : résultat conservé quelques secondes, appels simultanés regroupés ;
+        # chacune est bornée par le timeout de connectivité (nœud éteint pendant le réveil)
+        self.probe_timeout = self.minecraft_config.timeout
+        cache_ttl = self.config_manager.get_config('bot.status_cache.ttl', {}) or {}
+        self.probe_engine = ProbeEngine(logging.getLogger('CubeGuardian.ProbeEngine'))
+        self.probe_engine.register('proxmox', self._probe_proxmox_status, cache_ttl.get('proxmox', 2))
+        self.probe_engine.register('proxmox_api', self._probe_proxmox_api_status, cache_ttl.get('proxmox_api', 2))
+        self.probe_engine.register('minecraft', self._probe_minecraft_status, cache_ttl.get('minecraft', 2))
+        
         self.logger.info("ServerManager initialisé (Version Python natif)")
     
     def _load_server_config(self, server_name: str) -> ServerConfig:
@@ -157,13 +207,51 @@ class ServerManager:
     
     async def check_proxmox_status(self) -> Dict[str, Any]:
         """
-        Vérifie la disponibilité du serveur Proxmox
+        Vérifie la disponibilité du serveur Proxmox (résultat récent ou vérification partagée)
+        
+        Returns:
+            Dict avec success, message, timestamp, details
+        """
+        return await self.probe_engine.probe('proxmox')
+    
+    async def check_proxmox_api_status(self) -> Dict[str, Any]:
+        """
+        Vérifie que l'API REST du nœud Proxmox répond (résultat récent ou vérification partagée)
+        
+        Returns:
+            Dict avec success, status, uptime...
+        """
+        return await self.probe_engine.probe('proxmox_api')
+    
+    async def check_minecraft_status(self) -> Dict[str, Any]:
+        """
+        Vérifie la disponibilité du serveur Minecraft (résultat récent ou vérification partagée)
         
         Returns:
             Dict avec success, message, timestamp, details
         """
+        return await self.probe_engine.probe('minecraft')
+    
+    def invalidate_status(self, *probes: str) -> None:
+        """
+        Oublie les derniers résultats de vérification (changement d'état, action sur le serveur)
+        
+        Args:
+            *probes: Vérifications à invalider (toutes si vide)
+        """
+        self.probe_engine.invalidate(*probes)
+    
+    async def _probe_proxmox_status(self) -> Dict[str, Any]:
+        """
+        Vérifie la disponibilité du serveur Proxmox (port TCP 8006)
+        
+        Returns:
+            Dict avec success, message, timestamp, details
+        """
+        start = time.perf_counter()
         try:
-            result = await self.native_server_manager.check_proxmox_status()
+            result = await self.native_server_manager.check_proxmox_status(timeout_seconds=self.probe_timeout)
+            self._record_probe('proxmox', result, time.perf_counter() - start)
             
             if result['success']:
                 self.proxmox_status = True
@@ -184,15 +272,43 @@ class ServerManager:
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
     
-    async def check_minecraft_status(self) -> Dict[str, Any]:
+    async def _probe_proxmox_api_status(self) -> Dict[str, Any]:
+        """
+        Vérifie que l'API REST du nœud Proxmox répond (au plus probe_timeout secondes)
+        
+        Returns:
+            Dict avec success, status, uptime...
+        """
+        try:
+            return await asyncio.wait_for(self.native_server_manager.check_node_status(), self.probe_timeout)
+        except asyncio.TimeoutError:
+            self.logger.debug(f"API Proxmox sans réponse après {self.probe_timeout}s")
+            return {
+                'success': False,
+                'message': "API Proxmox sans réponse",
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'error': 'timeout'
+            }
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la vérification de l'API Proxmox: {e}")
+            return {
+                'success': False,
+                'message': "Erreur lors de la vérification de l'API Proxmox",
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'error': str(e)
+            }
+    
+    async def _probe_minecraft_status(self) -> Dict[str, Any]:
         """
-        Vérifie la disponibilité du serveur Minecraft
+        Vérifie la disponibilité du serveur Minecraft (Server List Ping)
         
         Returns:
             Dict avec success, message, timestamp, details
         """
+        start = time.perf_counter()
         try:
             result = await self.native_server_manager.check_minecraft_status()
+            self._record_probe('minecraft', result, time.perf_counter() - start)
             
             if result['success']:
                 self.minecraft_status = True
@@ -225,7 +341,13 @@ class ServerManager:
         """
         self.logger.info(f"Attente du démarrage du serveur (timeout: {timeout}s)")
         
-        result = await self.native_server_manager.wait_for_startup(timeout)
+        start_time = asyncio.get_event_loop().time()
+        result = await self.native_server_manager.wait_for_startup(
+            timeout, self.readiness_estimator.expected('startup')
+        )
+        
+        elapsed = asyncio.get_event_loop().time() - start_time
+        self.record_lifecycle('startup', result, elapsed)
         
         if result:
             self.logger.info("Serveur complètement opérationnel")
@@ -248,7 +370,13 @@ class ServerManager:
         """
         self.logger.info(f"Attente de l'arrêt du serveur (timeout: {timeout}s)")
         
-        result = await self.native_server_manager.wait_for_shutdown(timeout)
+        start_time = asyncio.get_event_loop().time()
+        result = await self.native_server_manager.wait_for_shutdown(
+            timeout, self.readiness_estimator.expected('shutdown')
+        )
+        
+        elapsed = asyncio.get_event_loop().time() - start_time
+        self.record_lifecycle('shutdown', result, elapsed)
         
         if result:
             self.logger.info("Serveur Proxmox arrêté")
@@ -259,6 +387,103 @@ class ServerManager:
             self.log_manager.log_server_event('error', 'Proxmox', f'Arrêt non confirmé après {timeout}s')
             return False
     
+    def _record_probe(self, probe: str, result: Dict[str, Any], duration: float) -> None:
+        """
+        Enregistre le résultat et la durée d'une vérification
+        
+        Args:
+            probe: Nom de la vérification (proxmox, minecraft)
+            result: Résultat de la vérification
+            duration: Durée en secondes
+        """
+        statistics = self.probe_statistics[probe]
+        statistics['latency'].observe(duration)
+        if result.get('success'):
+            statistics['success'] += 1
+            statistics['last_success'] = time.time()
+            statistics['last_details'] = result.get('details', {}) or {}
+        else:
+            statistics['failure'] += 1
+    
+    def get_probe_statistics(self) -> Dict[str, Any]:
+        """
+        Récupère les statistiques des vérifications et des opérations
+        
+        Returns:
+            Latences, compteurs et dernière réussite par vérification ; durées par opération
+        """
+        return {
+            'probes': {
+                probe: {
+                    'latency': statistics['latency'].get_statistics(),
+                    'success': statistics['success'],
+                    'failure': statistics['failure'],
+                    'last_success': statistics['last_success'],
+                    'last_details': statistics['last_details']
+                }
+                for probe, statistics in self.probe_statistics.items()
+            },
+            'lifecycle': {
+                operation: {
+                    'duration': histogram.get_statistics(),
+                    **self.lifecycle_results[operation]
+                }
+                for operation, histogram in self.lifecycle_durations.items()
+            }
+        }
+    
+    def record_lifecycle(self, operation: str, success: bool, duration: float,
+                         phases: Optional[Dict[str, float]] = None) -> None:
+        """
+        Enregistre une opération terminée dans l'historique et l'estimateur
+        
+        Args:
+            operation: Type d'opération (startup, shutdown, restart)
+            success: True si l'opération a abouti
+            duration: Durée totale en secondes
+            phases: Temps écoulé (secondes) à la fin de chaque phase atteinte
+        """
+        if success:
+            self.readiness_estimator.record(operation, duration)
+        self.lifecycle_durations[operation].observe(duration)
+        self.lifecycle_results[operation]['success' if success else 'failure'] += 1
+        self.lifecycle_history.record_operation(operation, success, duration, phases)
+        self.log_manager.log_lifecycle(operation, success, duration, phases)
+    
+    def get_startup_eta(self, elapsed: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Estime le temps restant avant la disponibilité de Minecraft
+        
+        Args:
+            elapsed: Temps déjà écoulé depuis l'envoi du Wake-on-LAN
+            
+        Returns:
+            Estimation (remaining_seconds, samples...) ou None sans historique
+        """
+        return self.lifecycle_history.estimate_eta('startup', elapsed)
+    
+    async def check_remote_health(self) -> Dict[str, Any]:
+        """
+        Récupère la charge et la mémoire du nœud Proxmox via SSH
+        
+        Returns:
+            Dict avec success, message, timestamp, details
+        """
+        if not self.proxmox_config.ssh_user or not self.proxmox_config.ssh_key_path:
+            return {
+                'success': False,
+                'message': "SSH non configuré",
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'error': "ssh_user ou ssh_key_path manquant"
+            }
+        return await self.native_server_manager.check_remote_health()
+    
+    async def close(self) -> None:
+        """Ferme les connexions SSH, celles des nœuds de la flotte et l'historique des opérations"""
+        await self.native_server_manager.close()
+        await self.fleet.close()
+        self.lifecycle_history.close()
+    
     def get_server_status(self) -> Dict[str, bool]:
         """
         Récupère l'état actuel des serveurs
@@ -1,14 +1,42 @@
 """
 Surveillance vocale pour Bot CubeGuardian
 Surveillance des salons vocaux Discord et gestion des événements
+La présence est tenue à jour à partir des transitions before/after de chaque événement
+vocal (O(1) par événement) ; un rapprochement périodique avec la liste des membres du
+salon corrige les écarts éventuels (événements manqués lors d'une reconnexion)
+
+Plusieurs liaisons (serveur Discord, salon vocal, salon textuel, serveur de jeu) peuvent
+être surveillées par un même bot ; les événements sont aiguillés par l'ID du salon vocal
 """
 
 import asyncio
 import logging
-from typing import Optional, Set, List
+from dataclasses import dataclass, field
+from typing import Optional, Set, List, Dict, Any
 from datetime import datetime
 import discord
 
+
+@dataclass
+class ChannelBinding:
+    """Liaison surveillée : salon vocal, salon textuel et serveur de jeu associé"""
+    guild: discord.Guild
+    voice_channel: discord.VoiceChannel
+    text_channel: Optional[discord.TextChannel] = None
+    server: str = 'default'
+    present: Set[int] = field(default_factory=set)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Description de la liaison pour le statut"""
+        return {
+            'guild': self.guild.name,
+            'voice_channel': {'name': self.voice_channel.name, 'id': self.voice_channel.id},
+            'text_channel': self.text_channel.name if self.text_channel else None,
+            'server': self.server,
+            'authorized_users_present': len(self.present)
+        }
+
+
 class VoiceMonitor:
     """Surveillance des salons vocaux Discord"""
     
@@ -31,14 +59,22 @@ class VoiceMonitor:
         self.logger = logging.getLogger('CubeGuardian.VoiceMonitor')
         
         # Configuration
-        self.voice_channel_name = self.config_manager.get_config('discord.channels.voice_channel', "L'écho-du-Cube")
+        self.voice_channel_name = self.config_manager.get_config('discord.discord.channels.voice_channel', "L'écho-du-Cube")
+        self.binding_configs = self._load_binding_configs()
         self.shutdown_delay = self.config_manager.get_timer('shutdown_delay')
+        self.reconcile_interval = self.config_manager.get_config('bot.timers.voice_reconcile', 300)
         
-        # État de surveillance
-        self.monitored_channel = None
-        self.authorized_users_present = set()
-        self.shutdown_timer = None
+        # État de surveillance : liaisons indexées par ID du salon vocal, timers par serveur de jeu
+        self.bindings: Dict[int, ChannelBinding] = {}
+        self.shutdown_timers: Dict[str, asyncio.Task] = {}
         self.monitoring_active = False
+        self.reconcile_task = None
+        
+        # Statistiques : événements appliqués, ignorés (mute, sourdine, stream...), rapprochements
+        self.events_applied = 0
+        self.events_ignored = 0
+        self.reconciliations = 0
+        self.drift_corrections = 0
         
         # Callbacks pour les événements
         self.on_user_join_callback = None
@@ -46,12 +82,50 @@ class VoiceMonitor:
         self.on_timer_expired_callback = None
         self.on_timer_cancelled_callback = None
         
-        self.logger.info(f"VoiceMonitor initialisé pour le salon: {self.voice_channel_name}")
+        self.logger.info(f"VoiceMonitor initialisé pour {len(self.binding_configs)} liaison(s)")
+    
+    def _load_binding_configs(self) -> List[Dict[str, Any]]:
+        """
+        Lit les liaisons de discord.yaml
+        
+        Returns:
+            Liaisons configurées (guild, voice_channel, text_channel, server) ; à défaut,
+            une liaison unique construite depuis la section channels
+        """
+        bindings = self.config_manager.get_config('discord.discord.bindings') or []
+        if bindings:
+            return [dict(binding) for binding in bindings]
+        
+        return [{
+            'guild': None,
+            'voice_channel': self.voice_channel_name,
+            'text_channel': self.config_manager.get_config('discord.discord.channels.text_channel'),
+            'server': 'default'
+        }]
+    
+    @property
+    def monitored_channel(self) -> Optional[discord.VoiceChannel]:
+        """Salon vocal de la première liaison (salon principal)"""
+        binding = next(iter(self.bindings.values()), None)
+        return binding.voice_channel if binding else None
+    
+    @property
+    def authorized_users_present(self) -> Set[int]:
+        """Utilisateurs autorisés présents, toutes liaisons confondues"""
+        return set().union(*(binding.present for binding in self.bindings.values()))
+    
+    @property
+    def shutdown_timer(self) -> Optional[asyncio.Task]:
+        """Timer d'arrêt du serveur de jeu par défaut (ou premier timer actif)"""
+        return self.shutdown_timers.get('default') or next(iter(self.shutdown_timers.values()), None)
     
     def set_callbacks(self, on_user_join=None, on_user_leave=None, on_timer_expired=None, on_timer_cancelled=None):
         """
         Définit les callbacks pour les événements
         
+        Les callbacks d'arrivée, de départ et d'annulation reçoivent (utilisateur, liaison),
+        celui d'expiration reçoit le nom du serveur de jeu
+        
         Args:
             on_user_join: Callback appelé quand un utilisateur autorisé rejoint
             on_user_leave: Callback appelé quand un utilisateur autorisé quitte
@@ -65,97 +139,216 @@ class VoiceMonitor:
         
         self.logger.info("Callbacks définis pour VoiceMonitor")
     
+    @staticmethod
+    def _matches(item, reference) -> bool:
+        """Compare un objet Discord à une référence de configuration (ID ou nom)"""
+        if reference is None:
+            return True
+        if isinstance(reference, int) or str(reference).isdigit():
+            return item.id == int(reference)
+        return item.name == reference
+    
+    def resolve_bindings(self) -> List[ChannelBinding]:
+        """
+        Associe les liaisons configurées aux salons Discord visibles par le bot
+        
+        Une liaison sans serveur Discord précisé prend le premier salon portant ce nom ;
+        la présence déjà connue des liaisons conservées est gardée
+        
+        Returns:
+            Liaisons résolues (la première est la liaison principale)
+        """
+        resolved: Dict[int, ChannelBinding] = {}
+        
+        for entry in self.binding_configs:
+            found = False
+            for guild in self.bot.guilds:
+                if not self._matches(guild, entry.get('guild')):
+                    continue
+                voice_channel = next((channel for channel in guild.voice_channels
+                                      if self._matches(channel, entry.get('voice_channel'))), None)
+                if voice_channel is None:
+                    continue
+                text_channel = None
+                if entry.get('text_channel') is not None:
+                    text_channel = next((channel for channel in guild.text_channels
+                                         if self._matches(channel, entry.get('text_channel'))), None)
+                    if text_channel is None:
+                        self.logger.warning(f"Salon textuel '{entry.get('text_channel')}' non trouvé sur {guild.name}")
+                
+                previous = self.bindings.get(voice_channel.id)
+                resolved[voice_channel.id] = ChannelBinding(
+                    guild=guild,
+                    voice_channel=voice_channel,
+                    text_channel=text_channel,
+                    server=entry.get('server', 'default'),
+                    present=previous.present if previous else set()
+                )
+                found = True
+                if entry.get('guild') is None:
+                    break
+            
+            if not found:
+                self.logger.error(f"Salon vocal '{entry.get('voice_channel')}' non trouvé")
+        
+        self.bindings = resolved
+        return list(resolved.values())
+    
     async def start_monitoring(self) -> None:
-        """Démarre la surveillance du salon vocal"""
+        """Démarre la surveillance des salons vocaux"""
         try:
-            # Trouver le salon vocal
-            self.monitored_channel = await self._find_voice_channel()
+            # Trouver les salons vocaux
+            if not self.bindings:
+                self.resolve_bindings()
             
-            if not self.monitored_channel:
-                self.logger.error(f"Salon vocal '{self.voice_channel_name}' non trouvé")
+            if not self.bindings:
+                self.logger.error("Aucun salon vocal à surveiller")
                 return
             
             # Initialiser l'état des utilisateurs présents
             await self._update_authorized_users_present()
             
             self.monitoring_active = True
-            self.logger.info(f"Surveillance démarrée pour le salon: {self.monitored_channel.name}")
-            self.log_manager.log_voice_event('monitoring_started', 'Bot', self.monitored_channel.name)
-            
-            # Envoyer le message de surveillance active
-            await self.message_manager.send_monitoring_active_message(self.monitored_channel.name)
+            if self.reconcile_interval and (self.reconcile_task is None or self.reconcile_task.done()):
+                self.reconcile_task = asyncio.create_task(self._reconcile_loop(), name='voice-reconcile')
             
+            for binding in self.bindings.values():
+                self.logger.info(f"Surveillance démarrée pour le salon: {binding.voice_channel.name} "
+                                 f"({binding.guild.name}, serveur {binding.server})")
+                self.log_manager.log_voice_event('monitoring_started', 'Bot', binding.voice_channel.name)
+                
+                # Envoyer le message de surveillance active
+                await self.message_manager.send_monitoring_active_message(binding.voice_channel.name,
+                                                                          channel=binding.text_channel)
+        
         except Exception as e:
             self.logger.error(f"Erreur lors du démarrage de la surveillance: {e}")
             self.monitoring_active = False
     
     async def stop_monitoring(self) -> None:
-        """Arrête la surveillance du salon vocal"""
+        """Arrête la surveillance des salons vocaux"""
         try:
             self.monitoring_active = False
             
-            # Annuler le timer d'arrêt s'il est actif
-            if self.shutdown_timer:
-                self.shutdown_timer.cancel()
-                self.shutdown_timer = None
+            # Annuler les timers d'arrêt actifs
+            await self.cancel_shutdown_timer()
+            
+            if self.reconcile_task:
+                self.reconcile_task.cancel()
+                self.reconcile_task = None
             
             self.logger.info("Surveillance arrêtée")
             self.log_manager.log_voice_event('monitoring_stopped', 'Bot')
-            
+        
         except Exception as e:
             self.logger.error(f"Erreur lors de l'arrêt de la surveillance: {e}")
     
     async def _find_voice_channel(self) -> Optional[discord.VoiceChannel]:
         """
-        Trouve le salon vocal à surveiller
+        Trouve le salon vocal principal à surveiller
         
         Returns:
             Salon vocal Discord ou None
         """
-        for guild in self.bot.guilds:
-            for channel in guild.voice_channels:
-                if channel.name == self.voice_channel_name:
-                    return channel
+        if not self.bindings:
+            self.resolve_bindings()
+        return self.monitored_channel
+    
+    def count_present(self, server: Optional[str] = None) -> int:
+        """
+        Nombre d'utilisateurs autorisés présents (d'après le modèle de présence)
         
-        return None
+        Args:
+            server: Serveur de jeu (toutes les liaisons si None)
+        
+        Returns:
+            Nombre d'utilisateurs distincts présents dans les salons liés à ce serveur
+        """
+        present = set()
+        for binding in self.bindings.values():
+            if server is None or binding.server == server:
+                present |= binding.present
+        return len(present)
     
-    async def _update_authorized_users_present(self) -> None:
-        """Met à jour la liste des utilisateurs autorisés présents"""
-        if not self.monitored_channel:
-            return
+    def _is_present_elsewhere(self, user_id: int) -> bool:
+        """Indique si un utilisateur est présent dans l'un des salons surveillés"""
+        return any(user_id in binding.present for binding in self.bindings.values())
+    
+    async def _reconcile_binding(self, binding: ChannelBinding) -> int:
+        """
+        Met à jour la présence d'une liaison (parcours complet du salon)
         
+        Args:
+            binding: Liaison à rapprocher
+        
+        Returns:
+            Nombre d'arrivées et de départs détectés
+        """
         current_users = set()
         
-        for member in self.monitored_channel.members:
+        for member in binding.voice_channel.members:
             if self.user_manager.is_authorized(member.id):
                 current_users.add(member.id)
                 # Mettre à jour la présence dans le user manager
                 self.user_manager.update_user_presence(member.id, True)
         
-        # Identifier les utilisateurs qui ont quitté
-        users_left = self.authorized_users_present - current_users
-        for user_id in users_left:
-            self.user_manager.update_user_presence(user_id, False)
-        
-        # Identifier les utilisateurs qui ont rejoint
-        users_joined = current_users - self.authorized_users_present
+        # Identifier les utilisateurs qui ont quitté et ceux qui ont rejoint
+        users_left = binding.present - current_users
+        users_joined = current_users - binding.present
         
         # Mettre à jour la liste
-        self.authorized_users_present = current_users
+        binding.present = current_users
+        
+        for user_id in users_left:
+            if not self._is_present_elsewhere(user_id):
+                self.user_manager.update_user_presence(user_id, False)
         
         # Traiter les événements
         for user_id in users_joined:
-            await self._handle_user_join(user_id)
+            await self._handle_user_join(user_id, binding)
         
         for user_id in users_left:
-            await self._handle_user_leave(user_id)
+            await self._handle_user_leave(user_id, binding)
+        
+        return len(users_joined) + len(users_left)
     
-    async def _handle_user_join(self, user_id: int) -> None:
+    async def _update_authorized_users_present(self) -> int:
+        """
+        Met à jour la liste des utilisateurs autorisés présents (parcours complet des salons)
+        
+        Returns:
+            Nombre d'arrivées et de départs détectés
+        """
+        drift = 0
+        for binding in list(self.bindings.values()):
+            drift += await self._reconcile_binding(binding)
+        return drift
+    
+    async def _reconcile_loop(self) -> None:
+        """Rapprochement périodique de la présence avec les membres des salons"""
+        try:
+            while True:
+                await asyncio.sleep(self.reconcile_interval)
+                if not self.monitoring_active:
+                    continue
+                try:
+                    drift = await self._update_authorized_users_present()
+                    self.reconciliations += 1
+                    if drift:
+                        self.drift_corrections += drift
+                        self.logger.warning(f"Rapprochement vocal : {drift} écart(s) de présence corrigé(s)")
+                except Exception as e:
+                    self.logger.error(f"Erreur lors du rapprochement de la présence vocale: {e}")
+        except asyncio.CancelledError:
+            pass
+    
+    async def _handle_user_join(self, user_id: int, binding: ChannelBinding) -> None:
         """
         Gère l'arrivée d'un utilisateur autorisé
         
         Args:
             user_id: ID de l'utilisateur qui a rejoint
+            binding: Liaison du salon rejoint
         """
         try:
             user = self.bot.get_user(user_id)
@@ -163,38 +356,39 @@ class VoiceMonitor:
                 self.logger.warning(f"Utilisateur {user_id} non trouvé")
                 return
             
-            self.logger.info(f"Utilisateur autorisé rejoint: {user.display_name}")
-            self.log_manager.log_voice_event('join', user.display_name, self.monitored_channel.name)
+            self.logger.info(f"Utilisateur autorisé rejoint: {user.display_name} ({binding.voice_channel.name})")
+            self.log_manager.log_voice_event('join', user.display_name, binding.voice_channel.name, user.id)
             
-            # Annuler le timer d'arrêt s'il est actif
-            if self.shutdown_timer:
-                self.shutdown_timer.cancel()
-                self.shutdown_timer = None
-                self.logger.info("Timer d'arrêt annulé - utilisateur autorisé détecté")
+            # Annuler le timer d'arrêt du serveur de jeu s'il est actif
+            timer = self.shutdown_timers.pop(binding.server, None)
+            if timer:
+                timer.cancel()
+                self.logger.info(f"Timer d'arrêt annulé ({binding.server}) - utilisateur autorisé détecté")
                 
                 # Envoyer le message d'annulation
-                await self.message_manager.send_shutdown_cancelled_message(user)
+                await self.message_manager.send_shutdown_cancelled_message(user, channel=binding.text_channel)
                 
                 # Appeler le callback
                 if self.on_timer_cancelled_callback:
-                    await self.on_timer_cancelled_callback(user)
+                    await self.on_timer_cancelled_callback(user, binding)
             
             # Envoyer le message d'arrivée
-            await self.message_manager.send_user_joined_message(user)
+            await self.message_manager.send_user_joined_message(user, channel=binding.text_channel)
             
             # Appeler le callback
             if self.on_user_join_callback:
-                await self.on_user_join_callback(user)
-                
+                await self.on_user_join_callback(user, binding)
+        
         except Exception as e:
             self.logger.error(f"Erreur lors de la gestion de l'arrivée de l'utilisateur {user_id}: {e}")
     
-    async def _handle_user_leave(self, user_id: int) -> None:
+    async def _handle_user_leave(self, user_id: int, binding: ChannelBinding) -> None:
         """
         Gère le départ d'un utilisateur autorisé
         
         Args:
             user_id: ID de l'utilisateur qui a quitté
+            binding: Liaison du salon quitté
         """
         try:
             user = self.bot.get_user(user_id)
@@ -202,55 +396,72 @@ class VoiceMonitor:
                 self.logger.warning(f"Utilisateur {user_id} non trouvé")
                 return
             
-            self.logger.info(f"Utilisateur autorisé quitte: {user.display_name}")
-            self.log_manager.log_voice_event('leave', user.display_name, self.monitored_channel.name)
+            self.logger.info(f"Utilisateur autorisé quitte: {user.display_name} ({binding.voice_channel.name})")
+            self.log_manager.log_voice_event('leave', user.display_name, binding.voice_channel.name, user.id)
             
             # Envoyer le message de départ
-            await self.message_manager.send_user_left_message(user)
+            await self.message_manager.send_user_left_message(user, channel=binding.text_channel)
             
-            # Vérifier s'il reste des utilisateurs autorisés
-            if not self.authorized_users_present:
-                self.logger.info("Aucun utilisateur autorisé restant - démarrage du timer d'arrêt")
-                await self.start_shutdown_timer()
+            # Vérifier s'il reste des utilisateurs autorisés pour ce serveur de jeu
+            if not self.count_present(binding.server):
+                self.logger.info(f"Aucun utilisateur autorisé restant ({binding.server}) - démarrage du timer d'arrêt")
+                await self.start_shutdown_timer(binding.server)
             
             # Appeler le callback
             if self.on_user_leave_callback:
-                await self.on_user_leave_callback(user)
-                
+                await self.on_user_leave_callback(user, binding)
+        
         except Exception as e:
             self.logger.error(f"Erreur lors de la gestion du départ de l'utilisateur {user_id}: {e}")
     
-    async def start_shutdown_timer(self) -> None:
-        """Démarre le timer d'arrêt du serveur"""
+    async def start_shutdown_timer(self, server: str = 'default') -> None:
+        """
+        Démarre le timer d'arrêt d'un serveur de jeu
+        
+        Args:
+            server: Serveur de jeu concerné
+        """
         try:
-            if self.shutdown_timer:
-                self.logger.warning("Timer d'arrêt déjà actif")
+            if server in self.shutdown_timers:
+                self.logger.warning(f"Timer d'arrêt déjà actif ({server})")
                 return
             
-            self.logger.info(f"Démarrage du timer d'arrêt ({self.shutdown_delay} secondes)")
+            self.logger.info(f"Démarrage du timer d'arrêt ({server}, {self.shutdown_delay} secondes)")
             
             # Ne pas envoyer de message ici - laisser le Bot gérer l'arrêt
             # Le Bot enverra son propre message avec le timer de 10 minutes
             
             # Créer le timer
-            self.shutdown_timer = asyncio.create_task(self._shutdown_timer_task())
-            
+            self.shutdown_timers[server] = asyncio.create_task(self._shutdown_timer_task(server))
+        
         except Exception as e:
             self.logger.error(f"Erreur lors du démarrage du timer d'arrêt: {e}")
     
-    async def cancel_shutdown_timer(self) -> None:
-        """Annule le timer d'arrêt du serveur"""
+    async def cancel_shutdown_timer(self, server: Optional[str] = None) -> None:
+        """
+        Annule le timer d'arrêt d'un serveur de jeu
+        
+        Args:
+            server: Serveur de jeu concerné (tous les timers si None)
+        """
         try:
-            if self.shutdown_timer:
-                self.shutdown_timer.cancel()
-                self.shutdown_timer = None
-                self.logger.info("Timer d'arrêt annulé")
-                
+            servers = [server] if server is not None else list(self.shutdown_timers)
+            for name in servers:
+                timer = self.shutdown_timers.pop(name, None)
+                if timer:
+                    timer.cancel()
+                    self.logger.info(f"Timer d'arrêt annulé ({name})")
+        
         except Exception as e:
             self.logger.error(f"Erreur lors de l'annulation du timer d'arrêt: {e}")
     
-    async def _shutdown_timer_task(self) -> None:
-        """Tâche du timer d'arrêt"""
+    async def _shutdown_timer_task(self, server: str) -> None:
+        """
+        Tâche du timer d'arrêt
+        
+        Args:
+            server: Serveur de jeu concerné
+        """
         try:
             # Attendre le délai d'arrêt
             await asyncio.sleep(self.shutdown_delay)
@@ -258,24 +469,23 @@ class VoiceMonitor:
             # Vérifier qu'il n'y a toujours pas d'utilisateurs autorisés
             await self._update_authorized_users_present()
             
-            if not self.authorized_users_present:
-                self.logger.info("Timer d'arrêt expiré - aucun utilisateur autorisé détecté")
+            if not self.count_present(server):
+                self.logger.info(f"Timer d'arrêt expiré ({server}) - aucun utilisateur autorisé détecté")
                 self.log_manager.log_voice_event('timer_expired', 'Bot')
                 
                 # Appeler le callback
                 if self.on_timer_expired_callback:
-                    await self.on_timer_expired_callback()
+                    await self.on_timer_expired_callback(server)
             else:
-                self.logger.info("Timer d'arrêt expiré mais utilisateurs autorisés détectés - arrêt annulé")
-            
-            self.shutdown_timer = None
+                self.logger.info(f"Timer d'arrêt expiré ({server}) mais utilisateurs autorisés détectés - arrêt annulé")
             
+            self.shutdown_timers.pop(server, None)
+        
         except asyncio.CancelledError:
-            self.logger.info("Timer d'arrêt annulé")
-            self.shutdown_timer = None
+            self.logger.info(f"Timer d'arrêt annulé ({server})")
         except Exception as e:
             self.logger.error(f"Erreur dans la tâche du timer d'arrêt: {e}")
-            self.shutdown_timer = None
+            self.shutdown_timers.pop(server, None)
     
     async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState) -> None:
         """
@@ -286,37 +496,64 @@ class VoiceMonitor:
             before: État vocal précédent
             after: État vocal actuel
         """
-        if not self.monitoring_active or not self.monitored_channel:
+        if not self.monitoring_active or not self.bindings:
             return
         
         try:
-            # Vérifier si le changement concerne notre salon
-            if (before.channel != self.monitored_channel and 
-                after.channel != self.monitored_channel):
+            before_id = before.channel.id if before.channel is not None else None
+            after_id = after.channel.id if after.channel is not None else None
+            
+            # Mute, sourdine, stream : pas de changement de salon
+            if before_id == after_id or not self.user_manager.is_authorized(member.id):
+                self.events_ignored += 1
                 return
             
-            # Mettre à jour la liste des utilisateurs présents
-            await self._update_authorized_users_present()
+            left = self.bindings.get(before_id) if before_id is not None else None
+            joined = self.bindings.get(after_id) if after_id is not None else None
+            
+            # Salons sans rapport avec les liaisons surveillées
+            if left is None and joined is None:
+                self.events_ignored += 1
+                return
             
+            self.events_applied += 1
+            
+            # Arrivée traitée avant le départ : un passage d'un salon lié à un autre salon lié
+            # au même serveur de jeu ne déclenche pas de timer d'arrêt
+            if joined is not None and member.id not in joined.present:
+                joined.present.add(member.id)
+                self.user_manager.update_user_presence(member.id, True)
+                await self._handle_user_join(member.id, joined)
+            
+            if left is not None and member.id in left.present:
+                left.present.discard(member.id)
+                if not self._is_present_elsewhere(member.id):
+                    self.user_manager.update_user_presence(member.id, False)
+                await self._handle_user_leave(member.id, left)
+        
         except Exception as e:
             self.logger.error(f"Erreur lors de la gestion du changement d'état vocal: {e}")
     
-    async def check_authorized_users(self) -> int:
+    async def check_authorized_users(self, server: Optional[str] = None) -> int:
         """
-        Compte les utilisateurs autorisés présents
+        Compte les utilisateurs autorisés présents (parcours des membres des salons)
+        Parcours complet réservé au rapprochement ; le comptage courant passe par count_present
+        
+        Args:
+            server: Serveur de jeu (toutes les liaisons si None)
         
         Returns:
             Nombre d'utilisateurs autorisés présents
         """
-        if not self.monitored_channel:
-            return 0
+        present = set()
+        for binding in self.bindings.values():
+            if server is not None and binding.server != server:
+                continue
+            for member in binding.voice_channel.members:
+                if self.user_manager.is_authorized(member.id):
+                    present.add(member.id)
         
-        count = 0
-        for member in self.monitored_channel.members:
-            if self.user_manager.is_authorized(member.id):
-                count += 1
-        
-        return count
+        return len(present)
     
     def get_monitoring_status(self) -> dict:
         """
@@ -325,39 +562,58 @@ class VoiceMonitor:
         Returns:
             Dictionnaire avec le statut
         """
+        monitored_channel = self.monitored_channel
         return {
             'monitoring_active': self.monitoring_active,
             'monitored_channel': {
-                'name': self.monitored_channel.name if self.monitored_channel else None,
-                'id': self.monitored_channel.id if self.monitored_channel else None
+                'name': monitored_channel.name if monitored_channel else None,
+                'id': monitored_channel.id if monitored_channel else None
             },
-            'authorized_users_present': len(self.authorized_users_present),
-            'shutdown_timer_active': self.shutdown_timer is not None,
-            'shutdown_delay': self.shutdown_delay
+            'bindings': [binding.to_dict() for binding in self.bindings.values()],
+            'authorized_users_present': self.count_present(),
+            'shutdown_timer_active': bool(self.shutdown_timers),
+            'shutdown_timers': list(self.shutdown_timers),
+            'shutdown_delay': self.shutdown_delay,
+            'events_applied': self.events_applied,
+            'events_ignored': self.events_ignored,
+            'reconciliations': self.reconciliations,
+            'drift_corrections': self.drift_corrections
         }
     
-    def get_authorized_users_present(self) -> List[int]:
+    def get_authorized_users_present(self, server: Optional[str] = None) -> List[int]:
         """
         Récupère la liste des utilisateurs autorisés présents
         
+        Args:
+            server: Serveur de jeu (toutes les liaisons si None)
+        
         Returns:
             Liste des IDs des utilisateurs autorisés présents
         """
-        return list(self.authorized_users_present)
+        present = set()
+        for binding in self.bindings.values():
+            if server is None or binding.server == server:
+                present |= binding.present
+        return list(present)
     
-    def is_shutdown_timer_active(self) -> bool:
+    def is_shutdown_timer_active(self, server: Optional[str] = None) -> bool:
         """
-        Vérifie si le timer d'arrêt est actif
+        Vérifie si un timer d'arrêt est actif
+        
+        Args:
+            server: Serveur de jeu (n'importe lequel si None)
         
         Returns:
             True si le timer d'arrêt est actif
         """
-        return self.shutdown_timer is not None
+        if server is None:
+            return bool(self.shutdown_timers)
+        return server in self.shutdown_timers
     
     def __str__(self) -> str:
         """Représentation string du surveillant vocal"""
-        channel_name = self.monitored_channel.name if self.monitored_channel else "Non défini"
-        users_count = len(self.authorized_users_present)
-        timer_status = "Actif" if self.shutdown_timer else "Inactif"
+        channels = ", ".join(binding.voice_channel.name for binding in self.bindings.values()) or "Non défini"
+        users_count = self.count_present()
+        timer_status = "Actif" if self.shutdown_timers else "Inactif"
         
-        return f"VoiceMonitor(channel={channel_name}, users={users_count}, timer={timer_status})"
+        return f"VoiceMonitor(channels={channels}, users={users_count}, timer={timer_status})"
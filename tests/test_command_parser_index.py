@@ -0,0 +1,213 @@
+"""
+Tests pour l'analyseur de commandes en langage naturel
+"""
+
+import json
+import re
+import random
+import string
+from pathlib import Path
+
+import pytest
+import yaml
+
+from src.command_parser import CommandParser, CommandIntent
+from src.keyword_index import BKTree, DeletionFilter
+from src.parser_benchmark import ParserEvaluator, compare, load_corpus as load_labelled_corpus, main, percentile
+
+
+CORPUS_PATH = Path(__file__).parent / "data" / "command_parser_regression.jsonl"
+BOT_CONFIG_PATH = Path(__file__).parent.parent / "config" / "bot.yaml"
+
+
+def load_corpus():
+    """Messages de référence avec l'intention et le score obtenus par l'analyse linéaire d'origine"""
+    with open(CORPUS_PATH, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class TestCommandParser:
+    """Tests pour CommandParser"""
+
+    def setup_method(self):
+        """Configuration avant chaque test"""
+        self.parser = CommandParser()
+
+    @pytest.mark.parametrize("case", load_corpus(), ids=lambda case: case['message'][:40])
+    def test_regression_corpus(self, case):
+        """Test intention, score et mots reconnus identiques au corpus de référence"""
+        result = self.parser.parse_command(case['message'], require_mention=case['require_mention'])
+
+        assert result.intent == CommandIntent(case['intent'])
+        assert result.confidence == pytest.approx(case['confidence'], abs=1e-6)
+        assert [keyword.split('~')[0] for keyword in result.matched_keywords] == case['matched']
+
+    def test_bk_tree_matches_linear_scan(self):
+        """Test recherche dans l'arbre BK identique au parcours de tous les mots-clés"""
+        rng = random.Random(42)
+        keywords = self.parser.restart_keywords | self.parser.server_keywords | self.parser.help_keywords
+        words = [rng.choice(sorted(keywords)) for _ in range(200)]
+        words = [''.join(c if rng.random() > 0.2 else rng.choice(string.ascii_lowercase) for c in word)
+                 for word in words]
+
+        for keyword_set in (self.parser.restart_keywords, self.parser.server_keywords, self.parser.help_keywords):
+            trees = (BKTree(self.parser.calculate_levenshtein_distance, keyword_set),
+                     BKTree(self.parser.calculate_levenshtein_distance, keyword_set,
+                            bounded_distance=self.parser.bounded_levenshtein_distance))
+            for word in words:
+                for max_distance in (1, 2):
+                    expected = sorted(((keyword, self.parser.calculate_levenshtein_distance(word, keyword))
+                                       for keyword in keyword_set), key=lambda item: (item[1], item[0]))
+                    expected = [item for item in expected if item[1] <= max_distance]
+                    for tree in trees:
+                        assert len(tree) == len(keyword_set)
+                        assert tree.search(word, max_distance) == expected
+
+        # L'élagage évite de comparer chaque mot à tout le vocabulaire
+        tree = self.parser.keyword_indexes['restart']
+        for word in words:
+            tree.search(word, 2)
+        assert tree.get_statistics()['comparisons_per_search'] < len(tree)
+
+    def test_bounded_levenshtein_distance(self):
+        """Test distance bornée : exacte sous la borne, borne + 1 au-delà"""
+        rng = random.Random(7)
+        pairs = [("redemarrer", "redémarrer"), ("servere", "serveur"), ("", "mc"), ("minecraft", "minecraft"),
+                 ("restart", "rst"), ("abc", "cba")]
+        pairs += [(''.join(rng.choice('abcde') for _ in range(rng.randint(0, 9))),
+                   ''.join(rng.choice('abcde') for _ in range(rng.randint(0, 9)))) for _ in range(2000)]
+
+        for s1, s2 in pairs:
+            full = self.parser.calculate_levenshtein_distance(s1, s2)
+            for max_distance in range(4):
+                expected = full if full <= max_distance else max_distance + 1
+                assert self.parser.bounded_levenshtein_distance(s1, s2, max_distance) == expected
+
+    def test_myers_levenshtein_distance(self):
+        """Test distance bit-parallèle identique à la programmation dynamique, mots-clés compris"""
+        rng = random.Random(11)
+        keywords = sorted(self.parser.restart_keywords | self.parser.server_keywords)
+        pairs = [(''.join(rng.choice('abcde') for _ in range(rng.randint(0, 9))),
+                  ''.join(rng.choice('abcde') for _ in range(rng.randint(0, 9)))) for _ in range(2000)]
+        pairs += [(''.join(c if rng.random() > 0.3 else rng.choice('aeirst') for c in keyword), keyword)
+                  for keyword in keywords]
+
+        for s1, s2 in pairs:
+            full = self.parser.calculate_levenshtein_distance(s1, s2)
+            assert self.parser.myers_levenshtein_distance(s1, s2) == full
+            for max_distance in range(4):
+                expected = full if full <= max_distance else max_distance + 1
+                assert self.parser.bounded_levenshtein_distance(s1, s2, max_distance) == expected
+
+    def test_deletion_filter_never_rejects_a_match(self):
+        """Test filtre par suppressions : aucun mot proche d'un mot-clé n'est écarté"""
+        rng = random.Random(5)
+        keyword_filter = DeletionFilter(((self.parser.restart_keywords, 2), (self.parser.help_keywords, 1)))
+        words = [''.join(rng.choice('aeiorstmpdcbl') for _ in range(rng.randint(1, 12))) for _ in range(3000)]
+
+        for word in words:
+            if keyword_filter.might_match(word):
+                continue
+            assert not self.parser.find_similar_keywords(word, self.parser.restart_keywords, max_distance=2)
+            assert not self.parser.find_similar_keywords(word, self.parser.help_keywords, max_distance=1)
+
+        assert 0 < keyword_filter.get_statistics()['rejections'] < len(words)
+
+    def test_prefilter(self):
+        """Test filtre rapide : rejette sans mention ou sans mot-clé, garde toute commande reconnue"""
+        for case in load_corpus():
+            result = self.parser.parse_command(case['message'], require_mention=case['require_mention'])
+            if result.intent != CommandIntent.UNKNOWN:
+                assert self.parser.prefilter(case['message'], require_mention=case['require_mention'])
+
+        # Aide sans mention dans un salon public : toujours analysée
+        assert self.parser.prefilter("comment utiliser le bot ?", require_mention=True)
+        assert self.parser.prefilter("aide svp", require_mention=True)
+
+        assert not self.parser.prefilter("redémarrer le serveur minecraft", require_mention=True)
+        assert not self.parser.prefilter("@CubeGuardian merci beaucoup", require_mention=True)
+        assert not self.parser.prefilter("xyz wxyz", require_mention=False)
+        assert self.parser.prefilter("@CubeGuardian redemarer le serveur", require_mention=True)
+        assert self.parser.prefilter("aide", require_mention=False)
+
+        stats = self.parser.get_statistics()
+        assert stats['prefilter_rejected_mention'] >= 1
+        assert stats['prefilter_rejected_keywords'] >= 2
+
+        parser = CommandParser(prefilter=False)
+        assert parser.prefilter("bonjour", require_mention=True)
+
+    def test_normalize_text(self):
+        """Test normalisation identique à l'enchaînement d'origine (replace puis deux regex)"""
+        def reference(text):
+            text = text.lower().strip()
+            for accent, replacement in self.parser.accent_map.items():
+                text = text.replace(accent, replacement)
+            text = re.sub(r'[^\w\s]', ' ', text)
+            return re.sub(r'\s+', ' ', text).strip()
+
+        rng = random.Random(3)
+        alphabet = 'aàéèêçôùAÉ bcz_09!?.,:;\'"-@<>\t\n' + 'ñÿœ'
+        texts = ["", "   ", "@CubeGuardian  redémarre le serveur !!", "l'été, ça va?\n"]
+        texts += [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))) for _ in range(2000)]
+        for text in texts:
+            assert self.parser.normalize_text(text) == reference(text)
+
+    def test_word_cache(self):
+        """Test cache LRU des scores par mot : réutilisation, éviction, résultats inchangés"""
+        parser = CommandParser(word_cache_size=3)
+        first = parser.parse_command("redemarer le serveur", require_mention=False)
+        second = parser.parse_command("redemarer le serveur", require_mention=False)
+        assert second == first
+
+        stats = parser.get_statistics()
+        assert stats['word_cache_misses'] == 3
+        assert stats['word_cache_hits'] == 9  # analyse d'aide puis second message
+        assert stats['word_cache_hit_rate'] == pytest.approx(0.75)
+
+        # Le mot le moins récemment utilisé est évincé
+        parser.score_word("minecraft")
+        assert parser.get_statistics()['word_cache_size'] == 3
+        parser.score_word("redemarer")
+        assert parser.get_statistics()['word_cache_misses'] == 5
+
+        uncached = CommandParser(word_cache_size=0)
+        assert uncached.parse_command("redemarer le serveur", require_mention=False) == first
+        assert uncached.get_statistics()['word_cache_size'] == 0
+
+    def test_parser_evaluator(self):
+        """Test évaluation en lot : précision/rappel parfaits sur le corpus, sans régression entre configurations"""
+        corpus = load_labelled_corpus(str(CORPUS_PATH))
+        baseline = ParserEvaluator({'prefilter': False, 'word_cache_size': 0}).evaluate(corpus)
+        candidate = ParserEvaluator({'prefilter': False}).evaluate(corpus, repeat=3)
+
+        assert baseline['accuracy'] == 1.0
+        for metrics in baseline['intents'].values():
+            assert metrics['precision'] == 1.0 and metrics['recall'] == 1.0
+        assert candidate['passes'] == 3
+        assert baseline['latency_ms']['p50'] <= baseline['latency_ms']['p99']
+        assert baseline['messages_per_second'] > 0
+
+        comparison = compare(corpus, baseline, candidate)
+        assert comparison['regressions'] == [] and comparison['fixes'] == []
+        assert comparison['accuracy_delta'] == 0
+
+        # Configuration livrée (filtre rapide, déclencheurs textuels, cache) : aucun cas manqué
+        with open(BOT_CONFIG_PATH, 'r', encoding='utf-8') as f:
+            deployed = ParserEvaluator(yaml.safe_load(f)['command_parser']).evaluate(corpus)
+        assert deployed['errors'] == []
+        assert deployed['accuracy'] == 1.0
+
+        assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+        assert percentile([1.0, 2.0, 3.0, 4.0], 99) == 4.0
+        assert percentile([], 50) is None
+
+    def test_parser_benchmark_cli(self, tmp_path, capsys):
+        """Test code de retour non nul quand la configuration candidate dégrade la reconnaissance"""
+        corpus = tmp_path / "corpus.jsonl"
+        corpus.write_text(json.dumps({"message": "bot redémarre le serveur", "intent": "restart_minecraft",
+                                      "require_mention": True}) + "\n", encoding='utf-8')
+
+        assert main([str(corpus), '--repeat', '1']) == 0
+        assert main([str(corpus), '--compare', '{"text_triggers": []}', '--repeat', '1']) == 1
+        assert "RÉGRESSION" in capsys.readouterr().out
@@ -0,0 +1,198 @@
+"""
+Tests unitaires pour le serveur de supervision (/health, /metrics)
+"""
+
+import asyncio
+import time
+import pytest
+from enum import Enum
+from unittest.mock import Mock
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.health_server import HealthServer
+from src.loop_monitor import LoopMonitor
+from src.health_sampler import HealthSampler, HealthRingBuffer, HealthSample
+from src.server_manager.probe_engine import ProbeEngine
+from src.server_manager.metrics import LatencyHistogram
+
+
+class FakeState(Enum):
+    """États simplifiés du bot"""
+    IDLE = "idle"
+    SERVER_OPERATIONAL = "operational"
+
+
+class TestHealthServer:
+    """Tests pour HealthServer"""
+
+    def _create_bot(self, connected: bool = True):
+        """Crée un bot simulé avec des statistiques de vérification"""
+        histogram = LatencyHistogram()
+        histogram.observe(0.02)
+        probe_statistics = {
+            'probes': {
+                'minecraft': {'latency': histogram.get_statistics(), 'success': 1, 'failure': 0,
+                              'last_success': 1700000000.0, 'last_details': {'players_online': 3}}
+            },
+            'lifecycle': {}
+        }
+
+        bot = Mock()
+        bot.is_ready.return_value = connected
+        bot.is_closed.return_value = False
+        bot.latency = 0.05
+        bot.state = FakeState.SERVER_OPERATIONAL
+        bot.loop_monitor = LoopMonitor(Mock())
+        bot.server_manager.get_probe_statistics.return_value = probe_statistics
+        bot.get_bot_info.return_value = {
+            'state': 'operational',
+            'uptime_seconds': 12.0,
+            'probe_statistics': probe_statistics,
+            'security_statistics': {'event_counts': {'spam_detected': 2}},
+            'proxmox_http_statistics': {'latency': {}, 'connections_created': 1, 'connections_reused': 4}
+        }
+        return bot
+
+    @pytest.mark.asyncio
+    async def test_health_endpoint(self):
+        """Test /health : 200 si connecté à Discord, 503 sinon"""
+        server = HealthServer(self._create_bot(), {}, Mock())
+        async with TestClient(TestServer(server.create_app())) as client:
+            response = await client.get('/health')
+            body = await response.json()
+
+        assert response.status == 200
+        assert body['state'] == 'operational'
+        assert body['last_successful_probe']['minecraft']['timestamp'] is not None
+
+        server = HealthServer(self._create_bot(connected=False), {}, Mock())
+        async with TestClient(TestServer(server.create_app())) as client:
+            response = await client.get('/health')
+
+        assert response.status == 503
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self):
+        """Test /metrics : exposition Prometheus construite depuis get_bot_info()"""
+        pytest.importorskip('prometheus_client')
+        server = HealthServer(self._create_bot(), {}, Mock())
+        async with TestClient(TestServer(server.create_app())) as client:
+            response = await client.get('/metrics')
+            text = await response.text()
+
+        assert response.status == 200
+        assert 'cubeguardian_bot_state{state="operational"} 1.0' in text
+        assert 'cubeguardian_probe_latency_seconds_bucket{le="0.025",probe="minecraft"} 1.0' in text
+        assert 'cubeguardian_security_events{type="spam_detected"} 2.0' in text
+        assert 'cubeguardian_minecraft_players_online 3.0' in text
+
+
+class TestLoopMonitor:
+    """Tests pour LoopMonitor"""
+
+    @pytest.mark.asyncio
+    async def test_slow_callback_detection(self):
+        """Test de détection d'un appel bloquant : coroutine nommée et pile capturée"""
+        monitor = LoopMonitor(Mock(), lag_interval=0.05, slow_callback_threshold=0.05)
+        original_run = asyncio.events.Handle._run
+
+        async def blocking_probe():
+            time.sleep(0.2)
+
+        monitor.start()
+        try:
+            await asyncio.create_task(blocking_probe(), name='probe')
+            await asyncio.sleep(0.1)
+        finally:
+            monitor.stop()
+
+        assert asyncio.events.Handle._run is original_run
+        record = next(r for r in monitor.slow_callback_records if 'blocking_probe' in r['callback'])
+        assert record['callback'].startswith('Task probe')
+        assert record['duration_ms'] >= 200
+        assert 'time.sleep(0.2)' in record['stack']
+
+        statistics = monitor.get_statistics()
+        assert statistics['running'] is False
+        assert statistics['slow_callbacks']['count'] >= 1
+        assert statistics['lag']['count'] >= 1
+
+    @pytest.mark.asyncio
+    async def test_stop_keeps_foreign_patch(self):
+        """Test arrêt après un autre remplacement de Handle._run : ce remplacement est conservé"""
+        monitor = LoopMonitor(Mock(), capture_stack=False)
+        original_run = asyncio.events.Handle._run
+
+        monitor.start()
+        timed_run = asyncio.events.Handle._run
+
+        def foreign_run(handle):
+            return timed_run(handle)
+
+        asyncio.events.Handle._run = foreign_run
+        try:
+            monitor.stop()
+            assert asyncio.events.Handle._run is foreign_run
+            monitor.logger.warning.assert_called_once()
+            await asyncio.sleep(0)
+        finally:
+            asyncio.events.Handle._run = original_run
+
+
+class TestHealthSampler:
+    """Tests pour l'échantillonnage de fond"""
+
+    def test_ring_buffer_wraps(self):
+        """Test tampon circulaire : capacité fixe, ordre chronologique, dernière mesure"""
+        buffer = HealthRingBuffer(capacity=3)
+        for index in range(5):
+            buffer.append(HealthSample(float(index), True, index % 2 == 0, 10.0 + index, index))
+
+        assert len(buffer) == 3
+        assert [sample.timestamp for sample in buffer] == [2.0, 3.0, 4.0]
+        assert buffer.latest() == HealthSample(4.0, True, True, 14.0, 4)
+
+    @pytest.mark.asyncio
+    async def test_sample_and_latest(self):
+        """Test mesure enregistrée depuis le moteur de vérifications"""
+        engine = ProbeEngine(Mock())
+
+        async def proxmox():
+            return {'success': True}
+
+        async def minecraft():
+            return {'success': True, 'details': {'latency_ms': 12.5, 'players_online': 3}}
+
+        engine.register('proxmox', proxmox)
+        engine.register('minecraft', minecraft)
+        sampler = HealthSampler(engine, Mock(), is_active=lambda: True, interval=30)
+
+        assert sampler.latest() is None
+        await sampler.sample()
+
+        latest = sampler.latest()
+        assert latest.minecraft_up and latest.proxmox_up
+        assert latest.latency_ms == 12.5
+        assert latest.players_online == 3
+        assert sampler.latest(max_age=-1) is None
+        assert sampler.get_statistics()['minecraft_availability'] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_latest_ignored_while_inactive(self):
+        """Test mesure antérieure à un arrêt ignorée tant que l'échantillonnage est suspendu"""
+        engine = ProbeEngine(Mock())
+
+        async def up():
+            return {'success': True, 'details': {'players_online': 0}}
+
+        engine.register('proxmox', up)
+        engine.register('minecraft', up)
+        active = {'value': True}
+        sampler = HealthSampler(engine, Mock(), is_active=lambda: active['value'], interval=30)
+        await sampler.sample()
+        assert sampler.latest().minecraft_up
+
+        # Arrêt rapide : le bot repasse à IDLE, la mesure récente ne doit plus être utilisée
+        active['value'] = False
+        assert sampler.latest() is None
+        assert sampler.get_statistics()['latest']['minecraft_up']
@@ -0,0 +1,147 @@
+"""
+Tests unitaires pour le gestionnaire de logs (pipeline asynchrone et rotation par lignes)
+"""
+
+import json
+import logging
+import pytest
+from unittest.mock import Mock
+
+from src.log_manager import LogManager, SegmentedLogHandler, EventFormatter
+from src.event_query import EventQuery
+
+
+class TestLogManager:
+    """Tests pour LogManager"""
+
+    def _create_log_manager(self, tmp_path, **logging_config):
+        """Crée un LogManager écrivant dans un répertoire temporaire"""
+        config_manager = Mock()
+        config_manager.get_config.return_value = {
+            'log_level': 'INFO',
+            'logging': {
+                'file_path': str(tmp_path / 'cubeguardian.log'),
+                'max_lines': 20,
+                **logging_config
+            }
+        }
+        return LogManager(config_manager)
+
+    def test_queue_pipeline_writes_from_listener(self, tmp_path):
+        """Test écriture des logs par le thread du listener"""
+        log_manager = self._create_log_manager(tmp_path)
+        root_handlers = logging.getLogger('CubeGuardian').handlers
+        assert len(root_handlers) == 1
+        assert isinstance(root_handlers[0], logging.handlers.QueueHandler)
+
+        log_manager.log_info("Message de test")
+        log_manager.close()
+
+        content = (tmp_path / 'cubeguardian.log').read_text(encoding='utf-8')
+        assert "Message de test" in content
+
+    def test_rotation_renames_segments(self, tmp_path):
+        """Test rotation par renommage : segments indexés, les plus anciens supprimés"""
+        log_manager = self._create_log_manager(tmp_path, backup_count=2)
+
+        for index in range(70):
+            log_manager.log_info(f"Ligne {index}")
+        log_manager.close()
+
+        index = json.loads((tmp_path / 'cubeguardian.log.index').read_text(encoding='utf-8'))
+        sequences = [segment['sequence'] for segment in index['segments']]
+        assert len(sequences) == 2
+        assert sorted(path.name for path in tmp_path.glob('cubeguardian.log.[0-9]*')) == \
+            [f'cubeguardian.log.{sequence}' for sequence in sequences]
+        assert all(segment['line_count'] == 20 for segment in index['segments'])
+        assert index['segments'][1]['offset'] == index['segments'][0]['offset'] + index['segments'][0]['size']
+
+        live = (tmp_path / 'cubeguardian.log').read_text(encoding='utf-8')
+        assert "Ligne 69" in live
+
+    def test_statistics_without_reading(self, tmp_path):
+        """Test statistiques issues des compteurs, y compris après réouverture"""
+        log_path = tmp_path / 'store.log'
+        handler = SegmentedLogHandler(str(log_path), segment_lines=10, max_segments=5)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        for index in range(25):
+            handler.emit(logging.makeLogRecord({'msg': f"Ligne {index}"}))
+        handler.emit(logging.makeLogRecord({'msg': "première\nseconde"}))
+        handler.close()
+
+        stats = handler.get_statistics()
+        assert stats['segments_count'] == 2
+        assert stats['live_lines'] == 7
+        assert stats['total_lines'] == 27
+
+        reopened = SegmentedLogHandler(str(log_path), segment_lines=10, max_segments=5)
+        assert reopened.get_statistics()['total_lines'] == 27
+        assert reopened.get_statistics()['total_size'] == stats['total_size']
+        reopened.close()
+
+    def test_cleanup_drops_whole_segments(self, tmp_path):
+        """Test nettoyage par suppression de segments entiers"""
+        log_path = tmp_path / 'cleanup.log'
+        handler = SegmentedLogHandler(str(log_path), segment_lines=5, max_segments=10)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        for index in range(15):
+            handler.emit(logging.makeLogRecord({'msg': f"Ligne {index}", 'created': 1000 + index}))
+
+        dropped = handler.drop_segments_before(1007)
+        handler.close()
+
+        assert dropped == ['cleanup.log.1']
+        assert [segment['sequence'] for segment in handler.segments] == [2, 3]
+        assert not (tmp_path / 'cleanup.log.1').exists()
+        assert handler.get_statistics()['segments_lines'] == 10
+
+
+class TestEventQuery:
+    """Tests pour le flux d'événements structurés et son outil de requête"""
+
+    def test_structured_events_queryable(self, tmp_path):
+        """Test écriture NDJSON par LogManager puis filtres type/utilisateur/champ"""
+        config_manager = Mock()
+        config_manager.get_config.return_value = {
+            'log_level': 'INFO',
+            'logging': {'file_path': str(tmp_path / 'cubeguardian.log')}
+        }
+        log_manager = LogManager(config_manager)
+        log_manager.log_voice_event('join', 'Alice', 'Minecraft', user_id=42)
+        log_manager.log_voice_event('join', 'Bob', 'Minecraft', user_id=7)
+        log_manager.log_lifecycle('startup', True, 120.5, {'proxmox_up': 40.0})
+        log_manager.log_lifecycle('startup', True, 180.0)
+        log_manager.log_lifecycle('shutdown', True, 30.0)
+        log_manager.close()
+
+        query = EventQuery(str(tmp_path / 'events.ndjson'))
+
+        joins = list(query.iter_events('voice', user_id=42))
+        assert [event['user'] for event in joins] == ['Alice']
+
+        startups = list(query.iter_events('lifecycle', operation='startup'))
+        assert startups[0]['phases'] == {'proxmox_up': 40.0}
+        summary = EventQuery.summarize(startups, 'duration')
+        assert summary['count'] == 2
+        assert summary['max'] == 180.0
+
+        # Les messages texte restent dans le log classique
+        assert "Cycle de vie shutdown" in (tmp_path / 'cubeguardian.log').read_text(encoding='utf-8')
+
+    def test_time_range_skips_segments(self, tmp_path):
+        """Test plage de temps : les segments hors plage sont ignorés via l'index"""
+        events_path = tmp_path / 'events.ndjson'
+        handler = SegmentedLogHandler(str(events_path), segment_lines=2, max_segments=10)
+        handler.setFormatter(EventFormatter())
+        for index in range(6):
+            handler.emit(logging.makeLogRecord({
+                'created': 1000 + index * 100, 'levelname': 'INFO',
+                'event_type': 'performance', 'event_fields': {'operation': 'check', 'duration': index}
+            }))
+        handler.close()
+
+        query = EventQuery(str(events_path))
+        assert [path.rsplit('.', 1)[-1] for path in query._files(since=1250)] == ['2', '3']
+
+        events = list(query.iter_events('performance', since=1250, until=1500))
+        assert [event['duration'] for event in events] == [3, 4, 5]
@@ -5,15 +5,23 @@ Remplace les tests des scripts PowerShell
 
 import pytest
 import asyncio
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import Mock, MagicMock, patch, AsyncMock
 from datetime import datetime
 
 # Import des modules natifs
 from src.server_manager.wake_on_lan import WakeOnLANManager
+from src.server_manager.broadcast_discovery import BroadcastDiscovery
 from src.server_manager.ssh_manager import SSHManager
 from src.server_manager.connectivity_checker import ConnectivityChecker
 from src.server_manager.minecraft_checker import MinecraftChecker
 from src.server_manager.server_manager import ServerManager as NativeServerManager
+from src.server_manager.proxmox_client import ProxmoxHTTPClient
+from src.server_manager.proxmox_api import ProxmoxAPI
+from src.server_manager.proxmox_api_simple import ProxmoxAPISimple
+from src.server_manager.polling_scheduler import PollingScheduler, ReadyTimeEstimator
+from src.server_manager.lifecycle_history import LifecycleHistory
+from src.server_manager.probe_engine import ProbeEngine
+from src.server_manager.fleet import ServerFleet, InstanceState
 
 
 class TestWakeOnLANManager:
@@ -24,6 +32,12 @@ class TestWakeOnLANManager:
         self.logger = Mock()
         self.wake_manager = WakeOnLANManager(self.logger)
 
+    def test_default_ports(self):
+        """Test ports par défaut : 7 et 9, avec ou sans section wake_on_lan"""
+        assert self.wake_manager.ports == (7, 9)
+        assert WakeOnLANManager.from_config({}, self.logger).ports == (7, 9)
+        assert WakeOnLANManager.from_config({'wake_on_lan': {'ports': [9]}}, self.logger).ports == (9,)
+
     @pytest.mark.asyncio
     async def test_wake_server_success(self):
         """Test wake-on-LAN réussi"""
@@ -50,6 +64,67 @@ class TestWakeOnLANManager:
             assert result['message'] == "Erreur lors de l'envoi du Magic Packet"
             assert result['error'] == "Erreur réseau"
 
+    @pytest.mark.asyncio
+    async def test_burst_resent_until_verified(self):
+        """Test rafales renvoyées jusqu'à la vérification du réveil"""
+        import socket
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(('127.0.0.1', 0))
+        receiver.setblocking(False)
+        port = receiver.getsockname()[1]
+
+        wake_manager = WakeOnLANManager(self.logger, ports=(port,), broadcast_addresses=[],
+                                        burst_count=2, burst_spacing=0, resend_interval=0.01)
+        checks = []
+
+        async def verify():
+            checks.append(True)
+            return len(checks) == 3
+
+        try:
+            with patch.object(wake_manager.discovery, 'targets_for', return_value={'addresses': ['127.0.0.1']}):
+                result = await wake_manager.wake_server("00:23:7D:FD:C0:5C", "127.0.0.1", verify=verify)
+                await asyncio.wait_for(wake_manager._verify_task, timeout=2)
+
+            packets = []
+            while True:
+                try:
+                    packets.append(receiver.recv(1024))
+                except BlockingIOError:
+                    break
+        finally:
+            receiver.close()
+
+        assert result['success'] == True
+        assert result['details']['targets'][0]['target'] == f"127.0.0.1:{port}"
+        assert len(packets) == 6
+        assert packets[0] == b'\xff' * 6 + bytes.fromhex('00237DFDC05C') * 16
+        assert wake_manager.last_wake['verified'] == True
+        assert wake_manager.last_wake['rounds'] == 3
+        statistics = wake_manager.get_statistics()['targets'][f"127.0.0.1:{port}"]
+        assert statistics['latency']['count'] == 3
+        assert statistics['verified_wakes'] == 1
+
+    def test_broadcast_discovery(self, tmp_path):
+        """Test découverte des sous-réseaux (/proc/net/route) et cibles minimales"""
+        route_path = tmp_path / 'route'
+        route_path.write_text(
+            "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT\n"
+            "eth0\t00000000\t0101A8C0\t0003\t0\t0\t0\t00000000\t0\t0\t0\n"
+            "eth0\t0001A8C0\t00000000\t0001\t0\t0\t0\t00FFFFFF\t0\t0\t0\n"
+        )
+        discovery = BroadcastDiscovery(self.logger, route_path=str(route_path))
+
+        with patch('src.server_manager.broadcast_discovery.PSUTIL_AVAILABLE', False):
+            on_link = discovery.targets_for("192.168.1.245")
+            routed = discovery.targets_for("10.0.5.20")
+
+        assert on_link['addresses'] == ['192.168.1.255']
+        assert on_link['on_link'] == True
+        assert routed['addresses'] == ['10.0.5.255', '10.0.5.20']
+        assert discovery.get_statistics()['discoveries'] == 1
+        assert discovery.get_statistics()['cache_hits'] == 1
+
 
 class TestSSHManager:
     """Tests pour le module SSH natif"""
@@ -87,6 +162,40 @@ class TestSSHManager:
             assert result['message'] == "Erreur lors de l'envoi de la commande d'arrêt"
             assert result['error'] == "Erreur de connexion SSH"
 
+    @pytest.mark.asyncio
+    async def test_connection_pool_and_remote_health(self):
+        """Test pool SSH : une seule connexion pour des commandes parallèles, sortie analysée"""
+        outputs = {
+            'cat /proc/loadavg': ['0.52 0.41 0.30 1/245 1234\n'],
+            'cat /proc/uptime': ['3600.25 7000.10\n'],
+            'cat /proc/meminfo': ['MemTotal:       16384000 kB\n', 'MemAvailable:    8192000 kB\n']
+        }
+
+        def exec_command(command, timeout=None):
+            stdout = MagicMock()
+            stdout.__iter__.return_value = iter(outputs[command])
+            stdout.channel.recv_exit_status.return_value = 0
+            stderr = Mock()
+            stderr.read.return_value = b''
+            return None, stdout, stderr
+
+        mock_client = Mock()
+        mock_client.exec_command.side_effect = exec_command
+        streamed = []
+        with patch.object(self.ssh_manager, '_connect', return_value=mock_client) as mock_connect:
+            result = await self.ssh_manager.check_remote_health("192.168.1.245", "root", "./keys/proxmox_key")
+            await self.ssh_manager.run_command("192.168.1.245", "root", "./keys/proxmox_key",
+                                               'cat /proc/meminfo', on_output=streamed.append)
+            await asyncio.sleep(0)
+
+        assert mock_connect.call_count == 1
+        assert result['success'] == True
+        assert result['details']['load_average'] == [0.52, 0.41, 0.30]
+        assert result['details']['memory_available_mb'] == 8000
+        assert streamed == ['MemTotal:       16384000 kB', 'MemAvailable:    8192000 kB']
+        assert self.ssh_manager.get_statistics()['connections_reused'] == 4
+        await self.ssh_manager.close()
+
 
 class TestConnectivityChecker:
     """Tests pour le module de vérification de connectivité"""
@@ -168,6 +277,519 @@ class TestMinecraftChecker:
             assert result['details']['port'] == 25565
 
 
+class TestProxmoxHTTPClient:
+    """Tests pour le client HTTP Proxmox partagé"""
+
+    @pytest.mark.asyncio
+    async def test_connections_reused(self):
+        """Test réutilisation des connexions keep-alive entre requêtes"""
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+
+        async def handler(request):
+            return web.json_response({'data': {'status': 'running'}})
+
+        app = web.Application()
+        app.router.add_get('/status', handler)
+
+        async with TestServer(app) as server:
+            client = ProxmoxHTTPClient(Mock(), pool_size=2, idle_timeout=30)
+            url = str(server.make_url('/status'))
+
+            for _ in range(3):
+                result = await client.request("GET", url)
+                assert result['success'] == True
+                assert result['data'] == {'status': 'running'}
+
+            stats = client.get_statistics()
+            await client.close()
+
+        assert stats['requests_count'] == 3
+        assert stats['connections_created'] == 1
+        assert stats['handshakes_saved'] == 2
+        assert client.session is None
+
+    @pytest.mark.asyncio
+    async def test_request_connection_error(self):
+        """Test erreur de connexion convertie en résultat"""
+        client = ProxmoxHTTPClient(Mock(), request_timeout=1)
+
+        result = await client.request("GET", "http://127.0.0.1:1/status")
+        await client.close()
+
+        assert result['success'] == False
+        assert result['status'] == 0
+
+
+class TestProxmoxAPISimple:
+    """Tests pour la fermeture du client HTTP de l'API simplifiée"""
+
+    @pytest.mark.asyncio
+    async def test_close_only_owned_client(self):
+        """Test client dédié fermé, client partagé laissé ouvert"""
+        shared = Mock()
+        shared.close = AsyncMock()
+        await ProxmoxAPISimple(shared).close()
+        shared.close.assert_not_awaited()
+
+        api = ProxmoxAPISimple()
+        api.http_client.close = AsyncMock()
+        await api.close()
+        api.http_client.close.assert_awaited_once()
+
+
+class TestProxmoxAPITasks:
+    """Tests pour le suivi des tâches Proxmox via UPID"""
+
+    def setup_method(self):
+        """Configuration avant chaque test"""
+        self.api = ProxmoxAPI(Mock(), http_client=Mock())
+
+    @pytest.mark.asyncio
+    async def test_wait_for_task_completes(self):
+        """Test attente d'une tâche terminée avec succès"""
+        statuses = [
+            {'success': True, 'status': 'running', 'exitstatus': None},
+            {'success': True, 'status': 'stopped', 'exitstatus': 'OK'}
+        ]
+        with patch.object(self.api, 'get_task_status', AsyncMock(side_effect=statuses)):
+            result = await self.api.wait_for_task("https://pve/api2/json", "id", "secret", "UPID:pve:1",
+                                                  initial_interval=0.01)
+
+        assert result['success'] == True
+        assert result['exitstatus'] == 'OK'
+        assert result['polls'] == 2
+
+    @pytest.mark.asyncio
+    async def test_wait_for_task_failed_exitstatus(self):
+        """Test tâche terminée en erreur"""
+        status = {'success': True, 'status': 'stopped', 'exitstatus': 'command failed'}
+        with patch.object(self.api, 'get_task_status', AsyncMock(return_value=status)):
+            result = await self.api.wait_for_task("https://pve/api2/json", "id", "secret", "UPID:pve:1")
+
+        assert result['success'] == False
+        assert result['exitstatus'] == 'command failed'
+
+    @pytest.mark.asyncio
+    async def test_wait_for_task_timeout(self):
+        """Test tâche toujours en cours après le timeout"""
+        status = {'success': True, 'status': 'running', 'exitstatus': None}
+        with patch.object(self.api, 'get_task_status', AsyncMock(return_value=status)):
+            result = await self.api.wait_for_task("https://pve/api2/json", "id", "secret", "UPID:pve:1",
+                                                  timeout=0.05, initial_interval=0.01)
+
+        assert result['success'] == False
+        assert 'exitstatus' not in result
+
+
+class TestMinecraftServerListPing:
+    """Tests du protocole Server List Ping contre un faux serveur local"""
+
+    def setup_method(self):
+        """Configuration avant chaque test"""
+        self.logger = Mock()
+        self.minecraft_checker = MinecraftChecker(self.logger)
+
+    @staticmethod
+    async def _start_server(handler):
+        server = await asyncio.start_server(handler, '127.0.0.1', 0)
+        return server, server.sockets[0].getsockname()[1]
+
+    @pytest.mark.asyncio
+    async def test_modern_status_ping(self):
+        """Test SLP moderne : version, MOTD, joueurs et latence"""
+        import json
+        from src.server_manager.minecraft_checker import _pack_packet, _pack_string, _read_varint
+
+        status = {
+            'version': {'name': '1.20.4', 'protocol': 765},
+            'players': {'online': 3, 'max': 20},
+            'description': {'text': 'Cube', 'extra': [{'text': 'Guardian'}]}
+        }
+
+        async def handler(reader, writer):
+            for _ in range(2):  # handshake + requête de statut
+                length = await _read_varint(reader)
+                await reader.readexactly(length)
+            writer.write(_pack_packet(0x00, _pack_string(json.dumps(status))))
+            length = await _read_varint(reader)
+            ping = await reader.readexactly(length)
+            writer.write(_pack_packet(0x01, ping[1:]))
+            await writer.drain()
+            writer.close()
+
+        server, port = await self._start_server(handler)
+        async with server:
+            result = await self.minecraft_checker.check_minecraft_connectivity('127.0.0.1', port)
+
+        assert result['success'] == True
+        details = result['details']
+        assert details['protocol'] == 'slp'
+        assert details['version'] == '1.20.4'
+        assert details['motd'] == 'CubeGuardian'
+        assert details['players_online'] == 3
+        assert details['players_max'] == 20
+        assert details['latency_ms'] is not None
+
+    @pytest.mark.asyncio
+    async def test_legacy_fallback(self):
+        """Test repli sur le ping legacy 1.6"""
+        import struct
+
+        async def handler(reader, writer):
+            first = await reader.read(1)
+            if first != b'\xfe':
+                writer.close()  # Serveur ancien : ne comprend pas le handshake moderne
+                return
+            await reader.read(1024)
+            payload = '\xa71\x0078\x001.6.4\x00Vieux serveur\x001\x0010'.encode('utf-16-be')
+            writer.write(b'\xff' + struct.pack('>H', len(payload) // 2) + payload)
+            await writer.drain()
+            writer.close()
+
+        server, port = await self._start_server(handler)
+        async with server:
+            result = await self.minecraft_checker.check_minecraft_connectivity('127.0.0.1', port)
+
+        assert result['success'] == True
+        assert result['details']['protocol'] == 'legacy'
+        assert result['details']['version'] == '1.6.4'
+        assert result['details']['players_online'] == 1
+        assert result['details']['players_max'] == 10
+
+    @pytest.mark.asyncio
+    async def test_port_open_but_not_ready(self):
+        """Test port ouvert sans réponse de statut : serveur pas encore prêt"""
+        async def handler(reader, writer):
+            writer.close()
+
+        server, port = await self._start_server(handler)
+        async with server:
+            result = await self.minecraft_checker.check_minecraft_connectivity('127.0.0.1', port)
+
+        assert result['success'] == False
+        assert result['message'] == "Serveur Minecraft pas encore prêt"
+
+
+class TestPollingScheduler:
+    """Tests pour le planificateur de vérifications adaptatif"""
+
+    @pytest.mark.asyncio
+    async def test_fibonacci_backoff(self):
+        """Test progression Fibonacci plafonnée à max_interval"""
+        scheduler = PollingScheduler(1000, initial_interval=5, max_interval=30, jitter=0)
+
+        delays = [scheduler.next_delay() for _ in range(7)]
+
+        assert delays == [5, 5, 10, 15, 25, 30, 30]
+
+    @pytest.mark.asyncio
+    async def test_exponential_backoff(self):
+        """Test progression exponentielle"""
+        scheduler = PollingScheduler(1000, initial_interval=2, max_interval=60,
+                                     strategy='exponential', jitter=0)
+
+        delays = [scheduler.next_delay() for _ in range(4)]
+
+        assert delays == [2, 4, 8, 16]
+
+    @pytest.mark.asyncio
+    async def test_fast_phase_near_expected_ready(self):
+        """Test attente raccourcie pour atteindre la phase rapide puis intervalle court"""
+        loop = asyncio.get_event_loop()
+        scheduler = PollingScheduler(1000, initial_interval=60, max_interval=60, jitter=0,
+                                     expected_ready=100, fast_window=30, fast_interval=5,
+                                     start_time=loop.time() - 50)
+
+        # 50s écoulées : la phase rapide commence à 70s, pas d'attente de 60s
+        assert scheduler.next_delay() == pytest.approx(20, abs=0.5)
+
+        scheduler.start_time = loop.time() - 80
+        assert scheduler.next_delay() == 5
+
+        # Phase rapide symétrique : terminée à 130s, le backoff repart de zéro
+        scheduler.start_time = loop.time() - 135
+        assert scheduler.next_delay() == 60
+
+    @pytest.mark.asyncio
+    async def test_deadline_respected(self):
+        """Test échéance stricte"""
+        scheduler = PollingScheduler(0.05, initial_interval=1, jitter=0)
+
+        checks = 0
+        while await scheduler.wait():
+            checks += 1
+
+        assert checks == 1
+        assert scheduler.elapsed < 0.5
+
+    def test_invalid_strategy(self):
+        """Test stratégie inconnue"""
+        with pytest.raises(ValueError):
+            PollingScheduler(10, strategy='linear')
+
+    def test_ready_time_estimator(self):
+        """Test estimation par médiane des durées observées"""
+        estimator = ReadyTimeEstimator(max_samples=3)
+        assert estimator.expected('startup') is None
+
+        for duration in (400, 100, 120, 130):
+            estimator.record('startup', duration)
+
+        assert estimator.expected('startup') == 120
+
+
+class TestLifecycleHistory:
+    """Tests pour l'historique persistant des opérations"""
+
+    def setup_method(self):
+        """Configuration avant chaque test"""
+        self.logger = Mock()
+
+    def test_percentiles_and_eta(self, tmp_path):
+        """Test percentiles des durées réussies et estimation d'attente"""
+        history = LifecycleHistory(str(tmp_path / "history.db"), self.logger, eta_percentile=50)
+        for duration in (100, 200, 300, 400, 500):
+            history.record_operation('startup', True, duration,
+                                     {'wol_sent': 0.1, 'proxmox_up': duration / 2, 'slp_ready': duration})
+        history.record_operation('startup', False, 600)
+
+        percentiles = history.get_percentiles('startup', (50, 90))
+        assert percentiles == {'p50': 300, 'p90': pytest.approx(460)}
+        assert history.get_percentiles('startup', (50,), phase='proxmox_up') == {'p50': 150}
+
+        eta = history.estimate_eta('startup', elapsed=120)
+        assert eta['remaining_seconds'] == 180
+        assert eta['samples'] == 5
+        assert history.estimate_eta('restart') is None
+
+        stats = history.get_statistics()['operations']['startup']
+        assert stats['count'] == 6
+        assert set(stats['phases']) == {'wol_sent', 'proxmox_up', 'slp_ready'}
+
+    def test_persistence(self, tmp_path):
+        """Test conservation de l'historique entre deux instances"""
+        db_path = str(tmp_path / "logs" / "history.db")
+        history = LifecycleHistory(db_path, self.logger)
+        history.record_operation('shutdown', True, 42)
+        history.close()
+
+        reopened = LifecycleHistory(db_path, self.logger)
+        assert reopened.get_durations('shutdown') == [42]
+
+
+class TestProbeEngine:
+    """Tests pour le moteur de vérifications concurrentes"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_concurrent_and_coalesced(self):
+        """Test vérifications lancées en parallèle et partagées si déjà en cours"""
+        engine = ProbeEngine(Mock())
+        calls = []
+
+        def make_probe(name, success=True):
+            async def probe():
+                calls.append(name)
+                await asyncio.sleep(0.1)
+                return {'success': success}
+            return probe
+
+        async def failing_probe():
+            raise ConnectionError("Hôte injoignable")
+
+        engine.register('proxmox', make_probe('proxmox'))
+        engine.register('minecraft', make_probe('minecraft', success=False))
+        engine.register('lxc', failing_probe)
+
+        start = asyncio.get_running_loop().time()
+        snapshot, shared = await asyncio.gather(engine.snapshot(), engine.probe('proxmox'))
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert elapsed < 0.18
+        assert snapshot.ok('proxmox') and not snapshot.ok('minecraft') and not snapshot.ok('lxc')
+        assert snapshot.get('lxc')['error'] == "Hôte injoignable"
+        assert shared == {'success': True}
+        assert calls.count('proxmox') == 1
+        statistics = engine.get_statistics()
+        assert statistics['proxmox']['executions'] == 1
+        assert statistics['proxmox']['coalesced'] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_ttl_and_invalidation(self):
+        """Test résultat conservé pendant le TTL, oublié après invalidation"""
+        engine = ProbeEngine(Mock())
+        results = iter([{'success': True}, {'success': False}])
+
+        async def probe():
+            return next(results)
+
+        engine.register('minecraft', probe, ttl=60)
+
+        assert (await engine.probe('minecraft'))['success'] == True
+        assert (await engine.probe('minecraft'))['success'] == True
+        assert engine.get_statistics()['minecraft']['cache_hits'] == 1
+
+        engine.invalidate()
+        assert (await engine.probe('minecraft'))['success'] == False
+        assert engine.get_statistics()['minecraft']['executions'] == 2
+
+    @pytest.mark.asyncio
+    async def test_startup_probes_bounded_by_connectivity_timeout(self):
+        """Test nœud éteint : API et LXC abandonnées au timeout de connectivité, cycle court"""
+        from src.server_manager_interface import ServerManager as InterfaceServerManager
+        from src.minecraft_manager import MinecraftManager
+
+        interface = InterfaceServerManager.__new__(InterfaceServerManager)
+        interface.logger = Mock()
+        interface.probe_timeout = 0.05
+
+        async def unreachable_node():
+            await asyncio.sleep(30)  # request_timeout du client HTTP
+
+        interface.native_server_manager = Mock()
+        interface.native_server_manager.check_node_status = unreachable_node
+
+        minecraft = MinecraftManager.__new__(MinecraftManager)
+        minecraft.config_manager = Mock()
+        minecraft.config_manager.get_server_config.return_value = {'timeout': 5}
+        minecraft.container_id = 105
+        minecraft._get_lxc_url = Mock(return_value='https://pve:8006/api2/json/nodes/pve/lxc/105')
+        minecraft._get_api_headers = Mock(return_value={})
+        minecraft.proxmox_client = Mock()
+        minecraft.proxmox_client.request = AsyncMock(return_value={'success': False, 'status': None})
+
+        engine = ProbeEngine(Mock())
+        engine.register('proxmox_api', interface._probe_proxmox_api_status)
+        engine.register('lxc', minecraft._check_lxc_status)
+        snapshot = await engine.snapshot('proxmox_api', 'lxc')
+
+        assert snapshot.duration < 1
+        assert snapshot.get('proxmox_api')['error'] == 'timeout'
+        assert minecraft.proxmox_client.request.await_args.kwargs['timeout'] == 5
+
+
+class TestServerFleet:
+    """Tests pour la flotte de nœuds et d'instances de jeu"""
+
+    def setup_method(self):
+        """Configuration avant chaque test"""
+        self.logger = Mock()
+        node = {'node_name': 'pve', 'ipv4': '192.168.1.10', 'mac_address': '00:00:00:00:00:01',
+                'api_url': 'https://192.168.1.10:8006/api2/json'}
+        self.fleet = ServerFleet.from_config({
+            'fleet': {
+                'nodes': {'alpha': node, 'beta': {**node, 'node_name': 'pve2', 'ipv4': '192.168.1.20'}},
+                'instances': {
+                    'survival': {'node': 'alpha', 'vmid': 105, 'ipv4': '192.168.1.11', 'port': 25565},
+                    'creative': {'node': 'alpha', 'vmid': 106, 'ipv4': '192.168.1.12', 'port': 25565},
+                    'modded': {'node': 'beta', 'vmid': 210, 'type': 'qemu', 'ipv4': '192.168.1.21'}
+                }
+            }
+        }, self.logger)
+
+    def test_from_config(self):
+        """Test construction : un gestionnaire (pools HTTP/SSH) par nœud"""
+        assert set(self.fleet.nodes) == {'alpha', 'beta'}
+        assert self.fleet.nodes['alpha'].manager is not self.fleet.nodes['beta'].manager
+        assert self.fleet.get('modded').config.guest_type == 'qemu'
+        assert [instance.name for instance in self.fleet.instances_on('alpha')] == ['survival', 'creative']
+        assert all(instance.state == InstanceState.UNKNOWN for instance in self.fleet.instances.values())
+
+    @pytest.mark.asyncio
+    async def test_concurrent_start_and_stop(self):
+        """Test démarrage parallèle, réveil partagé par nœud et arrêt d'une instance"""
+        for node in self.fleet.nodes.values():
+            node.is_online = AsyncMock(return_value=True)
+        for instance in self.fleet.instances.values():
+            async def guest_action(action):
+                await asyncio.sleep(0.05)
+                return {'success': True}
+            instance._guest_action = guest_action
+            instance.check_game = AsyncMock(return_value={'success': True})
+
+        start = asyncio.get_event_loop().time()
+        results = await self.fleet.start()
+        elapsed = asyncio.get_event_loop().time() - start
+
+        assert all(result['success'] for result in results.values())
+        assert all(instance.state == InstanceState.RUNNING for instance in self.fleet.instances.values())
+        assert elapsed < 0.15  # Trois démarrages de 50 ms en parallèle
+
+        results = await self.fleet.stop('modded', 'unknown')
+        assert list(results) == ['modded']
+        assert self.fleet.get('modded').state == InstanceState.STOPPED
+        assert self.fleet.idle_nodes() == [self.fleet.nodes['beta']]
+
+        # Transition non autorisée refusée
+        assert self.fleet.get('modded').transition(InstanceState.STOPPING) is False
+
+    @pytest.mark.asyncio
+    async def test_unknown_instances_keep_node_awake(self):
+        """Test état inconnu (redémarrage du bot) : nœud inactif seulement après mise à jour"""
+        assert self.fleet.idle_nodes() == []
+
+        self.fleet.get('survival').check_game = AsyncMock(return_value={'success': True})
+        self.fleet.get('creative').check_game = AsyncMock(return_value={'success': False})
+        self.fleet.get('modded').check_game = AsyncMock(return_value={'success': False})
+
+        assert await self.fleet.is_node_idle(self.fleet.nodes['alpha']) is False
+        assert await self.fleet.is_node_idle(self.fleet.nodes['beta']) is True
+        assert self.fleet.get('survival').state == InstanceState.RUNNING
+
+        self.fleet.get('modded').state = InstanceState.ERROR  # Échec d'un arrêt précédent
+        assert self.fleet.nodes['beta'] not in self.fleet.idle_nodes()
+
+    def test_legacy_config(self):
+        """Test sans section fleet : nœud proxmox et instance default"""
+        fleet = ServerFleet.from_config({
+            'proxmox': {'node_name': 'pve', 'ipv4': '192.168.1.10'},
+            'minecraft': {'ipv4': '192.168.1.11', 'port': 25565, 'container_id': 105}
+        }, self.logger, default_manager=Mock())
+        assert list(fleet.nodes) == ['proxmox']
+        assert fleet.get(ServerFleet.DEFAULT_INSTANCE).config.vmid == 105
+
+    def test_fleet_nodes_extend_legacy_node(self):
+        """Test section fleet : le nœud proxmox reste disponible pour les instances"""
+        default_manager = Mock()
+        fleet = ServerFleet.from_config({
+            'proxmox': {'node_name': 'pve', 'ipv4': '192.168.1.10'},
+            'fleet': {
+                'nodes': {'node2': {'node_name': 'pve2', 'ipv4': '192.168.1.20'},
+                          'proxmox': {'node_name': 'other'}},
+                'instances': {
+                    'default': {'node': 'proxmox', 'vmid': 105},
+                    'modded': {'node': 'node2', 'vmid': 210, 'type': 'qemu'}
+                }
+            }
+        }, self.logger, default_manager=default_manager)
+
+        assert list(fleet.nodes) == ['proxmox', 'node2']
+        assert fleet.nodes['proxmox'].manager is default_manager
+        assert fleet.nodes['proxmox'].node_name == 'pve'
+        assert set(fleet.instances) == {'default', 'modded'}
+        assert fleet.get('default').node is fleet.nodes['proxmox']
+
+    @pytest.mark.asyncio
+    async def test_minimal_node_config(self):
+        """Test nœud sans node_name : nom d'API par défaut utilisé par le gestionnaire natif"""
+        fleet = ServerFleet.from_config({
+            'fleet': {
+                'nodes': {'gamma': {'ipv4': '192.168.1.30', 'mac_address': '00:00:00:00:00:03',
+                                    'api_url': 'https://192.168.1.30:8006/api2/json',
+                                    'api_token_id': 'bot@pve!token', 'api_token_secret': 'secret'}},
+                'instances': {'lobby': {'node': 'gamma', 'vmid': 300}}
+            }
+        }, self.logger)
+        node = fleet.nodes['gamma']
+        node.manager.proxmox_api.get_node_status = AsyncMock(return_value={'success': True})
+
+        assert await node.is_online() is True
+        node.manager.proxmox_api.get_node_status.assert_awaited_once_with(
+            'https://192.168.1.30:8006/api2/json', 'bot@pve!token', 'secret', 'pve')
+        assert node.node_name == node.manager.config['proxmox']['node_name'] == 'pve'
+        await fleet.close()
+
+
 class TestNativeServerManager:
     """Tests pour le gestionnaire de serveurs natif unifié"""
 
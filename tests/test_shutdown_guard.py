@@ -0,0 +1,148 @@
+"""
+Tests unitaires pour le report de l'arrêt automatique tant que des joueurs sont connectés
+"""
+
+import types
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from src import bot as bot_module
+from src.bot import CubeGuardianBot, BotState
+from src.health_sampler import HealthSample
+
+
+class FakeClock:
+    """Remplace asyncio dans src.bot : sleep fait avancer une horloge simulée"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = 0
+
+    async def sleep(self, seconds):
+        self.now += seconds
+        self.sleeps += 1
+
+    def get_event_loop(self):
+        return types.SimpleNamespace(time=lambda: self.now)
+
+
+def make_bot(players, config=None):
+    """
+    Bot minimal pour le timer d'arrêt
+
+    Args:
+        players: Joueurs connectés renvoyés par le Server List Ping à chaque minute
+                 (None : serveur injoignable), la dernière valeur est répétée
+        config: Valeurs de bot.shutdown_guard
+    """
+    values = {'bot.shutdown_guard.check_players': True, 'bot.shutdown_guard.max_postpone': 21600}
+    values.update(config or {})
+    players = list(players)
+
+    bot = CubeGuardianBot.__new__(CubeGuardianBot)
+    bot.logger = Mock()
+    bot.config_manager = Mock()
+    bot.config_manager.get_config.side_effect = lambda key, default=None: values.get(key, default)
+    bot.voice_monitor = Mock()
+    bot.voice_monitor.count_present.return_value = 0
+    bot.message_manager = Mock()
+    bot.message_manager.send_shutdown_message = AsyncMock()
+    bot.message_manager.send_shutdown_postponed_message = AsyncMock()
+    bot.message_manager.send_admin_alert = AsyncMock()
+    bot.health_sampler = Mock()
+    bot.health_sampler.latest.return_value = None
+
+    async def probe(name):
+        count = players.pop(0) if len(players) > 1 else players[0]
+        if count is None:
+            return {'success': False}
+        return {'success': True, 'details': {'players_online': count}}
+
+    bot.probe_engine = Mock()
+    bot.probe_engine.probe = AsyncMock(side_effect=probe)
+    bot._execute_shutdown = AsyncMock()
+    bot._state = BotState.SERVER_OPERATIONAL
+    return bot
+
+
+class TestShutdownGuard:
+    """Tests pour _start_shutdown_timer et _get_players_online"""
+
+    @pytest.fixture(autouse=True)
+    def clock(self, monkeypatch):
+        """Horloge simulée : les minutes du compte à rebours passent instantanément"""
+        clock = FakeClock()
+        monkeypatch.setattr(bot_module, 'asyncio', clock)
+        return clock
+
+    @pytest.mark.asyncio
+    async def test_players_reset_countdown(self, clock):
+        """Test joueurs connectés : compte à rebours repris à 10 minutes, un seul avis Discord"""
+        bot = make_bot([2, 3, 1, 0])
+
+        await bot._start_shutdown_timer()
+
+        # 3 minutes de report puis 10 minutes de compte à rebours
+        assert clock.sleeps == 13
+        bot.message_manager.send_shutdown_postponed_message.assert_awaited_once_with(2)
+        bot._execute_shutdown.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_countdown_resumes_after_max_postpone(self, clock):
+        """Test report maximal dépassé : arrêt malgré les joueurs connectés"""
+        bot = make_bot([4], {'bot.shutdown_guard.max_postpone': 180})
+
+        await bot._start_shutdown_timer()
+
+        # Report à partir de la 1re minute, reprise à la 4e (180 s), puis 9 minutes restantes
+        assert clock.sleeps == 13
+        bot.message_manager.send_shutdown_postponed_message.assert_awaited_once_with(4)
+        bot._execute_shutdown.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_check_disabled_does_not_block(self, clock):
+        """Test vérification désactivée : arrêt après 10 minutes sans interroger Minecraft"""
+        bot = make_bot([5], {'bot.shutdown_guard.check_players': False})
+
+        await bot._start_shutdown_timer()
+
+        assert clock.sleeps == 10
+        bot.probe_engine.probe.assert_not_awaited()
+        bot.message_manager.send_shutdown_postponed_message.assert_not_awaited()
+        bot._execute_shutdown.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_server_does_not_block(self, clock):
+        """Test Minecraft injoignable : aucun report"""
+        bot = make_bot([None])
+
+        await bot._start_shutdown_timer()
+
+        assert clock.sleeps == 10
+        bot.message_manager.send_shutdown_postponed_message.assert_not_awaited()
+        bot._execute_shutdown.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_user_back_cancels_from_tracked_presence(self, clock):
+        """Test retour d'un utilisateur : annulation sur la présence suivie, sans parcours des salons"""
+        bot = make_bot([0])
+        bot.voice_monitor.count_present.side_effect = [0, 0, 1]
+
+        await bot._start_shutdown_timer()
+
+        assert clock.sleeps == 3
+        assert bot.state == BotState.SERVER_OPERATIONAL
+        bot.voice_monitor.check_authorized_users.assert_not_called()
+        bot._execute_shutdown.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_players_from_recent_sample(self):
+        """Test dernière mesure de fond utilisée sans Server List Ping"""
+        bot = make_bot([0])
+        bot.health_sampler.latest.return_value = HealthSample(0.0, True, True, 10.0, 3)
+        assert await bot._get_players_online() == 3
+
+        bot.health_sampler.latest.return_value = HealthSample(0.0, True, False, 10.0, 0)
+        assert await bot._get_players_online() is None
+        bot.probe_engine.probe.assert_not_awaited()
@@ -0,0 +1,258 @@
+"""
+Tests unitaires pour la surveillance vocale (liaisons multiples, présence par événement)
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from src.voice_monitor import VoiceMonitor, ChannelBinding
+
+
+AUTHORIZED = {1, 2, 3}
+
+
+def make_channel(channel_id, name, members=()):
+    """Salon Discord simulé"""
+    channel = Mock()
+    channel.id = channel_id
+    channel.name = name
+    channel.members = [make_member(member_id) for member_id in members]
+    return channel
+
+
+def make_member(member_id):
+    """Membre Discord simulé"""
+    member = Mock()
+    member.id = member_id
+    member.display_name = f"user{member_id}"
+    return member
+
+
+def make_guild(guild_id, name, voice_channels, text_channels=()):
+    """Serveur Discord simulé"""
+    guild = Mock()
+    guild.id = guild_id
+    guild.name = name
+    guild.voice_channels = list(voice_channels)
+    guild.text_channels = list(text_channels)
+    return guild
+
+
+def make_state(channel):
+    """État vocal simulé (salon ou None)"""
+    state = Mock()
+    state.channel = channel
+    return state
+
+
+def make_monitor(guilds, bindings=None):
+    """Surveillant vocal avec configuration, utilisateurs et messages simulés"""
+    config = {
+        'discord.discord.bindings': bindings or [],
+        'discord.discord.channels.voice_channel': "L'écho-du-Cube",
+        'discord.discord.channels.text_channel': None,
+        'bot.timers.voice_reconcile': 300
+    }
+    config_manager = Mock()
+    config_manager.get_config.side_effect = lambda key, default=None: config.get(key, default)
+    config_manager.get_timer.return_value = 600
+
+    user_manager = Mock()
+    user_manager.is_authorized.side_effect = lambda user_id: user_id in AUTHORIZED
+
+    bot = Mock()
+    bot.guilds = guilds
+    bot.get_user.side_effect = make_member
+
+    message_manager = Mock()
+    message_manager.send_user_joined_message = AsyncMock()
+    message_manager.send_user_left_message = AsyncMock()
+    message_manager.send_shutdown_cancelled_message = AsyncMock()
+    message_manager.send_monitoring_active_message = AsyncMock()
+
+    return VoiceMonitor(bot, config_manager, user_manager, message_manager, Mock())
+
+
+class TestVoiceMonitorBindings:
+    """Tests pour les liaisons multiples (serveur Discord, salons, serveur de jeu)"""
+
+    def setup_method(self):
+        """Configuration avant chaque test : deux serveurs Discord, trois salons vocaux"""
+        self.lobby = make_channel(101, "Lobby")
+        self.survival_a = make_channel(102, "Survie A")
+        self.survival_b = make_channel(103, "Survie B")
+        self.other_lobby = make_channel(201, "Lobby")
+        self.text = make_channel(110, "annonces")
+        self.guild_a = make_guild(10, "Alpha", [self.lobby, self.survival_a, self.survival_b], [self.text])
+        self.guild_b = make_guild(20, "Beta", [self.other_lobby])
+        self.monitor = make_monitor([self.guild_a, self.guild_b], bindings=[
+            {'guild': 'Beta', 'voice_channel': 'Lobby', 'server': 'default'},
+            {'guild': 10, 'voice_channel': '102', 'text_channel': 'annonces', 'server': 'survival'},
+            {'guild': None, 'voice_channel': 'Survie B', 'server': 'survival'},
+            {'guild': None, 'voice_channel': 'Lobby', 'server': 'lobby'}
+        ])
+
+    def test_resolve_bindings(self):
+        """Test résolution par ID ou par nom ; sans serveur Discord, premier salon trouvé"""
+        bindings = self.monitor.resolve_bindings()
+
+        assert [binding.voice_channel for binding in bindings] == [
+            self.other_lobby, self.survival_a, self.survival_b, self.lobby]
+        assert bindings[0].guild is self.guild_b
+        assert bindings[1].text_channel is self.text
+        assert bindings[2].text_channel is None
+        assert [binding.server for binding in bindings] == ['default', 'survival', 'survival', 'lobby']
+        assert self.monitor.monitored_channel is self.other_lobby
+
+    def test_resolve_bindings_keeps_presence(self):
+        """Test nouvelle résolution : présence conservée pour les salons déjà liés"""
+        self.monitor.resolve_bindings()
+        self.monitor.bindings[102].present.add(1)
+
+        self.monitor.resolve_bindings()
+        assert self.monitor.bindings[102].present == {1}
+
+    @pytest.mark.asyncio
+    async def test_move_between_bindings_of_same_server(self):
+        """Test passage d'un salon à l'autre du même serveur de jeu : aucun timer d'arrêt"""
+        self.monitor.resolve_bindings()
+        self.monitor.monitoring_active = True
+        member = make_member(1)
+
+        await self.monitor.on_voice_state_update(member, make_state(None), make_state(self.survival_a))
+        await self.monitor.on_voice_state_update(member, make_state(self.survival_a), make_state(self.survival_b))
+
+        assert self.monitor.bindings[102].present == set()
+        assert self.monitor.bindings[103].present == {1}
+        assert self.monitor.shutdown_timers == {}
+
+    @pytest.mark.asyncio
+    async def test_last_leave_starts_server_timer(self):
+        """Test départ du dernier utilisateur : timer d'arrêt du seul serveur de jeu concerné"""
+        self.monitor.resolve_bindings()
+        self.monitor.monitoring_active = True
+        await self.monitor.on_voice_state_update(make_member(1), make_state(None), make_state(self.survival_a))
+        await self.monitor.on_voice_state_update(make_member(2), make_state(None), make_state(self.survival_b))
+        await self.monitor.on_voice_state_update(make_member(3), make_state(None), make_state(self.lobby))
+
+        await self.monitor.on_voice_state_update(make_member(1), make_state(self.survival_a), make_state(None))
+        assert self.monitor.shutdown_timers == {}
+
+        await self.monitor.on_voice_state_update(make_member(2), make_state(self.survival_b), make_state(None))
+        try:
+            assert list(self.monitor.shutdown_timers) == ['survival']
+            assert self.monitor.is_shutdown_timer_active('survival')
+            assert not self.monitor.is_shutdown_timer_active('lobby')
+        finally:
+            await self.monitor.cancel_shutdown_timer()
+
+    @pytest.mark.asyncio
+    async def test_reconcile_binding_drift(self):
+        """Test rapprochement d'une liaison : arrivées et départs manqués comptés"""
+        self.monitor.resolve_bindings()
+        binding = self.monitor.bindings[101]
+        binding.present = {1, 2}
+        self.lobby.members = [make_member(2), make_member(3), make_member(99)]
+
+        drift = await self.monitor._reconcile_binding(binding)
+        try:
+            assert drift == 2  # 1 parti, 3 arrivé ; 99 non autorisé
+            assert binding.present == {2, 3}
+            assert await self.monitor._reconcile_binding(binding) == 0
+        finally:
+            await self.monitor.cancel_shutdown_timer()
+
+    def test_count_present(self):
+        """Test comptage par serveur de jeu : utilisateurs distincts des salons liés"""
+        self.monitor.resolve_bindings()
+        self.monitor.bindings[102].present = {1, 2}
+        self.monitor.bindings[103].present = {2, 3}
+        self.monitor.bindings[101].present = {1}
+
+        assert self.monitor.count_present('survival') == 3
+        assert self.monitor.count_present('lobby') == 1
+        assert self.monitor.count_present('default') == 0
+        assert self.monitor.count_present() == 3
+        assert sorted(self.monitor.get_authorized_users_present('survival')) == [1, 2, 3]
+
+
+class TestChannelBinding:
+    """Tests pour la description d'une liaison"""
+
+    def test_to_dict(self):
+        """Test description sans salon textuel"""
+        binding = ChannelBinding(guild=make_guild(10, "Alpha", []), voice_channel=make_channel(101, "Lobby"),
+                                 present={1, 2})
+        assert binding.to_dict() == {
+            'guild': 'Alpha',
+            'voice_channel': {'name': 'Lobby', 'id': 101},
+            'text_channel': None,
+            'server': 'default',
+            'authorized_users_present': 2
+        }
+
+
+class TestVoiceMonitorDeltas:
+    """Tests pour la présence tenue à jour par événement et le rapprochement périodique"""
+
+    def setup_method(self):
+        """Configuration avant chaque test : salon principal (configuration channels)"""
+        self.voice = make_channel(101, "L'écho-du-Cube")
+        self.other = make_channel(102, "AFK")
+        self.monitor = make_monitor([make_guild(10, "Alpha", [self.voice, self.other])])
+        self.monitor.resolve_bindings()
+        self.monitor.monitoring_active = True
+        self.binding = self.monitor.bindings[101]
+
+    @pytest.mark.asyncio
+    async def test_same_channel_events_ignored(self):
+        """Test mute, sourdine, stream (même salon) : événements ignorés, présence inchangée"""
+        self.binding.present = {1}
+        member = make_member(1)
+
+        for _ in range(3):
+            await self.monitor.on_voice_state_update(member, make_state(self.voice), make_state(self.voice))
+        await self.monitor.on_voice_state_update(make_member(99), make_state(None), make_state(self.voice))
+
+        assert self.monitor.events_ignored == 4
+        assert self.monitor.events_applied == 0
+        assert self.binding.present == {1}
+        self.monitor.message_manager.send_user_joined_message.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_join_and_leave_update_one_member(self):
+        """Test arrivée puis départ : seule la présence du membre concerné change"""
+        self.binding.present = {2}
+
+        await self.monitor.on_voice_state_update(make_member(1), make_state(self.other), make_state(self.voice))
+        assert self.binding.present == {1, 2}
+        self.monitor.user_manager.update_user_presence.assert_called_once_with(1, True)
+
+        await self.monitor.on_voice_state_update(make_member(1), make_state(self.voice), make_state(None))
+        assert self.binding.present == {2}
+        self.monitor.user_manager.update_user_presence.assert_called_with(1, False)
+        assert self.monitor.events_applied == 2
+        assert self.monitor.shutdown_timers == {}  # Membre 2 toujours présent
+
+    @pytest.mark.asyncio
+    async def test_reconciliation_fixes_missed_event(self):
+        """Test rapprochement périodique : événement manqué corrigé et compté"""
+        self.monitor.reconcile_interval = 0.01
+        self.binding.present = {1}
+        self.voice.members = [make_member(2)]  # Départ de 1 et arrivée de 2 manqués
+
+        self.monitor.reconcile_task = asyncio.create_task(self.monitor._reconcile_loop())
+        try:
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if self.monitor.reconciliations:
+                    break
+        finally:
+            await self.monitor.stop_monitoring()
+
+        assert self.binding.present == {2}
+        assert self.monitor.drift_corrections == 2
+        assert self.monitor.reconciliations >= 1
+        assert self.monitor.get_monitoring_status()['drift_corrections'] == 2